@@ -0,0 +1 @@
+"""API 키 없이 실행하는 가짜 YouTube Data API 서버와 벤치마크 모음입니다."""
@@ -0,0 +1,270 @@
+"""가짜 YouTube Data API 서버
+
+commentThreads.list, comments.list, videos.list를 흉내 내어 합성 한국어/영어 댓글을 돌려줍니다.
+댓글 수는 video ID 끝의 숫자로 정합니다. (예: bench_1k, bench_50k, bench_1m)
+channels.list, playlistItems.list도 흉내 내며, 채널의 영상 수는 channel ID 끝의 숫자로 정합니다. (예: UCbench_120)
+
+    python -m bench.fake_youtube --port 8765 --latency 0.05
+    YOUTUBE_API_ENDPOINT=http://127.0.0.1:8765 YOUTUBE_API_KEY=fake streamlit run app.py
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+UPLOAD_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# 업로드 후 댓글이 달리는 기간
+DURATION = timedelta(days=30)
+DEFAULT_COUNT = 1000
+PAGE_SIZE = 100
+PLAYLIST_PAGE_SIZE = 50
+# 채널 영상의 댓글 수는 이 목록을 차례로 돌아가며 씁니다.
+CHANNEL_VIDEO_SIZES = [200, 500, 1000, 300, 2000]
+
+KO_WORDS = [
+    "영상", "진짜", "너무", "정말", "노래", "목소리", "최고", "감동", "사랑", "응원", "한국", "무대",
+    "라이브", "가사", "뮤비", "컴백", "앨범", "댄스", "연습", "팬", "멤버", "리더", "보컬", "랩",
+    "좋아요", "구독", "알림", "댓글", "오늘", "매일", "계속", "처음", "마지막", "다시", "같이", "우리",
+    "영상이", "노래가", "목소리가", "무대를", "가사가", "멤버들", "팬들", "진짜로", "너무너무", "완전",
+    "좋아요", "좋네요", "멋있어요", "대박", "미쳤다", "듣고", "보고", "왔어요", "있어요", "합니다",
+]
+EN_WORDS = [
+    "the", "song", "voice", "love", "best", "amazing", "this", "is", "so", "good", "stage", "live",
+    "i", "you", "they", "really", "performance", "korea", "fans", "comeback", "album", "dance", "wow",
+    "and", "with", "from", "legend", "queen", "king", "vocal", "rap", "chorus", "lyrics", "again",
+]
+EXTRAS = ["ㅋㅋㅋ", "ㅎㅎ", "ㅠㅠ", "!!", "??", "❤️", "👍", "🔥", "2024", "1:23", "10/10"]
+# 복사-붙여넣기 / 스팸 댓글 (중복 제거 벤치마크용)
+SPAM = [
+    "구독하고 갑니다 맞구독 해주세요",
+    "제 채널에도 놀러와 주세요 감사합니다",
+    "Check out my channel for more videos!!",
+    "1등 ㅋㅋㅋ",
+]
+
+
+def comment_count(video_id):
+    """video ID 끝의 숫자(k/m 단위 가능)로 댓글 수를 정합니다."""
+    match = re.search(r"(\d+)([km]?)$", video_id)
+    if not match:
+        return DEFAULT_COUNT
+    return int(match.group(1)) * {"": 1, "k": 1000, "m": 1000000}[match.group(2)]
+
+
+def _rng(*key):
+    # 같은 댓글은 서버를 다시 띄워도 항상 같은 내용이 되도록 고정 시드를 씁니다.
+    return random.Random(zlib.crc32(repr(key).encode()))
+
+
+def _published(index, count):
+    """오래된 순 index의 작성 시각. 초반에 몰리고, 55% 지점에 짧은 급증 구간이 있습니다."""
+    u = index / max(count, 1)
+    if u < 0.55:
+        frac = u * u
+    elif u < 0.6:
+        frac = 0.3025 + (u - 0.55) * 0.02
+    else:
+        frac = 0.3035 + (u * u - 0.36) * (0.6965 / 0.64)
+    return UPLOAD_TIME + DURATION * frac
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _text(rng):
+    if rng.random() < 0.05:
+        return rng.choice(SPAM)
+    words = []
+    for _ in range(rng.randint(3, 20)):
+        r = rng.random()
+        words.append(rng.choice(KO_WORDS if r < 0.65 else EN_WORDS if r < 0.9 else EXTRAS))
+    return " ".join(words)
+
+
+def make_comment(video_id, index, count):
+    rng = _rng(video_id, index)
+    r = rng.random()
+    replies = 0 if r < 0.7 else rng.randint(1, 5) if r < 0.9 else rng.randint(6, 30)
+    return {
+        "id": f"{video_id}.{index}",
+        "snippet": {
+            "videoId": video_id,
+            "textDisplay": _text(rng),
+            "publishedAt": _iso(_published(index, count)),
+            "likeCount": int(rng.paretovariate(1.2)) - 1,
+        },
+    }, replies
+
+
+def make_reply(parent_id, index):
+    rng = _rng(parent_id, index)
+    video_id, parent_index = parent_id.rsplit(".", 1)
+    published = _published(int(parent_index), comment_count(video_id)) + timedelta(minutes=index + 1)
+    return {
+        "id": f"{parent_id}.r{index}",
+        "snippet": {
+            "videoId": video_id,
+            "textDisplay": _text(rng),
+            "publishedAt": _iso(published),
+            "likeCount": int(rng.paretovariate(2.0)) - 1,
+            "parentId": parent_id,
+        },
+    }
+
+
+# 📡 API 응답
+def comment_threads(params):
+    video_id = params["videoId"]
+    count = comment_count(video_id)
+    size = min(int(params.get("maxResults", 20)), PAGE_SIZE)
+    # 최신순: pageToken은 다음 페이지 첫 댓글의 (오래된 순) index
+    start = int(params["pageToken"]) if params.get("pageToken") else count - 1
+    include_replies = "replies" in params.get("part", "")
+
+    items = []
+    for index in range(start, max(start - size, -1), -1):
+        comment, replies = make_comment(video_id, index, count)
+        item = {
+            "id": comment["id"],
+            "snippet": {"videoId": video_id, "topLevelComment": comment, "totalReplyCount": replies},
+        }
+        if include_replies and replies:
+            item["replies"] = {"comments": [make_reply(comment["id"], j) for j in range(min(replies, 5))]}
+        items.append(item)
+
+    response = {"kind": "youtube#commentThreadListResponse", "items": items}
+    if start - size >= 0:
+        response["nextPageToken"] = str(start - size)
+    return response
+
+
+def comments(params):
+    parent_id = params["parentId"]
+    video_id, index = parent_id.rsplit(".", 1)
+    _, replies = make_comment(video_id, int(index), comment_count(video_id))
+    size = min(int(params.get("maxResults", 20)), PAGE_SIZE)
+    start = int(params.get("pageToken") or 0)
+    response = {
+        "kind": "youtube#commentListResponse",
+        "items": [make_reply(parent_id, j) for j in range(start, min(start + size, replies))],
+    }
+    if start + size < replies:
+        response["nextPageToken"] = str(start + size)
+    return response
+
+
+def videos(params):
+    items = [{
+        "id": video_id,
+        "snippet": {
+            "title": f"합성 영상 {video_id} (댓글 {comment_count(video_id):,}개)",
+            "publishedAt": _iso(UPLOAD_TIME),
+        },
+    } for video_id in params["id"].split(",")]
+    return {"kind": "youtube#videoListResponse", "items": items}
+
+
+def channel_videos(channel_id):
+    """채널의 업로드 영상 ID (최신순). 댓글 수가 ID 끝 숫자가 되도록 만듭니다."""
+    count = comment_count(channel_id)
+    return [
+        f"{channel_id}.v{i}_{CHANNEL_VIDEO_SIZES[i % len(CHANNEL_VIDEO_SIZES)]}"
+        for i in range(count - 1, -1, -1)
+    ]
+
+
+def channels(params):
+    items = [{
+        "id": channel_id,
+        "contentDetails": {"relatedPlaylists": {"uploads": "UU" + channel_id[2:]}},
+    } for channel_id in params["id"].split(",") if channel_id.startswith("UC")]
+    return {"kind": "youtube#channelListResponse", "items": items}
+
+
+def playlist_items(params):
+    video_ids = channel_videos("UC" + params["playlistId"][2:])
+    size = min(int(params.get("maxResults", 5)), PLAYLIST_PAGE_SIZE)
+    start = int(params.get("pageToken") or 0)
+    response = {
+        "kind": "youtube#playlistItemListResponse",
+        "items": [{
+            "snippet": {"title": f"합성 영상 {video_id}"},
+            "contentDetails": {"videoId": video_id, "videoPublishedAt": _iso(UPLOAD_TIME)},
+        } for video_id in video_ids[start:start + size]],
+    }
+    if start + size < len(video_ids):
+        response["nextPageToken"] = str(start + size)
+    return response
+
+
+ROUTES = {
+    "commentThreads": comment_threads,
+    "comments": comments,
+    "videos": videos,
+    "channels": channels,
+    "playlistItems": playlist_items,
+}
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 보내므로 Nagle 알고리즘을 끄지 않으면 keep-alive 요청마다 ~40ms가 지연됩니다.
+    disable_nagle_algorithm = True
+    latency = 0.0
+    error_rate = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        route = ROUTES.get(url.path.rstrip("/").rsplit("/", 1)[-1])
+        if self.latency:
+            time.sleep(self.latency * random.uniform(0.5, 1.5))
+
+        if route is None:
+            self._send(404, {"error": {"code": 404, "errors": [{"reason": "notFound"}]}})
+        elif random.random() < self.error_rate:
+            self._send(503, {"error": {"code": 503, "errors": [{"reason": "backendError"}]}})
+        else:
+            self._send(200, route(params))
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port=0, latency=0.0, error_rate=0.0):
+    """백그라운드 스레드에서 서버를 띄우고 (서버, 엔드포인트 URL)을 반환합니다."""
+    handler = type("Handler", (FakeYouTubeHandler,), {"latency": latency, "error_rate": error_rate})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가짜 YouTube Data API 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="요청당 평균 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 오류를 돌려줄 비율")
+    args = parser.parse_args()
+
+    server, endpoint = start_server(args.port, args.latency, args.error_rate)
+    print(f"가짜 YouTube API: {endpoint}  (YOUTUBE_API_ENDPOINT={endpoint} 로 설정하세요)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,246 @@
+"""페이지별 처리 단계 벤치마크
+
+가짜 YouTube API 서버(bench/fake_youtube.py)를 띄우고, 댓글 규모별로 각 페이지가 하는 일을
+단계별로 재서 표로 출력합니다. 결과를 JSON으로 저장해 두면 회귀를 숫자로 비교할 수 있습니다.
+
+    python -m bench.run_bench --sizes 1k,10k,100k --json bench_output.json
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from bench.fake_youtube import comment_count, start_server
+
+results = []
+
+
+@contextmanager
+def timed(size, stage, items=None):
+    """블록의 실행 시간을 (규모, 단계) 결과로 기록합니다."""
+    start = time.perf_counter()
+    record = {"size": size, "stage": stage, "items": items}
+    yield record
+    record["seconds"] = time.perf_counter() - start
+    results.append(record)
+
+
+def parse_size(text):
+    return comment_count(f"bench_{text.strip().lower()}")
+
+
+# 📋 페이지별 단계
+def bench_fetch(size, video_id, api_key):
+    from utils.store import load_comments, load_video_info
+
+    with timed(size, "fetch (API → 저장소)") as r:
+        load_video_info(video_id, api_key)
+        comments = load_comments(video_id, api_key, -1)
+        r["items"] = len(comments)
+    with timed(size, "fetch (저장소)") as r:
+        comments = load_comments(video_id, api_key, -1, force=True)
+        r["items"] = len(comments)
+    with timed(size, "fetch (공유 DataFrame)") as r:
+        comments = load_comments(video_id, api_key, -1)
+        r["items"] = int(comments.memory_usage(deep=True).sum())
+    return comments
+
+
+def bench_nouns(size, texts):
+    import altair as alt
+    import pandas as pd
+    from utils.nouns import current_model, update_model
+    from utils.text import count_nouns
+
+    with timed(size, "01 count_nouns") as r:
+        nouns = count_nouns(texts)
+        r["items"] = sum(nouns.values())
+    # 저장소에 이번 규모의 댓글이 새로 들어왔으므로 그만큼만 어절 빈도에 더합니다.
+    with timed(size, "01 명사 모델 갱신") as r:
+        r["items"] = update_model()["nouns"]
+    with timed(size, "01 명사 모델 갱신 (새 댓글 없음)"):
+        update_model()
+    if (model := current_model()) is not None:
+        with timed(size, "01 명사 모델로 세기") as r:
+            nouns = model.count(texts)
+            r["items"] = sum(nouns.values())
+    with timed(size, "01 정렬"):
+        df_freq = pd.DataFrame(nouns.items(), columns=["단어", "빈도수"]).sort_values(by="빈도수", ascending=False)
+    with timed(size, "01 차트 준비"):
+        alt.Chart(df_freq.head(20)).mark_bar().encode(x=alt.X("단어:N", sort="-y"), y="빈도수:Q").to_dict()
+
+
+def bench_dedup(size, texts):
+    from utils.dedup import NearDuplicateIndex
+    from utils.text import count_nouns
+
+    with timed(size, "중복 묶기 (MinHash/LSH)") as r:
+        index = NearDuplicateIndex()
+        kept = index.collapse(texts)
+        r["items"] = index.clusters
+    seconds = results[-1]["seconds"]
+    with timed(size, "중복 묶기 처리량 (댓글/초)") as r:
+        r["items"] = int(len(texts) / seconds)
+    with timed(size, "01 count_nouns (묶음마다 한 번)") as r:
+        r["items"] = sum(count_nouns(kept).values())
+
+
+def bench_meaningful(size, texts):
+    from utils.text import count_meaningful_words
+
+    with timed(size, "02 count_meaningful_words") as r:
+        words = count_meaningful_words(texts)
+        r["items"] = sum(words.values())
+    with timed(size, "02 상위 20개"):
+        words.most_common(20)
+
+
+def bench_cooccurrence(size, video_id, api_key):
+    from utils.analysis import comment_term_matrix
+    from utils.cooccurrence import top_pairs
+    from utils.text import DEFAULT_STOPWORDS
+
+    with timed(size, "02 댓글 × 단어 행렬") as r:
+        cooccurrence = comment_term_matrix(video_id, api_key, -1)
+        r["items"] = cooccurrence[0].nnz
+    with timed(size, "02 댓글 × 단어 행렬 (캐시)"):
+        comment_term_matrix(video_id, api_key, -1)
+    with timed(size, "02 함께 나온 단어 쌍") as r:
+        r["items"] = len(top_pairs(cooccurrence, DEFAULT_STOPWORDS))
+
+
+def bench_time(size, comments):
+    import altair as alt
+    import pandas as pd
+    from utils.charts import box_stats, density_grid, sample_scatter, shorten
+    from utils.timeseries import cumulative_counts, find_bursts
+
+    def box_chart(stats, outliers):
+        base = alt.Chart(stats).encode(x="그룹:O")
+        return (
+            base.mark_rule().encode(y="하단:Q", y2="상단:Q")
+            + base.mark_bar().encode(y="Q1:Q", y2="Q3:Q")
+            + base.mark_tick().encode(y="중앙값:Q")
+            + alt.Chart(outliers).mark_point().encode(x="그룹:O", y="값:Q")
+        )
+
+    with timed(size, "03 DataFrame"):
+        df = pd.DataFrame({
+            "댓글 내용": comments["text"],
+            "작성 시각": comments["published_at"],
+            "좋아요 수": comments["like_count"]
+        })
+        df["시간대 (시)"] = df["작성 시각"].dt.hour
+        hourly_likes = df.groupby("시간대 (시)")["좋아요 수"].sum().reset_index()
+    with timed(size, "03 급증 구간") as r:
+        r["items"] = len(find_bursts(df["작성 시각"]))
+
+    # st.altair_chart처럼 행 수 제한 없이 모든 행을 차트에 담습니다.
+    alt.data_transformers.disable_max_rows()
+    charts = {
+        "누적": lambda: alt.Chart(cumulative_counts(df["작성 시각"])).mark_line().encode(
+            x="작성 시각:T", y="누적 댓글 수:Q"
+        ),
+        "산점도 표본": lambda: alt.Chart(sample_scatter(
+            df[["작성 시각", "좋아요 수", "댓글 내용"]], "작성 시각", "좋아요 수"
+        ).assign(**{"댓글 내용": lambda d: shorten(d["댓글 내용"])})).mark_circle().encode(
+            x="작성 시각:T", y="좋아요 수:Q", tooltip=["댓글 내용"]
+        ),
+        "산점도 밀도": lambda: alt.Chart(density_grid(df["작성 시각"], df["좋아요 수"])).mark_rect().encode(
+            x="시작:T", x2="끝:T", y="하한:Q", y2="상한:Q", color="댓글 수:Q"
+        ),
+        "막대": lambda: alt.Chart(hourly_likes).mark_bar().encode(x="시간대 (시):O", y="좋아요 수:Q"),
+        "박스 플롯": lambda: box_chart(*box_stats(df["시간대 (시)"], df["좋아요 수"])),
+    }
+    for name, chart in charts.items():
+        with timed(size, f"03 {name} 차트 (bytes)") as r:
+            r["items"] = len(json.dumps(chart().to_dict(), default=str))
+
+
+def bench_trends(size, video_id):
+    from utils.trends import burst_terms, keyword_trend, term_matrix, update_trends
+
+    with timed(size, "03 단어 추이 갱신") as r:
+        r["items"] = update_trends(video_id)
+    with timed(size, "03 단어 추이 갱신 (새 댓글 없음)"):
+        update_trends(video_id)
+    with timed(size, "03 단어 × 구간 행렬") as r:
+        trend = term_matrix(video_id)
+        r["items"] = trend[0].nnz
+    with timed(size, "03 키워드 추이") as r:
+        r["items"] = len(keyword_trend(trend, ["노래", "무대"]))
+    with timed(size, "03 구간의 두드러진 단어") as r:
+        r["items"] = len(burst_terms(trend, trend[2][0], trend[2][len(trend[2]) // 10]))
+
+
+def bench_wordcloud(size, texts):
+    from utils.render import EXPORT_SCALE, render_wordcloud
+    from utils.text import count_words
+
+    with timed(size, "04 count_words") as r:
+        word_counts = count_words(texts, ["영상", "the"])
+        r["items"] = sum(word_counts.values())
+    with timed(size, "04 상위 100개"):
+        word_freq = word_counts.most_common(100)
+    frequencies = tuple(word_freq)
+    with timed(size, "04 워드클라우드 (800×600)") as r:
+        r["items"] = len(render_wordcloud(frequencies, 100))
+    with timed(size, "04 워드클라우드 미리보기") as r:
+        r["items"] = len(render_wordcloud(frequencies, 100, preview=True))
+    with timed(size, "04 워드클라우드 내보내기") as r:
+        r["items"] = len(render_wordcloud(frequencies, 100, scale=EXPORT_SCALE))
+    with timed(size, "04 워드클라우드 (캐시)"):
+        render_wordcloud(frequencies, 100)
+
+
+def print_table():
+    print(f"{'규모':>10}  {'단계':<32} {'초':>9}  {'항목 수':>12}")
+    for r in results:
+        items = "" if r["items"] is None else f"{r['items']:,}"
+        print(f"{r['size']:>10,}  {r['stage']:<32} {r['seconds']:>9.3f}  {items:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YouTube 댓글 분석 벤치마크 (가짜 API 서버 사용)")
+    parser.add_argument("--sizes", default="1k,10k,100k", help="댓글 수 목록 (예: 1k,10k,100k,1m)")
+    parser.add_argument("--latency", type=float, default=0.0, help="가짜 API 요청당 평균 지연(초)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    server, endpoint = start_server(latency=args.latency)
+    workdir = tempfile.mkdtemp(prefix="yt-bench-")
+    os.environ.update({
+        "YOUTUBE_API_ENDPOINT": endpoint,
+        "YOUTUBE_API_KEY": "bench",
+        "COMMENT_STORE_PATH": os.path.join(workdir, "comments.db"),
+        "QUOTA_LEDGER_PATH": os.path.join(workdir, "quota.db"),
+        "YOUTUBE_DAILY_QUOTA": str(10 ** 9),
+        "YOUTUBE_API_RATE": str(10 ** 6),
+        "YOUTUBE_API_BURST": str(10 ** 6),
+    })
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    for size in map(parse_size, args.sizes.split(",")):
+        video_id = f"bench_{size}"
+        comments = bench_fetch(size, video_id, "bench")
+        texts = comments["text"].tolist()
+        bench_nouns(size, texts)
+        bench_dedup(size, texts)
+        bench_meaningful(size, texts)
+        bench_cooccurrence(size, video_id, "bench")
+        bench_time(size, comments)
+        bench_trends(size, video_id)
+        bench_wordcloud(size, texts)
+
+    server.shutdown()
+    print_table()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""페이지별 시작 시간 측정
+
+페이지마다 새 파이썬 프로세스를 띄워 streamlit을 불러온 뒤, 버튼을 누르기 전 첫 화면을 그리기까지
+걸린 시간과 그 사이에 불러온 무거운 모듈을 표로 출력합니다. (콜드 컨테이너의 첫 요청과 같은 조건)
+
+    python -m bench.startup
+    python -m bench.startup --json startup.json
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "altair", "googleapiclient.discovery", "httplib2", "matplotlib", "wordcloud", "soynlp"]
+
+# 자식 프로세스에서 실행: streamlit을 불러온 뒤(서버가 떠 있는 상태) 페이지 첫 실행만 잽니다.
+CHILD = """
+import json, logging, sys, time
+import streamlit
+from streamlit.testing.v1 import AppTest
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+page, heavy = sys.argv[1], sys.argv[2].split(",")
+start = time.perf_counter()
+at = AppTest.from_file(page, default_timeout=60)
+at.run()
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "exceptions": [e.value for e in at.exception],
+    "heavy": [m for m in heavy if m in sys.modules],
+}))
+"""
+
+
+def measure(page):
+    env = dict(os.environ, YOUTUBE_API_KEY=os.environ.get("YOUTUBE_API_KEY", "startup"))
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", CHILD, page, ",".join(HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지별 첫 화면 시간 측정")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    results = []
+    for page in [os.path.join(ROOT, "app.py"), *sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))]:
+        results.append({"page": os.path.relpath(page, ROOT), **measure(page)})
+
+    print(f"{'페이지':<28} {'초':>7}  불러온 무거운 모듈")
+    for r in results:
+        status = " ⚠️ " + "; ".join(r["exceptions"]) if r["exceptions"] else ""
+        print(f"{r['page']:<28} {r['seconds']:>7.3f}  {', '.join(r['heavy']) or '-'}{status}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
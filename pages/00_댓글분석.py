@@ -1,49 +1,16 @@
 import streamlit as st
-from googleapiclient.discovery import build
 import pandas as pd
-import re
+from utils.youtube import extract_video_id, get_api_key
+from utils.store import load_comments
+from utils.scheduler import quota_exhausted
+from utils.metrics import snapshot
+from utils.progress import performance_panel
 
 # 샘플 URL
 SAMPLE_URL = "https://www.youtube.com/watch?v=WXuK6gekU1Y"
-API_KEY = st.secrets["youtube_api_key"]  # ✅ secrets에서 API 키 불러오기
-
-# video ID 추출
-def extract_video_id(url):
-    pattern = r"(?:v=|youtu\.be/)([\w-]+)"
-    match = re.search(pattern, url)
-    return match.group(1) if match else None
-
-# 댓글 + 시간 + 좋아요 수 수집 함수
-def get_comments(video_id, api_key, max_comments=100):
-    youtube = build("youtube", "v3", developerKey=api_key)
-    comments, timestamps, likes = [], [], []
-    next_page_token = None
-
-    while True:
-        response = youtube.commentThreads().list(
-            part="snippet",
-            videoId=video_id,
-            maxResults=100,
-            pageToken=next_page_token,
-            order="relevance",
-            textFormat="plainText"
-        ).execute()
-
-        for item in response["items"]:
-            snippet = item["snippet"]["topLevelComment"]["snippet"]
-            comments.append(snippet["textDisplay"])
-            timestamps.append(snippet["publishedAt"])
-            likes.append(snippet.get("likeCount", 0))  # 👍 좋아요 수
-
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token or (max_comments != -1 and len(comments) >= max_comments):
-            break
-
-    return (
-        comments[:max_comments] if max_comments != -1 else comments,
-        timestamps[:max_comments] if max_comments != -1 else timestamps,
-        likes[:max_comments] if max_comments != -1 else likes
-    )
+API_KEY = get_api_key()  # ✅ 환경 변수 또는 secrets에서 API 키 불러오기
+# 이번 실행에서 기록된 단계별 시간은 페이지 끝에서 사이드바 성능 패널로 보여 줍니다.
+run_metrics = snapshot()
 
 # Streamlit 앱
 st.title("📋 YouTube 댓글 분석기 (시간 + 좋아요 수 포함)")
@@ -62,6 +29,8 @@ if select_count == "모두":
 else:
     comment_limit = max(int(select_count), slider_count)
 
+include_replies = st.checkbox("💬 답글도 함께 수집 (답글 수만큼 API 호출이 늘어납니다)", value=False)
+
 if st.button("댓글 수집 시작"):
     video_id = extract_video_id(youtube_url)
     if not video_id:
@@ -69,18 +38,24 @@ if st.button("댓글 수집 시작"):
         st.stop()
 
     with st.spinner("🔄 댓글 수집 중..."):
-        comments, timestamps, likes = get_comments(video_id, API_KEY, comment_limit)
+        comments = load_comments(video_id, API_KEY, comment_limit, include_replies=include_replies)
+    if quota_exhausted(API_KEY):
+        st.warning("⚠️ 오늘 API 할당량을 모두 사용해 저장된 댓글까지만 분석했습니다. 할당량이 초기화되면 이어서 수집합니다.")
 
-    if comments:
+    if not comments.empty:
         st.success(f"✅ 댓글 {len(comments)}개 수집 완료!")
 
         df = pd.DataFrame({
-            "댓글 내용": comments,
-            "작성 시각": pd.to_datetime(timestamps),
-            "좋아요 수": likes
+            "댓글 내용": comments["text"],
+            "작성 시각": comments["published_at"],
+            "좋아요 수": comments["like_count"],
+            "답글 여부": comments["parent_id"].notna()
         })
 
         st.subheader("🗂️ 댓글 목록 (시간 + 좋아요 수 포함)")
         st.dataframe(df.sort_values(by="좋아요 수", ascending=False).reset_index(drop=True))
     else:
         st.warning("😥 댓글이 수집되지 않았습니다.")
+
+# ⏱️ 성능 패널 (사이드바)
+performance_panel(run_metrics)
@@ -1,56 +1,18 @@
 import streamlit as st
-from googleapiclient.discovery import build
 import pandas as pd
-from collections import Counter
-from soynlp.tokenizer import RegexTokenizer
-import re
-import altair as alt
+from utils.youtube import extract_video_id, get_api_key
+from utils.analysis import count_comment_tokens
+from utils.dedup import DEDUP_OPTIONS
+from utils.nouns import current_model
+from utils.progress import LiveProgress, performance_panel, stopped_result
+from utils.scheduler import quota_exhausted
+from utils.metrics import snapshot
 
 # ✅ 샘플 URL
 SAMPLE_URL = "https://www.youtube.com/watch?v=WXuK6gekU1Y"
-API_KEY = st.secrets["youtube_api_key"]
-
-# 🎯 video ID 추출
-def extract_video_id(url):
-    pattern = r"(?:v=|youtu\.be/)([\w-]+)"
-    match = re.search(pattern, url)
-    return match.group(1) if match else None
-
-# 💬 댓글 수집 함수 (내용만)
-def get_comments(video_id, api_key, max_comments=100):
-    youtube = build("youtube", "v3", developerKey=api_key)
-    comments = []
-    next_page_token = None
-
-    while True:
-        response = youtube.commentThreads().list(
-            part="snippet",
-            videoId=video_id,
-            maxResults=100,
-            pageToken=next_page_token,
-            order="relevance",
-            textFormat="plainText"
-        ).execute()
-
-        for item in response["items"]:
-            snippet = item["snippet"]["topLevelComment"]["snippet"]
-            comments.append(snippet["textDisplay"])
-
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token or (max_comments != -1 and len(comments) >= max_comments):
-            break
-
-    return comments[:max_comments] if max_comments != -1 else comments
-
-# 🧠 명사 중심 토큰 추출
-@st.cache_data
-def extract_nouns(comments):
-    tokenizer = RegexTokenizer()
-    tokens = []
-    for comment in comments:
-        tokens += tokenizer.tokenize(comment)
-    # 길이가 1보다 긴 단어만 (명사 중심 추정)
-    return [t for t in tokens if len(t) > 1]
+API_KEY = get_api_key()
+# 이번 실행에서 기록된 단계별 시간은 페이지 끝에서 사이드바 성능 패널로 보여 줍니다.
+run_metrics = snapshot()
 
 # ------------------ Streamlit 앱 ------------------
 
@@ -70,22 +32,50 @@ if select_count == "모두":
 else:
     comment_limit = max(int(select_count), slider_count)
 
+include_replies = st.checkbox("💬 답글도 함께 수집 (답글 수만큼 API 호출이 늘어납니다)", value=False)
+dedup = DEDUP_OPTIONS[st.radio(
+    "🧹 복사·스팸 댓글 (거의 같은 댓글을 묶어서 세기)", list(DEDUP_OPTIONS), horizontal=True,
+    help="묶음 크기의 로그만큼: 같은 댓글이 1·2·4·8…개가 될 때마다 한 번 더 셉니다."
+)]
+
+video_id = extract_video_id(youtube_url)
+analysis_key = (video_id, comment_limit, include_replies, dedup)
+
+freq = None
 if st.button("분석 시작"):
-    video_id = extract_video_id(youtube_url)
     if not video_id:
         st.error("⚠️ 유효한 YouTube URL이 아닙니다.")
         st.stop()
 
-    with st.spinner("🔄 댓글 수집 중..."):
-        comments = get_comments(video_id, API_KEY, comment_limit)
+    # 수집 중에 누르면 이번 실행이 멈추고, 다음 실행에서 그때까지 센 빈도로 결과를 보여 줍니다.
+    st.button("⏹️ 수집 중지 (지금까지 받은 댓글로 보기)")
+
+    # 페이지가 도착하는 대로 바로 집계하고 진행 상황을 보여 줍니다 (다음 페이지는 백그라운드에서 미리 요청).
+    # 같은 영상을 다시 분석하면 저장소가 바뀌지 않은 한 캐시된 빈도를 씁니다.
+    progress = LiveProgress(analysis_key)
+    freq, comment_count = count_comment_tokens(
+        video_id, API_KEY, comment_limit, include_replies, "nouns", on_progress=progress, dedup=dedup
+    )
+    progress.finish()
+
+    if quota_exhausted(API_KEY):
+        st.warning("⚠️ 오늘 API 할당량을 모두 사용해 저장된 댓글까지만 분석했습니다. 할당량이 초기화되면 이어서 수집합니다.")
+elif (stopped := stopped_result(analysis_key)) is not None:
+    freq, comment_count = stopped
+    st.info(f"⏹️ 수집을 중지했습니다. 지금까지 받은 댓글 {comment_count:,}개로 분석한 결과입니다. 다시 분석하면 멈춘 곳부터 이어 받습니다.")
+
+if freq is not None:
+    # altair는 차트를 그릴 때 불러옵니다. (페이지 첫 화면을 빠르게)
+    import altair as alt
 
-    if not comments:
+    if not comment_count:
         st.warning("댓글을 수집하지 못했습니다.")
         st.stop()
 
-    with st.spinner("🧠 명사 추출 중..."):
-        nouns = extract_nouns(comments)
-        freq = Counter(nouns)
+    if current_model() is None:
+        st.caption("🧠 명사 모델이 아직 없거나 학습한 명사가 적어 규칙 기반 토큰으로 셉니다. 저장된 댓글로 백그라운드에서 학습하면 다음 분석부터 명사만 셉니다.")
+
+    with st.spinner("📊 빈도 정리 중..."):
         df_freq = pd.DataFrame(freq.items(), columns=["단어", "빈도수"]).sort_values(by="빈도수", ascending=False)
 
     st.subheader("📊 상위 20개 단어 (빈도순)")
@@ -105,3 +95,6 @@ if st.button("분석 시작"):
             title="상위 20개 단어 (Altair 시각화)"
         )
     )
+
+# ⏱️ 성능 패널 (사이드바)
+performance_panel(run_metrics)
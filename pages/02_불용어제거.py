@@ -1,85 +1,20 @@
 import streamlit as st
-from googleapiclient.discovery import build
 import pandas as pd
-from collections import Counter
-from soynlp.tokenizer import RegexTokenizer
-import re
-import altair as alt
+from utils.youtube import extract_video_id, get_api_key
+from utils.analysis import count_comment_tokens
+from utils.cooccurrence import top_pairs
+from utils.dedup import DEDUP_OPTIONS
+from utils.nouns import current_model
+from utils.progress import LiveProgress, performance_panel, stopped_result
+from utils.scheduler import quota_exhausted
+from utils.text import DEFAULT_STOPWORDS, remove_stopwords
+from utils.metrics import snapshot
 
 # ✅ 샘플 URL & API Key
 SAMPLE_URL = "https://www.youtube.com/watch?v=WXuK6gekU1Y"
-API_KEY = st.secrets["youtube_api_key"]
-
-# 🎯 video ID 추출
-def extract_video_id(url):
-    pattern = r"(?:v=|youtu\.be/)([\w-]+)"
-    match = re.search(pattern, url)
-    return match.group(1) if match else None
-
-# 💬 댓글 수집
-def get_comments(video_id, api_key, max_comments=100):
-    youtube = build("youtube", "v3", developerKey=api_key)
-    comments = []
-    next_page_token = None
-
-    while True:
-        response = youtube.commentThreads().list(
-            part="snippet",
-            videoId=video_id,
-            maxResults=100,
-            pageToken=next_page_token,
-            order="relevance",
-            textFormat="plainText"
-        ).execute()
-
-        for item in response["items"]:
-            snippet = item["snippet"]["topLevelComment"]["snippet"]
-            comments.append(snippet["textDisplay"])
-
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token or (max_comments != -1 and len(comments) >= max_comments):
-            break
-
-    return comments[:max_comments] if max_comments != -1 else comments
-
-# 🚫 한글 + 영어 불용어 리스트
-DEFAULT_KO_STOPWORDS = set([
-    "영상", "정말", "진짜", "너무", "그리고", "이건", "해서", "하게", "하는", "것", "때문",
-    "봤어요", "있어요", "이렇게", "같아요", "이요", "입니다", "그냥", "우리", "이게", "저는", "그거"
-])
-
-DEFAULT_EN_STOPWORDS = set([
-    "i", "me", "my", "myself", "we", "our", "ours", "ourselves",
-    "you", "your", "yours", "yourself", "he", "him", "his",
-    "she", "her", "it", "its", "they", "them", "their", "theirs",
-    "what", "which", "who", "whom", "this", "that", "these", "those",
-    "am", "is", "are", "was", "were", "be", "been", "being",
-    "have", "has", "had", "do", "does", "did", "will", "would",
-    "shall", "should", "can", "could", "a", "an", "the", "and",
-    "but", "if", "or", "because", "as", "until", "while", "of",
-    "at", "by", "for", "with", "about", "against", "between", "into",
-    "through", "during", "before", "after", "above", "below", "to",
-    "from", "up", "down", "in", "out", "on", "off", "over", "under",
-    "again", "further", "then", "once", "here", "there", "why", "how",
-    "all", "any", "both", "each", "few", "more", "most", "other",
-    "some", "such", "no", "nor", "not", "only", "own", "same", "so",
-    "than", "too", "very", "just"
-])
-
-# 🧠 명사 기반 토큰 추출 + 불용어 제거
-@st.cache_data
-def extract_meaningful_words(comments):
-    tokenizer = RegexTokenizer()
-    tokens = []
-    for comment in comments:
-        tokens += tokenizer.tokenize(comment.lower())  # 소문자화 처리
-
-    # 불용어 제거 (한글/영어 모두)
-    tokens = [
-        t for t in tokens
-        if len(t) > 1 and t not in DEFAULT_KO_STOPWORDS and t not in DEFAULT_EN_STOPWORDS
-    ]
-    return tokens
+API_KEY = get_api_key()
+# 이번 실행에서 기록된 단계별 시간은 페이지 끝에서 사이드바 성능 패널로 보여 줍니다.
+run_metrics = snapshot()
 
 # ------------------ Streamlit UI ------------------
 
@@ -94,39 +29,106 @@ with col2:
     slider_count = st.slider("댓글 개수 (세부 조절)", 100, 1000, step=100, value=100)
 
 comment_limit = -1 if select_count == "모두" else max(int(select_count), slider_count)
+include_replies = st.checkbox("💬 답글도 함께 수집 (답글 수만큼 API 호출이 늘어납니다)", value=False)
+dedup = DEDUP_OPTIONS[st.radio(
+    "🧹 복사·스팸 댓글 (거의 같은 댓글을 묶어서 세기)", list(DEDUP_OPTIONS), horizontal=True,
+    help="묶음 크기의 로그만큼: 같은 댓글이 1·2·4·8…개가 될 때마다 한 번 더 셉니다."
+)]
+
+# 불용어와 표시 개수는 수집한 빈도표에 바로 적용되므로, 바꿔도 댓글을 다시 수집하거나 토큰화하지 않습니다.
+with st.expander("🚫 불용어 설정 (클릭하여 수정)"):
+    user_stopwords = st.text_area(
+        "제외할 단어 (쉼표로 구분)",
+        value=", ".join(sorted(DEFAULT_STOPWORDS)),
+        height=100
+    )
+top_n = st.slider("표시할 상위 단어 수", 10, 100, step=10, value=20)
+stopwords = {word.strip().lower() for word in user_stopwords.split(",") if word.strip()}
+
+video_id = extract_video_id(youtube_url)
+analysis_key = (video_id, comment_limit, include_replies, dedup)
 
 if st.button("분석 시작"):
-    video_id = extract_video_id(youtube_url)
     if not video_id:
         st.error("⚠️ 유효한 YouTube URL이 아닙니다.")
         st.stop()
 
-    with st.spinner("🔄 댓글 수집 중..."):
-        comments = get_comments(video_id, API_KEY, comment_limit)
+    # 수집 중에 누르면 이번 실행이 멈추고, 다음 실행에서 그때까지 센 빈도로 결과를 보여 줍니다.
+    st.button("⏹️ 수집 중지 (지금까지 받은 댓글로 보기)")
+
+    # 페이지가 도착하는 대로 바로 집계하고 진행 상황을 보여 줍니다 (다음 페이지는 백그라운드에서 미리 요청).
+    # 불용어는 나중에 거르므로 여기서는 소문자화한 2글자 이상 토큰을 모두 셉니다.
+    # 같은 토큰화로 함께 나온 단어를 찾을 댓글 × 단어 행렬도 만듭니다.
+    progress = LiveProgress(analysis_key)
+    freq, comment_count, cooccurrence = count_comment_tokens(
+        video_id, API_KEY, comment_limit, include_replies, "nouns_lower",
+        on_progress=progress, dedup=dedup, cooccurrence=True
+    )
+    progress.finish()
+
+    if quota_exhausted(API_KEY):
+        st.warning("⚠️ 오늘 API 할당량을 모두 사용해 저장된 댓글까지만 분석했습니다. 할당량이 초기화되면 이어서 수집합니다.")
 
-    if not comments:
+    if not comment_count:
         st.warning("댓글을 수집하지 못했습니다.")
         st.stop()
 
-    with st.spinner("🧠 명사 추출 및 불용어 제거 중..."):
-        clean_tokens = extract_meaningful_words(comments)
-        freq = Counter(clean_tokens)
-        df_freq = pd.DataFrame(freq.items(), columns=["단어", "빈도수"]).sort_values(by="빈도수", ascending=False)
+    if current_model() is None:
+        st.caption("🧠 명사 모델이 아직 없거나 학습한 명사가 적어 규칙 기반 토큰으로 셉니다. 저장된 댓글로 백그라운드에서 학습하면 다음 분석부터 명사만 셉니다.")
 
-    st.subheader("📊 상위 20개 단어 (불용어 제거 후)")
+    st.session_state["meaningful_words"] = {"key": analysis_key, "counts": freq, "cooccurrence": cooccurrence}
+elif (stopped := stopped_result(analysis_key)) is not None:
+    st.session_state["meaningful_words"] = {"key": analysis_key, "counts": stopped[0], "cooccurrence": None}
+    st.info(f"⏹️ 수집을 중지했습니다. 지금까지 받은 댓글 {stopped[1]:,}개로 분석한 결과입니다. 다시 분석하면 멈춘 곳부터 이어 받습니다.")
+
+result = st.session_state.get("meaningful_words")
+if result and result["key"] == analysis_key:
+    # altair는 차트를 그릴 때 불러옵니다. (페이지 첫 화면을 빠르게)
+    import altair as alt
+
+    with st.spinner("📊 빈도 정리 중..."):
+        top_words = remove_stopwords(result["counts"], stopwords).most_common(top_n)
+        df_freq = pd.DataFrame(top_words, columns=["단어", "빈도수"])
+
+    st.subheader(f"📊 상위 {top_n}개 단어 (불용어 제거 후)")
 
     # st 기본 bar_chart
-    st.bar_chart(df_freq.head(20).set_index("단어"))
+    st.bar_chart(df_freq.set_index("단어"))
 
     # Altair 차트
     st.altair_chart(
-        alt.Chart(df_freq.head(20)).mark_bar().encode(
+        alt.Chart(df_freq).mark_bar().encode(
             x=alt.X("단어:N", sort="-y"),
             y="빈도수:Q",
             tooltip=["단어", "빈도수"]
         ).properties(
             width=600,
             height=400,
-            title="상위 20개 단어 (Altair 시각화)"
+            title=f"상위 {top_n}개 단어 (Altair 시각화)"
         )
     )
+
+    # ---------------- 🔗 함께 나온 단어 ----------------
+    if result["cooccurrence"] is not None:
+        st.subheader(f"🔗 함께 나온 단어 쌍 (상위 {top_n}개, 불용어 제거 후)")
+        sort_by = st.radio(
+            "정렬 기준", ["함께 나온 댓글 수", "PMI"], horizontal=True,
+            help="PMI: 두 단어가 따로 나올 때보다 같은 댓글에 얼마나 더 자주 함께 나오는지 (log₂ 배율)"
+        )
+        pairs = top_pairs(result["cooccurrence"], stopwords, top=top_n, sort_by=sort_by)
+        if pairs.empty:
+            st.info("여러 댓글에 함께 나온 단어 쌍이 없습니다.")
+        else:
+            st.altair_chart(
+                alt.Chart(pairs).mark_rect().encode(
+                    x=alt.X("단어 1:N", sort=None),
+                    y=alt.Y("단어 2:N", sort=None),
+                    color=alt.Color(f"{sort_by}:Q"),
+                    tooltip=["단어 1", "단어 2", "함께 나온 댓글 수", alt.Tooltip("PMI:Q", format=".2f")]
+                ),
+                use_container_width=True
+            )
+            st.dataframe(pairs.style.format({"PMI": "{:.2f}"}), hide_index=True, use_container_width=True)
+
+# ⏱️ 성능 패널 (사이드바)
+performance_panel(run_metrics)
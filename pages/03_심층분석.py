@@ -1,57 +1,19 @@
 import streamlit as st
-from googleapiclient.discovery import build
 import pandas as pd
-import altair as alt
-import re
+from utils.youtube import extract_video_id, get_api_key
+from utils.store import load_comments
+from utils.scheduler import quota_exhausted
+from utils.timeseries import cumulative_counts, find_bursts
+from utils.trends import BUCKET_SECONDS, burst_terms, keyword_trend, term_matrix, update_trends
+from utils.charts import TOP_LIKED, box_stats, density_grid, sample_scatter, shorten
+from utils.metrics import snapshot, stage
+from utils.progress import performance_panel
 
 # ✅ 샘플 URL & API Key
 SAMPLE_URL = "https://www.youtube.com/watch?v=WXuK6gekU1Y"
-API_KEY = st.secrets["youtube_api_key"]
-
-# 🎯 YouTube video ID 추출
-def extract_video_id(url):
-    pattern = r"(?:v=|youtu\.be/)([\w-]+)"
-    match = re.search(pattern, url)
-    return match.group(1) if match else None
-
-# 🕰️ 영상 업로드일 수집
-def get_video_upload_time(video_id, api_key):
-    youtube = build("youtube", "v3", developerKey=api_key)
-    response = youtube.videos().list(part="snippet", id=video_id).execute()
-    upload_time = response["items"][0]["snippet"]["publishedAt"]
-    return pd.to_datetime(upload_time)
-
-# 💬 댓글 수집
-def get_comments(video_id, api_key, max_comments=100):
-    youtube = build("youtube", "v3", developerKey=api_key)
-    comments, timestamps, likes = [], [], []
-    next_page_token = None
-
-    while True:
-        response = youtube.commentThreads().list(
-            part="snippet",
-            videoId=video_id,
-            maxResults=100,
-            pageToken=next_page_token,
-            order="relevance",
-            textFormat="plainText"
-        ).execute()
-
-        for item in response["items"]:
-            snippet = item["snippet"]["topLevelComment"]["snippet"]
-            comments.append(snippet["textDisplay"])
-            timestamps.append(snippet["publishedAt"])
-            likes.append(snippet.get("likeCount", 0))
-
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token or (max_comments != -1 and len(comments) >= max_comments):
-            break
-
-    return (
-        comments[:max_comments] if max_comments != -1 else comments,
-        pd.to_datetime(timestamps[:max_comments] if max_comments != -1 else timestamps),
-        likes[:max_comments] if max_comments != -1 else likes
-    )
+API_KEY = get_api_key()
+# 이번 실행에서 기록된 단계별 시간은 페이지 끝에서 사이드바 성능 패널로 보여 줍니다.
+run_metrics = snapshot()
 
 # ------------------- Streamlit 앱 -------------------
 
@@ -65,71 +27,133 @@ with col2:
     slider_count = st.slider("댓글 수 (세부 조절)", 100, 1000, step=100, value=100)
 
 limit = -1 if select_count == "모두" else max(int(select_count), slider_count)
+include_replies = st.checkbox("💬 답글도 함께 수집 (답글 수만큼 API 호출이 늘어납니다)", value=False)
+col3, col4 = st.columns([3, 1])
+with col3:
+    keywords = st.text_input("🔑 추이를 볼 키워드 (쉼표로 구분)", value="노래, 무대")
+with col4:
+    trend_freq = st.radio("추이 구간", list(BUCKET_SECONDS), horizontal=True)
+scatter_mode = st.radio("🧭 시각 vs 좋아요 수 표시 방식", ["표본 (좋아요 상위 포함)", "밀도"], horizontal=True)
 
 if st.button("분석 시작"):
+    # altair는 차트를 그릴 때 불러옵니다. (페이지 첫 화면을 빠르게)
+    import altair as alt
+
     video_id = extract_video_id(youtube_url)
     if not video_id:
         st.error("⚠️ 유효한 YouTube URL이 아닙니다.")
         st.stop()
 
-    with st.spinner("📥 영상 업로드일 조회 중..."):
-        upload_time = get_video_upload_time(video_id, API_KEY)
-
     with st.spinner("💬 댓글 수집 중..."):
-        comments, timestamps, likes = get_comments(video_id, API_KEY, limit)
+        comments = load_comments(video_id, API_KEY, limit, include_replies=include_replies)
+    if quota_exhausted(API_KEY):
+        st.warning("⚠️ 오늘 API 할당량을 모두 사용해 저장된 댓글까지만 분석했습니다. 할당량이 초기화되면 이어서 수집합니다.")
 
-    if not comments:
+    if comments.empty:
         st.warning("댓글을 수집할 수 없습니다.")
         st.stop()
 
+    # 🔑 저장된 댓글 중 아직 세지 않은 것만 구간별 단어 빈도에 더합니다.
+    with st.spinner("🔑 단어 추이 갱신 중..."):
+        update_trends(video_id)
+        trend = term_matrix(video_id, trend_freq)
+
     # 📊 데이터프레임 구성
     df = pd.DataFrame({
-        "댓글 내용": comments,
-        "작성 시각": timestamps,
-        "좋아요 수": likes
+        "댓글 내용": comments["text"],
+        "작성 시각": comments["published_at"],
+        "좋아요 수": comments["like_count"]
     })
-    df["작성 시각"] = pd.to_datetime(df["작성 시각"])
     df["시간대 (시)"] = df["작성 시각"].dt.hour
 
     # --------------------- 📈 누적 댓글 수 (작성 시각 기준) ---------------------
     st.subheader("📈 댓글 누적 수 (작성 시각 기준)")
 
-    df_sorted = df.sort_values("작성 시각")
-    df_sorted["누적 댓글 수"] = range(1, len(df_sorted) + 1)
-
-    # 1주일 내 최대 증가 구간 계산 (예외처리 포함)
-    week_df = df_sorted[df_sorted["작성 시각"] <= upload_time + pd.Timedelta(days=7)].copy()
-    week_df["증가량"] = week_df["누적 댓글 수"].diff().fillna(0)
+    # 10분·1시간·1일 창마다 댓글이 가장 많이 몰린 구간 (겹치지 않게)
+    bursts = find_bursts(df["작성 시각"])
 
     highlight = None
-    if not week_df.empty and week_df["증가량"].sum() > 0:
-        max_increase_time = week_df.loc[week_df["증가량"].idxmax(), "작성 시각"]
-        highlight = alt.Chart(pd.DataFrame({"작성 시각": [max_increase_time]})).mark_rule(
-            color='red', strokeDash=[4, 2]
-        ).encode(x='작성 시각:T')
-
-    line_chart = alt.Chart(df_sorted).mark_line().encode(
+    if not bursts.empty:
+        highlight = alt.Chart(bursts).mark_rect(opacity=0.25).encode(
+            x="시작:T",
+            x2="끝:T",
+            color=alt.Color("창:N", sort=list(bursts["창"].unique()), title="급증 구간"),
+            tooltip=["창", "시작", "끝", "댓글 수", alt.Tooltip("시간당 댓글 수:Q", format=",.1f")]
+        )
+
+    # 댓글이 많아도 브라우저로는 구간별 누적 수 몇백 개만 보냅니다.
+    line_chart = alt.Chart(cumulative_counts(df["작성 시각"])).mark_line().encode(
         x=alt.X("작성 시각:T", title="댓글 작성 시각"),
         y=alt.Y("누적 댓글 수:Q"),
         tooltip=["작성 시각", "누적 댓글 수"]
     )
 
     # ⚠️ highlight가 존재할 때만 결합
-    if highlight:
-        st.altair_chart(line_chart + highlight, use_container_width=True)
+    with stage("chart.cumulative"):
+        if highlight:
+            st.altair_chart(line_chart + highlight, use_container_width=True)
+        else:
+            st.altair_chart(line_chart, use_container_width=True)
+
+    if not bursts.empty:
+        st.markdown(
+            "**🔥 댓글 급증 구간** (평균 대비: 전체 기간 평균 댓글 속도의 몇 배인지, "
+            "두드러진 단어: 구간 밖보다 비중이 몇 배 늘어난 단어)"
+        )
+        if trend is not None:
+            with stage("trends.bursts", bursts=len(bursts)):
+                bursts["두드러진 단어"] = [
+                    ", ".join(f"{w} ×{lift:,.1f}" for w, lift in zip(terms["단어"], terms["배율"]))
+                    for terms in (burst_terms(trend, start, end, top=5) for start, end in zip(bursts["시작"], bursts["끝"]))
+                ]
+        st.dataframe(
+            bursts.style.format({"시간당 댓글 수": "{:,.1f}", "평균 대비": "{:,.1f}배"}),
+            hide_index=True,
+            use_container_width=True
+        )
+
+    # ------------------- 🔑 키워드 추이 -------------------
+    st.subheader("🔑 키워드 추이 (저장된 댓글 전체)")
+
+    trend_df = keyword_trend(trend, keywords.split(",")) if trend is not None else pd.DataFrame()
+    if trend_df.empty:
+        st.info("댓글에서 입력한 키워드를 찾지 못했습니다.")
     else:
-        st.altair_chart(line_chart, use_container_width=True)
+        keyword_chart = alt.Chart(trend_df).mark_line().encode(
+            x=alt.X("시각:T", title=f"작성 시각 ({trend_freq} 단위)"),
+            y="빈도수:Q",
+            color="단어:N",
+            tooltip=["시각", "단어", "빈도수"]
+        )
+        with stage("chart.keyword_trend", keywords=trend_df["단어"].nunique()):
+            st.altair_chart(keyword_chart, use_container_width=True)
 
     # ------------------- ⏱ 댓글 시각 vs 좋아요 수 -------------------
     st.subheader("🧭 댓글 시각 vs 좋아요 수")
 
-    scatter = alt.Chart(df).mark_circle(size=60, opacity=0.6).encode(
-        x=alt.X("작성 시각:T", scale=alt.Scale(domain=[df["작성 시각"].min(), df["작성 시각"].max()])),
-        y="좋아요 수:Q",
-        tooltip=["댓글 내용", "좋아요 수", "작성 시각"]
-    ).interactive()
-
-    st.altair_chart(scatter, use_container_width=True)
+    # 댓글이 많아도 전체 행 대신 표본이나 구간별 밀도만 브라우저로 보냅니다.
+    if scatter_mode == "밀도":
+        scatter = alt.Chart(density_grid(df["작성 시각"], df["좋아요 수"])).mark_rect().encode(
+            x=alt.X("시작:T", title="작성 시각"),
+            x2="끝:T",
+            y=alt.Y("하한:Q", title="좋아요 수", scale=alt.Scale(type="symlog")),
+            y2="상한:Q",
+            color=alt.Color("댓글 수:Q", scale=alt.Scale(type="log")),
+            tooltip=["시작", "끝", "댓글 수"]
+        )
+    else:
+        sample = sample_scatter(df[["작성 시각", "좋아요 수", "댓글 내용"]], "작성 시각", "좋아요 수")
+        sample = sample.assign(**{"댓글 내용": shorten(sample["댓글 내용"])})
+        if len(sample) < len(df):
+            st.caption(f"댓글 {len(df):,}개 중 좋아요 상위 {TOP_LIKED}개를 포함해 시간순으로 고르게 뽑은 {len(sample):,}개를 표시합니다.")
+        scatter = alt.Chart(sample).mark_circle(size=60, opacity=0.6).encode(
+            x=alt.X("작성 시각:T", scale=alt.Scale(domain=[df["작성 시각"].min(), df["작성 시각"].max()])),
+            y="좋아요 수:Q",
+            tooltip=["댓글 내용", "좋아요 수", "작성 시각"]
+        ).interactive()
+
+    with stage("chart.scatter", mode=scatter_mode):
+        st.altair_chart(scatter, use_container_width=True)
 
     # ---------------- 🕒 시간대별 좋아요 수 ----------------
     st.subheader("🕒 시간대별 좋아요 수 (합계)")
@@ -142,15 +166,32 @@ if st.button("분석 시작"):
         tooltip=["시간대 (시)", "좋아요 수"]
     )
 
-    st.altair_chart(bar, use_container_width=True)
+    with stage("chart.hourly_likes"):
+        st.altair_chart(bar, use_container_width=True)
 
     # ➕ 박스 플롯 추가 (시간대별 좋아요 수 분포)
     st.subheader("📦 시간대별 좋아요 수 분포 (Box Plot)")
 
-    box = alt.Chart(df).mark_boxplot().encode(
-        x=alt.X("시간대 (시):O"),
-        y=alt.Y("좋아요 수:Q"),
-        tooltip=["시간대 (시)", "좋아요 수"]
+    # 사분위수와 수염은 서버에서 계산하고, 이상치는 시간대마다 큰 값 몇 개만 보냅니다.
+    stats, outliers = box_stats(df["시간대 (시)"], df["좋아요 수"])
+    stats = stats.rename(columns={"그룹": "시간대 (시)"})
+    outliers = outliers.rename(columns={"그룹": "시간대 (시)", "값": "좋아요 수"})
+
+    base = alt.Chart(stats).encode(x=alt.X("시간대 (시):O"))
+    box = (
+        base.mark_rule().encode(y=alt.Y("하단:Q", title="좋아요 수"), y2="상단:Q")
+        + base.mark_bar(size=14).encode(
+            y="Q1:Q", y2="Q3:Q",
+            tooltip=["시간대 (시)", "댓글 수", "하단", "Q1", "중앙값", "Q3", "상단"]
+        )
+        + base.mark_tick(color="white", size=14).encode(y="중앙값:Q")
+        + alt.Chart(outliers).mark_point().encode(
+            x="시간대 (시):O", y="좋아요 수:Q", tooltip=["시간대 (시)", "좋아요 수"]
+        )
     )
 
-    st.altair_chart(box, use_container_width=True)
+    with stage("chart.boxplot"):
+        st.altair_chart(box, use_container_width=True)
+
+# ⏱️ 성능 패널 (사이드바)
+performance_panel(run_metrics)
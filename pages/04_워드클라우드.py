@@ -1,125 +1,55 @@
 import streamlit as st
 import pandas as pd
-import requests
-import io, os, tempfile, urllib.request
-import matplotlib.pyplot as plt
-from matplotlib import font_manager
-from wordcloud import WordCloud
-from collections import Counter
-from googleapiclient.discovery import build
 import re
+from utils.youtube import extract_video_id, get_api_key
+from utils.store import load_video_info
+from utils.analysis import count_comment_tokens
+from utils.dedup import DEDUP_OPTIONS
+from utils.scheduler import quota_exhausted
+from utils.text import remove_stopwords
+from utils.render import EXPORT_SCALE, render_wordcloud
+from utils.fonts import find_font
+from utils.metrics import snapshot
+from utils.progress import performance_panel
+
+# 이번 실행에서 기록된 단계별 시간은 페이지 끝에서 사이드바 성능 패널로 보여 줍니다.
+run_metrics = snapshot()
 
 # 🔧 폰트 설정 함수
 @st.cache_resource
 def get_font_path():
-    """나눔고딕 폰트 파일을 다운로드하고 경로를 반환합니다."""
-    url = "https://raw.githubusercontent.com/google/fonts/main/ofl/nanumgothic/NanumGothic-Regular.ttf"
-    tmp_path = os.path.join(tempfile.gettempdir(), "NanumGothic.ttf")
-    if not os.path.exists(tmp_path):
-        try:
-            urllib.request.urlretrieve(url, tmp_path)
-        except urllib.error.URLError as e:
-            st.error(f"폰트 파일을 다운로드하는 중 오류가 발생했습니다: {e}")
-            return None
-    return tmp_path
-
-# 폰트 경로를 가져오고 Matplotlib에 설정합니다.
+    """로컬에 설치된 한글 폰트 경로를 반환합니다. 페이지를 그릴 때 네트워크를 쓰지 않습니다."""
+    return find_font()
+
+# 폰트 경로를 가져옵니다.
 FONT_PATH = get_font_path()
-if FONT_PATH:
-    plt.rcParams["font.family"] = font_manager.FontProperties(fname=FONT_PATH).get_name()
-else:
-    st.error("폰트를 불러올 수 없어 워드클라우드 생성이 불가능합니다.")
+if not FONT_PATH:
+    st.error("한글 폰트를 찾을 수 없어 워드클라우드 생성이 불가능합니다. `python -m utils.fonts --download`로 폰트를 받거나 WORDCLOUD_FONT_PATH를 설정해주세요.")
 
 
 # 📦 댓글 및 영상 제목 수집 함수
-def get_video_data(youtube_url, max_comments):
-    """YouTube API를 사용하여 댓글과 영상 제목을 수집합니다."""
+def get_video_data(video_id, max_comments, dedup=None):
+    """로컬 저장소를 거쳐 댓글을 수집하고 (불용어를 빼지 않은 단어 빈도, 댓글 수, 영상 제목)을 반환합니다."""
     try:
-        video_id = youtube_url.split("v=")[-1].split("&")[0]
-        api_key = st.secrets["youtube_api_key"]
-        youtube = build("youtube", "v3", developerKey=api_key)
-        
-        # 영상 제목 가져오기
-        video_title = ""
-        try:
-            video_response = youtube.videos().list(
-                part='snippet',
-                id=video_id
-            ).execute()
-            video_title = video_response['items'][0]['snippet']['title']
-        except Exception as e:
-            st.warning(f"영상 제목을 가져오는 데 실패했습니다: {e}")
-            video_title = "Untitled"
-
-
-        # 댓글 가져오기
-        comments = []
-        next_page_token = None
-        while len(comments) < max_comments:
-            request_count = min(100, max_comments - len(comments))
-            if request_count <= 0:
-                break
-
-            response = youtube.commentThreads().list(
-                part="snippet",
-                videoId=video_id,
-                maxResults=request_count,
-                pageToken=next_page_token,
-                order="relevance",
-                textFormat="plainText"
-            ).execute()
-
-            for item in response["items"]:
-                comment = item["snippet"]["topLevelComment"]["snippet"]["textDisplay"]
-                comments.append(comment)
-
-            next_page_token = response.get("nextPageToken")
-            if not next_page_token:
-                break
-        
-        return comments, video_title
+        api_key = get_api_key()
+
+        # 영상 제목 가져오기 (영상이 없거나 할당량이 바닥나 조회하지 못하면 None)
+        info = load_video_info(video_id, api_key)
+        if info is None:
+            st.warning("영상 제목을 가져오지 못했습니다. 영상 ID나 오늘 API 할당량을 확인해주세요.")
+        video_title = info["title"] if info else "Untitled"
+
+
+        # 댓글 가져오기 + 단어 세기 (저장소가 바뀌지 않았으면 캐시된 빈도 사용)
+        word_counts, comment_count = count_comment_tokens(video_id, api_key, max_comments, tokenizer="words", dedup=dedup)
+        if quota_exhausted(api_key):
+            st.warning("⚠️ 오늘 API 할당량을 모두 사용해 저장된 댓글까지만 분석했습니다. 할당량이 초기화되면 이어서 수집합니다.")
+        return word_counts, comment_count, video_title
 
     except Exception as e:
         st.error(f"데이터 수집 중 오류가 발생했습니다: {e}")
         st.info("올바른 YouTube 영상 URL인지, API 키가 유효한지 확인해주세요.")
-        return [], None
-
-# 🧼 텍스트 전처리
-def clean_text(text):
-    """특수문자, 이모티콘 등을 제거하여 텍스트를 정제합니다."""
-    cleaned_text = re.sub(r"[^\uAC00-\uD7A3a-zA-Z0-9\s]", "", text)
-    return cleaned_text.strip()
-
-def tokenize(texts, stopwords):
-    """텍스트 리스트에서 불용어를 제외하고 2글자 이상의 한글/영어 단어만 추출하여 토큰화합니다."""
-    token_list = []
-    for line in texts:
-        tokens = re.findall(r"[a-zA-Z가-힣]{2,}", line.lower())
-        filtered_tokens = [word for word in tokens if word not in stopwords]
-        token_list.extend(filtered_tokens)
-    return token_list
-
-# 🌥️ 워드클라우드 생성 함수
-def generate_wordcloud(tokens, dpi=200, max_words=100):
-    """단어 토큰을 기반으로 워드클라우드 Figure 객체를 생성하여 반환합니다."""
-    if not FONT_PATH:
-        st.error("폰트 파일이 없어 워드클라우드를 생성할 수 없습니다.")
-        return None
-
-    word_freq = Counter(tokens).most_common(max_words)
-    
-    wc = WordCloud(
-        font_path=FONT_PATH,
-        background_color="white",
-        width=800,
-        height=600,
-        max_words=max_words
-    ).generate_from_frequencies(dict(word_freq))
-
-    fig, ax = plt.subplots(figsize=(10, 7.5), dpi=dpi)
-    ax.imshow(wc, interpolation="bilinear")
-    ax.axis("off")
-    return fig
+        return None, 0, None
 
 # ────────────────────── Streamlit UI ──────────────────────
 st.set_page_config("YouTube 댓글 워드클라우드", "☁️", layout="wide")
@@ -143,48 +73,65 @@ with col1:
     max_comments = st.slider("💬 분석할 최대 댓글 수", min_value=100, max_value=2000, step=100, value=500)
 with col2:
     max_words = st.slider("🔠 워드클라우드에 표시할 단어 수", min_value=20, max_value=200, step=10, value=100)
+preview = st.checkbox("⚡ 빠른 미리보기 (저해상도로 배치해 빠르게 그립니다)", value=True)
+dedup = DEDUP_OPTIONS[st.radio(
+    "🧹 복사·스팸 댓글 (거의 같은 댓글을 묶어서 세기)", list(DEDUP_OPTIONS), horizontal=True,
+    help="묶음 크기의 로그만큼: 같은 댓글이 1·2·4·8…개가 될 때마다 한 번 더 셉니다."
+)]
+
+stopword_list = [word.strip() for word in user_stopwords.lower().split(',') if word.strip()]
+video_id = extract_video_id(youtube_url)
+analysis_key = (youtube_url, max_comments, dedup)
 
 if st.button("🚀 워드클라우드 생성"):
     if not youtube_url:
         st.warning("YouTube 링크를 입력해주세요.")
+    elif not video_id:
+        st.error("⚠️ 유효한 YouTube URL이 아닙니다.")
     elif not FONT_PATH:
         st.error("폰트 파일을 불러올 수 없어 앱을 실행할 수 없습니다.")
     else:
-        stopword_list = [word.strip() for word in user_stopwords.lower().split(',') if word.strip()]
-        
-        with st.spinner("YouTube 댓글과 영상 정보를 수집하고 있습니다..."):
-            comments, video_title = get_video_data(youtube_url, max_comments)
+        with st.spinner("YouTube 댓글과 영상 정보를 수집하고 단어를 분석하고 있습니다..."):
+            word_counts, comment_count, video_title = get_video_data(video_id, max_comments, dedup)
 
-        if not comments:
+        if not comment_count:
             st.error("댓글을 가져오지 못했습니다. 영상 ID, 댓글 공개 여부 또는 API 키 설정을 확인해주세요.")
         else:
-            st.success(f"✅ '{video_title}' 영상의 댓글 {len(comments)}개를 성공적으로 수집했습니다!")
-
-            with st.spinner("텍스트를 전처리하고 단어를 분석 중입니다..."):
-                cleaned = [clean_text(c) for c in comments]
-                tokens = tokenize(cleaned, stopword_list)
-
-            if not tokens:
-                st.warning("분석할 수 있는 유효한 단어(2글자 이상 한글/영어)가 댓글에 충분하지 않습니다.")
-            else:
-                st.info(f"분석된 유효 단어 수: {len(tokens)}개")
-                with st.spinner("☁️ 워드클라우드를 생성하고 있습니다..."):
-                    wordcloud_fig = generate_wordcloud(tokens, dpi=200, max_words=max_words)
-                    
-                    if wordcloud_fig:
-                        st.pyplot(wordcloud_fig)
-                        
-                        # 이미지 다운로드 기능 추가
-                        buf = io.BytesIO()
-                        wordcloud_fig.savefig(buf, format="png", bbox_inches='tight')
-                        
-                        # 파일명으로 사용할 수 없는 문자 제거
-                        clean_title = re.sub(r'[\\/*?:"<>|]', "", video_title)
-                        file_name = f"{clean_title}_워드클라우드.png"
-                        
-                        st.download_button(
-                            label="🖼️ 이미지 다운로드",
-                            data=buf.getvalue(),
-                            file_name=file_name,
-                            mime="image/png"
-                        )
+            # 불용어를 빼지 않은 빈도표를 저장해 두고, 불용어·단어 수를 바꾸면 이 표만 다시 거릅니다.
+            st.session_state["wordcloud"] = {
+                "key": analysis_key,
+                "title": video_title,
+                "comment_count": comment_count,
+                "counts": word_counts,
+            }
+
+result = st.session_state.get("wordcloud")
+if result and result["key"] == analysis_key:
+    video_title = result["title"]
+    st.success(f"✅ '{video_title}' 영상의 댓글 {result['comment_count']}개를 성공적으로 수집했습니다!")
+
+    word_counts = remove_stopwords(result["counts"], stopword_list)
+    if not word_counts:
+        st.warning("분석할 수 있는 유효한 단어(2글자 이상 한글/영어)가 댓글에 충분하지 않습니다.")
+    else:
+        st.info(f"분석된 유효 단어 수: {sum(word_counts.values())}개")
+        # 빈도표·단어 수·폰트가 같으면 캐시된 이미지를 그대로 씁니다.
+        frequencies = tuple(word_counts.most_common(max_words))
+        with st.spinner("☁️ 워드클라우드를 생성하고 있습니다..."):
+            image = render_wordcloud(frequencies, max_words, FONT_PATH, preview)
+        st.image(image, width="stretch")
+
+        # 파일명으로 사용할 수 없는 문자 제거
+        clean_title = re.sub(r'[\\/*?:"<>|]', "", video_title)
+        file_name = f"{clean_title}_워드클라우드.png"
+
+        # 고해상도 이미지는 다운로드 버튼을 누를 때 만듭니다.
+        st.download_button(
+            label="🖼️ 이미지 다운로드",
+            data=lambda: render_wordcloud(frequencies, max_words, FONT_PATH, scale=EXPORT_SCALE),
+            file_name=file_name,
+            mime="image/png"
+        )
+
+# ⏱️ 성능 패널 (사이드바)
+performance_panel(run_metrics)
@@ -0,0 +1,129 @@
+import streamlit as st
+import pandas as pd
+from utils.youtube import get_api_key
+from utils.batch import analyze_videos, merge_results, parse_video_ids, MAX_WORKERS
+from utils.artifacts import load_artifacts
+from utils.scheduler import quota_exhausted
+from utils.metrics import snapshot
+from utils.progress import performance_panel
+
+# ✅ 샘플 URL & API Key
+SAMPLE_URLS = "https://www.youtube.com/watch?v=WXuK6gekU1Y"
+API_KEY = get_api_key()
+# 이번 실행에서 기록된 단계별 시간은 페이지 끝에서 사이드바 성능 패널로 보여 줍니다.
+run_metrics = snapshot()
+
+# 📊 상위 20개 단어 차트
+def top_words_chart(freq, title):
+    df_freq = pd.DataFrame(freq.most_common(20), columns=["단어", "빈도수"])
+    return alt.Chart(df_freq).mark_bar().encode(
+        x=alt.X("단어:N", sort="-y"),
+        y="빈도수:Q",
+        tooltip=["단어", "빈도수"]
+    ).properties(height=300, title=title)
+
+# ------------------ Streamlit UI ------------------
+
+st.title("📦 YouTube 댓글 일괄 분석기 (여러 영상 비교)")
+
+urls_text = st.text_area("📺 영상 URL 또는 video ID (줄마다 하나씩)", value=SAMPLE_URLS, height=150)
+id_file = st.file_uploader("📄 또는 video ID 파일 업로드 (.txt / .csv)", type=["txt", "csv"])
+
+col1, col2 = st.columns(2)
+with col1:
+    select_count = st.selectbox("영상당 댓글 개수 (빠른 선택)", ["100", "500", "1000", "모두"], index=0)
+with col2:
+    workers = st.slider("동시 수집 영상 수", 1, 8, value=MAX_WORKERS)
+
+comment_limit = -1 if select_count == "모두" else int(select_count)
+include_replies = st.checkbox("💬 답글도 함께 수집 (답글 수만큼 API 호출이 늘어납니다)", value=False)
+use_artifacts = st.checkbox("📁 미리 계산한 결과가 있으면 바로 불러오기 (python -m utils.artifacts)", value=True)
+
+if st.button("일괄 분석 시작"):
+    # altair는 차트를 그릴 때 불러옵니다. (페이지 첫 화면을 빠르게)
+    import altair as alt
+
+    source = urls_text + "\n" + (id_file.getvalue().decode("utf-8") if id_file else "")
+    video_ids = parse_video_ids(source)
+    if not video_ids:
+        st.error("⚠️ 유효한 YouTube URL 또는 video ID가 없습니다.")
+        st.stop()
+
+    # 같은 수집 범위로 미리 만든 결과 파일이 있는 영상은 API를 호출하지 않습니다.
+    loaded = {}
+    if use_artifacts:
+        loaded = {
+            video_id: artifact for video_id in video_ids
+            if (artifact := load_artifacts(video_id, comment_limit, include_replies)) is not None
+        }
+    pending = [video_id for video_id in video_ids if video_id not in loaded]
+
+    analyzed = {}
+    if pending:
+        with st.spinner(f"🔄 영상 {len(pending)}개 동시 수집 및 분석 중..."):
+            analyzed = dict(zip(pending, analyze_videos(pending, API_KEY, comment_limit, include_replies, max_workers=workers)))
+    results = [loaded.get(video_id) or analyzed[video_id] for video_id in video_ids]
+
+    if loaded:
+        oldest = min(artifact["generated_at"] for artifact in loaded.values())
+        st.info(f"📁 영상 {len(loaded)}개는 미리 계산한 결과를 불러왔습니다. (가장 오래된 결과: {oldest})")
+
+    if quota_exhausted(API_KEY):
+        st.warning("⚠️ 오늘 API 할당량을 모두 사용해 저장된 댓글까지만 분석했습니다. 할당량이 초기화되면 이어서 수집합니다.")
+
+    for failed in [r for r in results if "error" in r]:
+        st.warning(f"⚠️ {failed['video_id']} 수집 실패: {failed['error']}")
+
+    results = [r for r in results if "error" not in r]
+    if not results:
+        st.stop()
+
+    merged = merge_results(results)
+    st.success(f"✅ 영상 {len(results)}개, 댓글 {merged['comment_count']}개 분석 완료!")
+
+    # ------------------- 🔗 통합 보기 -------------------
+    st.subheader("🔗 영상별 요약")
+    st.dataframe(pd.DataFrame([{
+        "영상": r["title"],
+        "video ID": r["video_id"],
+        "댓글 수": r["comment_count"],
+        "상위 단어": ", ".join(w for w, _ in r["words"].most_common(5)),
+    } for r in results]))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.altair_chart(top_words_chart(merged["nouns"], "전체 상위 20개 단어"), use_container_width=True)
+    with col2:
+        st.altair_chart(top_words_chart(merged["words"], "전체 상위 20개 단어 (불용어 제거)"), use_container_width=True)
+
+    st.subheader("🕒 시간대별 댓글 수 (영상별)")
+    st.altair_chart(
+        alt.Chart(merged["hourly"]).mark_line(point=True).encode(
+            x=alt.X("시간대 (시):O"),
+            y="댓글 수:Q",
+            color="영상:N",
+            tooltip=["영상", "시간대 (시)", "댓글 수", "좋아요 수"]
+        ),
+        use_container_width=True
+    )
+
+    # ------------------- 🎬 영상별 보기 -------------------
+    st.subheader("🎬 영상별 분석")
+    for tab, r in zip(st.tabs([f"{i + 1}. {r['title'][:20]}" for i, r in enumerate(results)]), results):
+        with tab:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.altair_chart(top_words_chart(r["nouns"], "상위 20개 단어"), use_container_width=True)
+            with col2:
+                st.altair_chart(top_words_chart(r["words"], "상위 20개 단어 (불용어 제거)"), use_container_width=True)
+            st.altair_chart(
+                alt.Chart(r["hourly"]).mark_bar().encode(
+                    x=alt.X("시간대 (시):O", sort="ascending"),
+                    y="좋아요 수:Q",
+                    tooltip=["시간대 (시)", "댓글 수", "좋아요 수"]
+                ).properties(title="시간대별 좋아요 수 (합계)"),
+                use_container_width=True
+            )
+
+# ⏱️ 성능 패널 (사이드바)
+performance_panel(run_metrics)
@@ -0,0 +1,93 @@
+import os
+import tempfile
+
+import pytest
+
+# utils 모듈은 import할 때 저장 위치를 정하므로, 개발용 data/를 건드리지 않도록 먼저 임시 폴더로 돌립니다.
+_DATA_DIR = tempfile.mkdtemp(prefix="comment-tests-")
+os.environ.setdefault("COMMENT_STORE_PATH", os.path.join(_DATA_DIR, "comments.db"))
+os.environ.setdefault("QUOTA_LEDGER_PATH", os.path.join(_DATA_DIR, "quota.db"))
+os.environ.setdefault("NOUN_MODEL_DIR", os.path.join(_DATA_DIR, "nouns"))
+os.environ.setdefault("TREND_STORE_PATH", os.path.join(_DATA_DIR, "trends.db"))
+os.environ.setdefault("TOKENIZE_WORKERS", "1")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """테스트마다 빈 댓글 저장소를 씁니다."""
+    import utils.store
+
+    monkeypatch.setattr(utils.store, "DB_PATH", str(tmp_path / "comments.db"))
+    return utils.store
+
+
+class FakeApi:
+    """utils.store가 쓰는 YouTube 호출을 대신하는 메모리 속 영상 하나입니다.
+
+    댓글은 최신순으로 page_size개씩 페이지를 넘겨주고, 인라인 답글은 스레드마다 INLINE_REPLIES개까지 담습니다.
+    quota_pages를 정하면 그만큼 페이지를 넘겨준 뒤 QuotaExceeded를 발생시킵니다.
+    """
+
+    INLINE_REPLIES = 1
+
+    def __init__(self, page_size=3):
+        self.page_size = page_size
+        self.threads = []
+        self.replies = {}
+        self.pages = 0
+        self.reply_calls = []
+        self.quota_pages = None
+        self._clock = 1_700_000_000
+
+    def add_comment(self, text, replies=0, hidden=0):
+        """댓글을 가장 최신으로 더합니다. hidden은 답글 수에만 들어가고 받을 수 없는 답글(삭제·검토 중) 수입니다."""
+        self._clock += 60
+        comment_id = f"c{len(self.threads)}"
+        self.threads.insert(0, {
+            "comment_id": comment_id, "text": text, "published_at": self._iso(self._clock), "like_count": 0,
+            "parent_id": None, "reply_count": replies + hidden,
+        })
+        self.replies[comment_id] = [
+            {"comment_id": f"{comment_id}.r{i}", "text": f"{text} 답글 {i}", "published_at": self._iso(self._clock + i),
+             "like_count": 0, "parent_id": comment_id, "reply_count": 0}
+            for i in range(replies)
+        ]
+        return comment_id
+
+    @staticmethod
+    def _iso(epoch):
+        from datetime import datetime, timezone
+
+        return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def iter_comment_pages(self, api_key, video_id, page_token=None, max_items=-1, stop=None, include_replies=False):
+        from utils.scheduler import QuotaExceeded
+
+        start, received = int(page_token or 0), 0
+        while True:
+            if self.quota_pages is not None and self.pages >= self.quota_pages:
+                raise QuotaExceeded(api_key)
+            self.pages += 1
+            rows = [
+                dict(row, replies=self.replies[row["comment_id"]][:self.INLINE_REPLIES] if include_replies else [])
+                for row in self.threads[start:start + self.page_size]
+            ]
+            start += self.page_size
+            next_token = str(start) if start < len(self.threads) else None
+            received += len(rows)
+            yield rows, next_token
+            if not next_token or (max_items != -1 and received >= max_items) or (stop and stop(rows)):
+                return
+
+    def get_all_replies(self, api_key, parent_id):
+        self.reply_calls.append(parent_id)
+        return list(self.replies[parent_id])
+
+
+@pytest.fixture
+def api(store, monkeypatch):
+    """빈 저장소와, 저장소가 호출할 가짜 YouTube API를 준비합니다."""
+    fake = FakeApi()
+    monkeypatch.setattr(store, "iter_comment_pages", fake.iter_comment_pages)
+    monkeypatch.setattr(store, "get_all_replies", fake.get_all_replies)
+    return fake
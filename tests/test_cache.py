@@ -0,0 +1,145 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from utils import cache
+from utils.cache import AnalysisCache, cache_bytes
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    created = []
+
+    def make(name, **kwargs):
+        created.append(AnalysisCache(name, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(cache, "CACHE_MAX_BYTES", 10_000)
+    yield make
+    for c in created:
+        c.clear()
+        cache._caches.remove(c)
+
+
+def array(nbytes):
+    return np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_get_requires_the_same_watermark(caches):
+    c = caches("watermark")
+    c.put("key", 1, "result")
+    assert c.get("key", 1) == "result"
+    assert c.get("key", 2) is None
+    assert c.get("key", None) is None
+    c.put("key", 2, "newer")
+    assert c.get("key", 1) is None
+    assert c.stats()["entries"] == 1
+
+
+def test_entries_expire_after_ttl(caches):
+    c = caches("ttl", ttl=0)
+    c.put("key", 1, "result")
+    time.sleep(0.01)
+    assert c.get("key", 1) is None
+    assert c.stats()["expirations"] == 1
+
+
+def test_byte_budget_evicts_least_recently_used_across_caches(caches):
+    first, second = caches("first"), caches("second")
+    first.put("a", 1, array(4000))
+    second.put("b", 1, array(4000))
+    assert first.get("a", 1) is not None
+    # 상한을 넘으면 어느 캐시든 가장 오래 쓰지 않은 항목(b)부터 지웁니다.
+    second.put("c", 1, array(4000))
+    assert second.get("b", 1) is None
+    assert first.get("a", 1) is not None and second.get("c", 1) is not None
+    assert cache_bytes()[0] <= cache.CACHE_MAX_BYTES
+    assert second.stats()["evicted_bytes"] == 4000
+
+    # 혼자서 상한을 넘는 값은 넣지 않고, 다른 항목도 지우지 않습니다.
+    first.put("huge", 1, array(20_000))
+    assert first.get("huge", 1) is None
+    assert first.get("a", 1) is not None
+    assert first.stats()["bytes"] == 4000
+
+
+def test_max_entries_evicts_oldest(caches):
+    c = caches("entries", max_entries=2)
+    for key in "abc":
+        c.put(key, 1, key)
+    assert c.get("a", 1) is None
+    assert (c.get("b", 1), c.get("c", 1)) == ("b", "c")
+
+
+def run_together(n, target):
+    results, threads = [None] * n, []
+    for i in range(n):
+        def run(i=i):
+            try:
+                results[i] = target()
+            except Exception as e:
+                results[i] = e
+        threads.append(threading.Thread(target=run))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight_runs_concurrent_calls_once(caches):
+    c = caches("flight")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results = run_together(8, lambda: c.single_flight("key", compute))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert c.stats()["coalesced"] == 7
+
+
+def test_single_flight_shares_errors(caches):
+    c = caches("flight errors")
+
+    def compute():
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    results = run_together(4, lambda: c.single_flight("key", compute))
+    assert all(isinstance(result, ValueError) for result in results)
+    # 끝난 계산은 기억하지 않으므로 다음 호출은 다시 계산합니다.
+    assert c.single_flight("key", lambda: "ok") == "ok"
+
+
+class Stopped(BaseException):
+    pass
+
+
+def test_single_flight_hands_over_when_the_leader_is_interrupted(caches):
+    c = caches("flight handover")
+    started, calls = threading.Event(), []
+
+    def interrupted():
+        started.set()
+        time.sleep(0.2)
+        raise Stopped()
+
+    def leader():
+        try:
+            c.single_flight("key", interrupted)
+        except Stopped:
+            return "stopped"
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    started.wait()
+    # 기다리던 호출이 이어서 계산합니다.
+    assert c.single_flight("key", lambda: calls.append(1) or "done") == "done"
+    thread.join()
+    assert calls == [1]
@@ -0,0 +1,21 @@
+import numpy as np
+
+from utils import charts
+from utils.charts import box_stats
+
+
+def test_box_stats_keeps_the_largest_outliers(monkeypatch):
+    monkeypatch.setattr(charts, "OUTLIER_LIMIT", 3)
+    values = [-100, -90, -80, -70, *range(40, 61), 200, 300, 400, 500]
+    stats, outliers = box_stats(["a"] * len(values), values)
+
+    assert outliers["값"].tolist() == [500, 400, 300]
+    row = stats.iloc[0]
+    assert (row["하단"], row["상단"], row["댓글 수"]) == (40, 60, len(values))
+    assert row["중앙값"] == np.median(values)
+
+
+def test_box_stats_fills_with_low_outliers_when_few_are_high():
+    values = [-100, -90, *range(40, 61), 300]
+    _, outliers = box_stats([1] * len(values), values)
+    assert outliers["값"].tolist() == [300, -90, -100]
@@ -0,0 +1,35 @@
+import numpy as np
+
+from utils.dedup import NearDuplicateIndex
+
+SPAM = "구독하고 갑니다 맞구독 해주세요"
+
+
+def test_near_duplicates_share_a_cluster():
+    index = NearDuplicateIndex()
+    labels = index.add([SPAM, "구독하고    갑니다\n맞구독 해주세요!!!!", SPAM + " ㅎ", "노래가 정말 좋네요 오늘도 듣고 갑니다"])
+    assert labels[0] == labels[1] == labels[2] != labels[3]
+    assert index.clusters == 2
+
+
+def test_comments_without_shingles_only_group_exact_copies():
+    index = NearDuplicateIndex()
+    texts = ["最高の曲です", "Отличная песня", "😍😍", "👍", "ㅋ", "ok", "😍😍"]
+    labels = index.add(texts)
+    # 3-gram이 없는 댓글끼리 한 묶음이 되지 않고, 글자까지 같은 댓글만 묶입니다.
+    assert len(set(labels[:6].tolist())) == 6
+    assert labels[6] == labels[2]
+    # 다음 묶음(API 페이지)에 와도 같은 묶음으로 들어갑니다.
+    later = index.add(["Отличная песня", "最高の曲です!", "Прекрасная песня"])
+    assert later[0] == labels[1]
+    assert later[1] != labels[0] and later[2] != labels[1]
+
+
+def test_collapse_counts_each_cluster_by_weight():
+    texts = [SPAM] * 8 + ["다른 댓글 하나"]
+    assert NearDuplicateIndex("once").collapse(texts) == [SPAM, "다른 댓글 하나"]
+    # "log"는 묶음의 1·2·4·8번째 댓글을 넘겨 1 + log₂(8) = 4번 셉니다.
+    index = NearDuplicateIndex("log")
+    kept = index.collapse(texts[:3]) + index.collapse(texts[3:])
+    assert kept.count(SPAM) == 4
+    assert np.array_equal(np.sort(index.sizes), [1, 8])
@@ -0,0 +1,55 @@
+from collections import namedtuple
+
+import pytest
+
+import utils.nouns as nouns
+from utils.text import count_nouns
+
+Score = namedtuple("Score", "frequency score")
+
+TEXTS = [
+    "노래가 너무 좋아요 무대를 보고 왔어요 멤버들 최고",
+    "노래를 들으러 또 왔어요 the great song",
+    "무대 최고 노래 최고",
+    "멤버 전원 사랑해요 song again",
+]
+
+
+@pytest.fixture
+def write_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(nouns, "MODEL_PATH", str(tmp_path / "nouns.arrow"))
+    monkeypatch.setattr(nouns, "_model", None)
+
+    def write(words):
+        nouns._write_model({word: Score(1, 1.0) for word in words}, version=1)
+        return nouns.current_model()
+
+    return write
+
+
+def test_young_model_falls_back_to_regex_counts(write_model):
+    model = write_model(["노래", "무대", "멤버", "최고", "사랑"])
+    assert model is None
+    assert nouns.count_model_nouns(TEXTS, model) == count_nouns(TEXTS)
+
+
+def test_model_counts_merge_regex_tokens_into_nouns(write_model):
+    filler = [f"명사{i}" for i in range(nouns.MIN_MODEL_NOUNS)]
+    model = write_model(["노래", "무대", "멤버", "최고", "사랑", *filler])
+    assert model is not None
+
+    regex = count_nouns(TEXTS, lower=True)
+    counts = nouns.count_model_nouns(TEXTS, model, lower=True)
+    # 조사·어미가 붙은 어절은 명사로 합쳐 셉니다.
+    assert counts["노래"] == regex["노래"] + regex["노래가"] + regex["노래를"]
+    assert counts["무대"] == regex["무대"] + regex["무대를"]
+    assert counts["멤버"] == regex["멤버"] + regex["멤버들"]
+    assert counts["사랑"] == regex["사랑해요"]
+    # 영어 단어는 규칙 기반과 같고, 명사로 시작하지 않는 어절만 빠집니다.
+    assert {t: n for t, n in counts.items() if t.isascii()} == {t: n for t, n in regex.items() if t.isascii()}
+    assert set(counts) - set(regex) <= {"노래", "무대", "멤버", "사랑"}
+    assert sum(counts.values()) == sum(
+        n for t, n in regex.items() if t.isascii() or model.noun_of(t) is not None
+    )
+    assert not set(counts) & {"좋아요", "왔어요", "너무"}
+
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from utils.scheduler import QuotaExceeded
+
+VIDEO = "video"
+
+
+def test_short_reply_threads_are_not_refetched_within_ttl(api, store):
+    full = api.add_comment("답글 다 받는 댓글", replies=3)
+    short = api.add_comment("삭제된 답글이 있는 댓글", replies=2, hidden=1)
+    store.sync_comments(VIDEO, "key", include_replies=True)
+    assert sorted(api.reply_calls) == sorted([full, short])
+
+    # 받을 수 없는 답글 때문에 계속 모자란 스레드도 REFRESH_TTL 안에는 다시 요청하지 않습니다.
+    api.reply_calls.clear()
+    for _ in range(3):
+        frame = store.load_comments(VIDEO, "key", max_comments=10, include_replies=True)
+    assert api.reply_calls == []
+    assert len(frame) == 2 + 3 + 2
+    store.sync_comments(VIDEO, "key", include_replies=True)
+    assert api.reply_calls == []
+
+
+def test_short_reply_threads_are_refetched_after_ttl_or_new_replies(api, store, monkeypatch):
+    short = api.add_comment("삭제된 답글이 있는 댓글", replies=2, hidden=1)
+    store.sync_comments(VIDEO, "key", include_replies=True)
+
+    api.reply_calls.clear()
+    monkeypatch.setattr(store, "REFRESH_TTL", 0)
+    time.sleep(0.01)
+    store.sync_comments(VIDEO, "key", include_replies=True)
+    assert api.reply_calls == [short]
+
+
+def add_comments(api, n, prefix="댓글"):
+    return [api.add_comment(f"{prefix} {i}") for i in range(n)]
+
+
+def stored_ids(store):
+    with store._connect() as conn:
+        return {row[0] for row in conn.execute("SELECT comment_id FROM comments WHERE parent_id IS NULL")}
+
+
+def test_sync_comments_resumes_backfill_after_quota(api, store):
+    ids = add_comments(api, 10)
+    api.quota_pages = 2
+    with pytest.raises(QuotaExceeded):
+        store.sync_comments(VIDEO, "key")
+    assert len(stored_ids(store)) == 6
+
+    # 다음 호출은 저장된 pageToken부터 남은 두 페이지만 받습니다.
+    api.quota_pages = None
+    assert store.sync_comments(VIDEO, "key") == 10
+    assert api.pages == 4
+    assert stored_ids(store) == set(ids)
+
+
+def test_refresh_fetches_only_comments_newer_than_the_watermark(api, store, monkeypatch):
+    add_comments(api, 10)
+    store.sync_comments(VIDEO, "key")
+    pages = api.pages
+
+    new = add_comments(api, 2, "새 댓글")
+    monkeypatch.setattr(store, "REFRESH_TTL", 0)
+    assert store.sync_comments(VIDEO, "key") == 12
+    # 첫 페이지(새 댓글 2개 + 워터마크의 댓글)에서 멈춥니다.
+    assert api.pages == pages + 1
+    assert set(new) <= stored_ids(store)
+
+
+def test_interrupted_refresh_resumes_without_gaps(api, store, monkeypatch):
+    add_comments(api, 4)
+    store.sync_comments(VIDEO, "key")
+
+    new = add_comments(api, 5, "새 댓글")
+    monkeypatch.setattr(store, "REFRESH_TTL", 0)
+    api.quota_pages = api.pages + 1
+    with pytest.raises(QuotaExceeded):
+        store.sync_comments(VIDEO, "key")
+    # 첫 페이지의 새 댓글 3개만 저장되어 워터마크 아래에 빈 구간이 있습니다.
+    assert len(stored_ids(store) & set(new)) == 3
+
+    # 그 사이 달린 댓글까지, 끊긴 페이지부터 이어 받고 한 번 더 새로고침합니다.
+    newest = api.add_comment("더 새 댓글")
+    api.quota_pages = None
+    assert store.sync_comments(VIDEO, "key") == 10
+    assert set(new) | {newest} <= stored_ids(store)
+
+
+def test_collection_watermark_changes_only_when_comments_change(api, store, monkeypatch):
+    add_comments(api, 4)
+    assert store.collection_watermark(VIDEO) is None
+
+    store.sync_comments(VIDEO, "key")
+    watermark = store.collection_watermark(VIDEO)
+    assert watermark is not None
+
+    frame = store.load_comments(VIDEO, "key", max_comments=3)
+    assert frame["text"].tolist() == ["댓글 3", "댓글 2", "댓글 1"]
+    assert store.load_comments(VIDEO, "key", max_comments=3) is frame
+
+    monkeypatch.setattr(store, "REFRESH_TTL", 0)
+    # 새로고침 직후가 아니면 다음 수집에서 API를 호출하므로 캐시 키로 쓰지 않습니다.
+    assert store.collection_watermark(VIDEO) is None
+    store.sync_comments(VIDEO, "key")
+    monkeypatch.setattr(store, "REFRESH_TTL", 600)
+    assert store.collection_watermark(VIDEO) == watermark
+
+    api.add_comment("새 댓글")
+    monkeypatch.setattr(store, "REFRESH_TTL", 0)
+    store.sync_comments(VIDEO, "key")
+    monkeypatch.setattr(store, "REFRESH_TTL", 600)
+    assert store.collection_watermark(VIDEO) != watermark
+    assert store.load_comments(VIDEO, "key", max_comments=3)["text"].iloc[0] == "새 댓글"
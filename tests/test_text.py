@@ -0,0 +1,60 @@
+"""count_* 함수가 예전 댓글별 토큰화(soynlp RegexTokenizer, 정제 후 정규식)와 같은 빈도를 내는지 확인합니다."""
+import random
+import re
+from collections import Counter
+
+import pytest
+from soynlp.tokenizer import RegexTokenizer
+
+from utils import text
+from utils.text import DEFAULT_STOPWORDS, count_meaningful_words, count_nouns, count_words
+
+
+# 예전 구현 (댓글마다 토큰화한 뒤 Counter)
+def reference_nouns(comments, lower=False):
+    tokenizer = RegexTokenizer()
+    tokens = [t for comment in comments for t in tokenizer.tokenize(comment.lower() if lower else comment)]
+    return Counter(t for t in tokens if len(t) > 1)
+
+
+def reference_meaningful_words(comments):
+    return Counter({t: n for t, n in reference_nouns(comments, lower=True).items() if t not in DEFAULT_STOPWORDS})
+
+
+def reference_words(comments, stopwords):
+    cleaned = [re.sub(r"[^가-힣a-zA-Z0-9\s]", "", c).strip() for c in comments]
+    return Counter(w for line in cleaned for w in re.findall(r"[a-zA-Z가-힣]{2,}", line.lower()) if w not in stopwords)
+
+
+MIXED = [
+    "노래가 너무 좋아요!! 최고👍👍",
+    "This song's chorus is AMAZING ㅋㅋㅋ ㅠㅠ",
+    "1:23 부분 미쳤다 ㅎㅎ 10/10 +3.5점",
+    "Café Ñandú résumé — naïve 😍😍",
+    "영상이\n진짜로  좋네요 ^^ <3 ?!",
+    "ㅏㅏㅏ 와.. 'quoted' `tick`s 아이돌's",
+    "",
+    "🔥🔥🔥",
+]
+
+ALPHABET = list("가나다라마바사아자차카타파하ㄱㄴㅋㅎㅏㅓㅠabcsABCS'`[]0123456789.+-:/!?~^ \n") + ["😍", "👍", "é", "ÿ"]
+
+
+def random_comments(seed, n=300):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("comments", [MIXED, random_comments(1), random_comments(2)])
+def test_counts_match_per_comment_tokenizers(comments):
+    assert count_nouns(comments) == reference_nouns(comments)
+    assert count_nouns(comments, lower=True) == reference_nouns(comments, lower=True)
+    assert count_meaningful_words(comments) == reference_meaningful_words(comments)
+    assert count_words(comments, ["영상", "the"]) == reference_words(comments, {"영상", "the"})
+
+
+def test_tokens_do_not_cross_chunk_boundaries(monkeypatch):
+    comments = random_comments(3)
+    monkeypatch.setattr(text, "CHUNK_SIZE", 7)
+    assert count_nouns(comments) == reference_nouns(comments)
+    assert count_words(comments) == reference_words(comments, set())
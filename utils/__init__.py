@@ -0,0 +1 @@
+"""페이지들이 함께 쓰는 댓글 수집·분석 모듈 모음입니다."""
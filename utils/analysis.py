@@ -0,0 +1,99 @@
+from collections import Counter
+from contextlib import closing
+
+from utils.cache import AnalysisCache
+from utils.cooccurrence import TermMatrixBuilder
+from utils.dedup import NearDuplicateIndex
+from utils.metrics import stage
+from utils.nouns import count_model_nouns, current_model, update_in_background
+from utils.scheduler import quota_exhausted
+from utils.store import collection_watermark, iter_comments
+from utils.text import count_words
+
+# 캐시 키에 들어가는 토큰화 설정 이름 → (댓글 목록, 명사 모델)을 세는 함수
+TOKENIZERS = {
+    "nouns": lambda texts, model: count_model_nouns(texts, model),
+    "nouns_lower": lambda texts, model: count_model_nouns(texts, model, lower=True),
+    "words": lambda texts, model: count_words(texts),
+}
+# 명사 모델(utils.nouns)을 쓰는 토큰화 설정
+MODEL_TOKENIZERS = {"nouns", "nouns_lower"}
+
+_token_counts = AnalysisCache("token_counts")
+
+
+# 📊 영상 댓글의 토큰 빈도 (캐시)
+def count_comment_tokens(video_id, api_key, max_comments=100, include_replies=False, tokenizer="nouns",
+                         on_progress=None, dedup=None, cooccurrence=False):
+    """댓글을 수집하면서 토큰 빈도를 세어 (Counter, 댓글 수)를 반환합니다. 불용어는 빼지 않습니다.
+
+    dedup("once" 또는 "log")이면 복사·스팸 댓글을 묶어(utils.dedup) 묶음마다 가중치만큼만 셉니다.
+    걸러 낸 댓글은 토큰화하지 않으며, 댓글 수는 거르기 전의 수입니다.
+
+    on_progress가 있으면 묶음(API 한 페이지 또는 저장된 댓글 CHUNK_SIZE개)을 셀 때마다
+    on_progress(지금까지의 Counter, 지금까지의 댓글 수)를 호출합니다. 넘겨준 Counter는 계속 갱신되므로 고치지 마세요.
+
+    명사는 디스크의 명사 모델로 세며(없으면 규칙 기반), 분석을 마치면 새 댓글로 모델을 백그라운드에서 갱신합니다.
+
+    cooccurrence면("nouns_lower"만) 같은 토큰화로 댓글 × 단어 행렬(utils.cooccurrence)도 만들어
+    (Counter, 댓글 수, (행렬, 단어 Index) 또는 댓글이 없으면 None)을 반환합니다. 토큰화는 한 번만 합니다.
+
+    결과는 (video_id, 수집 워터마크, 수집 범위, 토큰화 설정, 명사 모델 버전, 중복 처리, 행렬 여부)로 캐시합니다. 저장소가 최신이고 그 뒤로
+    바뀐 댓글이 없으면 댓글 목록을 읽거나 해시하지 않고 캐시에서 바로 돌려줍니다.
+    반환한 Counter는 캐시와 공유하므로 고치지 말고 복사해서 쓰세요.
+
+    같은 키의 분석이 다른 세션에서 이미 돌고 있으면 수집·토큰화를 새로 시작하지 않고 그 결과를 기다려 함께 받습니다.
+    이때 on_progress는 호출되지 않습니다.
+    """
+    if cooccurrence and tokenizer != "nouns_lower":
+        raise ValueError("댓글 × 단어 행렬은 nouns_lower 토큰으로만 만듭니다.")
+    # 수집 중에 모델이 바뀌어도 한 결과 안에서는 같은 모델로 셉니다.
+    model = current_model() if tokenizer in MODEL_TOKENIZERS else None
+    key = (video_id, max_comments, include_replies, tokenizer, model and model.version, dedup, cooccurrence)
+
+    def collect():
+        if (cached := _token_counts.get(key, collection_watermark(video_id))) is not None:
+            return cached
+
+        # 행렬을 만들 때는 행렬에 넣은 토큰으로 빈도도 셉니다.
+        builder = TermMatrixBuilder(model) if cooccurrence else None
+        count = (lambda texts, _: builder.add(texts)) if cooccurrence else TOKENIZERS[tokenizer]
+        counts, comment_count = Counter(), 0
+        # 묶음은 수집 내내 이어지므로, 다른 페이지에 나뉘어 온 같은 댓글도 한 묶음이 됩니다.
+        duplicates = NearDuplicateIndex(dedup) if dedup else None
+        # 중간에 멈추면(on_progress에서 예외 등) 수집 스레드와 연결을 바로 정리합니다.
+        with closing(iter_comments(video_id, api_key, max_comments, include_replies=include_replies)) as batches:
+            for batch in batches:
+                comment_count += len(batch)
+                texts = batch["text"].tolist()
+                if duplicates is not None:
+                    texts = duplicates.collapse(texts)
+                tokens = count(texts, model)
+                with stage("counter.merge"):
+                    counts.update(tokens)
+                if on_progress is not None:
+                    on_progress(counts, comment_count)
+
+        result = (counts, comment_count)
+        if cooccurrence:
+            result += (builder.build() if builder.comments else None,)
+        if tokenizer in MODEL_TOKENIZERS:
+            update_in_background()
+        # 새로고침을 마치지 못했거나(워터마크 없음) 할당량이 바닥나 일부만 수집했다면 캐시하지 않습니다.
+        if (watermark := collection_watermark(video_id)) is not None and not quota_exhausted(api_key):
+            _token_counts.put(key, watermark, result)
+        return result
+
+    return _token_counts.single_flight(key, collect)
+
+
+# 🔗 댓글 × 단어 행렬 (함께 나온 단어)
+def comment_term_matrix(video_id, api_key, max_comments=100, include_replies=False, dedup=None):
+    """count_comment_tokens(tokenizer="nouns_lower", cooccurrence=True)의 (댓글 × 단어 CSR 행렬, 단어 Index)를 반환합니다.
+
+    빈도와 같은 결과를 함께 캐시하므로, 같은 설정으로 빈도를 이미 셌으면 수집·토큰화를 다시 하지 않습니다.
+    수집한 댓글이 없으면 None을 반환합니다.
+    """
+    return count_comment_tokens(
+        video_id, api_key, max_comments, include_replies, "nouns_lower", dedup=dedup, cooccurrence=True
+    )[2]
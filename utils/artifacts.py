@@ -0,0 +1,185 @@
+"""분석 결과 파일 만들기 / 불러오기 (Streamlit 없이 실행)
+
+영상마다 ARTIFACT_DIR/<video_id>/ 아래에 다음 파일을 씁니다.
+
+- nouns.parquet, words.parquet: 단어 빈도표 (단어, 빈도수)
+- hourly.parquet: 시간대별 댓글 수와 좋아요 합계
+- timeline.parquet: 누적 댓글 수 (작성 시각, 누적 댓글 수)
+- bursts.parquet: 댓글 급증 구간
+- wordcloud.png: 불용어를 뺀 상위 단어 워드클라우드 (한글 폰트가 있을 때)
+- summary.json: 제목, 댓글 수, 수집 범위, 만든 시각 (마지막에 쓰므로 이 파일이 있으면 나머지도 모두 있습니다)
+
+밤새 여러 영상을 미리 분석해 두려면:
+
+    python -m utils.artifacts URL_OR_ID ... --file ids.txt --max-comments -1 --workers 8
+
+일괄 분석 페이지는 같은 수집 범위의 결과 파일이 있으면 API를 호출하지 않고 바로 불러옵니다.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils.batch import MAX_WORKERS, analyze_video, parse_video_ids
+from utils.fonts import find_font
+from utils.store import load_comments
+from utils.timeseries import cumulative_counts, find_bursts
+
+# 📁 결과 파일 위치 (환경 변수로 변경 가능)
+ARTIFACT_DIR = os.environ.get(
+    "ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "artifacts")
+)
+# 워드클라우드에 넣을 단어 수
+WORDCLOUD_WORDS = 100
+
+logger = logging.getLogger(__name__)
+
+
+def _counts_table(counts):
+    return pd.DataFrame(counts.most_common(), columns=["단어", "빈도수"])
+
+
+def _write_summary(path, summary):
+    # 다 쓴 뒤 이름을 바꾸므로, 읽는 쪽은 반쯤 쓴 summary.json을 보지 않습니다.
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+# 💾 영상 하나 분석 + 파일 쓰기
+def export_video(video_id, api_key, max_comments=100, include_replies=False, directory=ARTIFACT_DIR, font_path=None):
+    """영상 하나를 수집·분석해 결과 파일을 directory/<video_id>/에 쓰고 그 경로를 반환합니다.
+
+    font_path가 없으면 워드클라우드는 만들지 않습니다.
+    """
+    result = analyze_video(video_id, api_key, max_comments, include_replies)
+    # analyze_video가 방금 만든 DataFrame을 캐시에서 그대로 받습니다.
+    comments = load_comments(video_id, api_key, max_comments, include_replies=include_replies)
+
+    path = os.path.join(directory, video_id)
+    os.makedirs(path, exist_ok=True)
+    _counts_table(result["nouns"]).to_parquet(os.path.join(path, "nouns.parquet"), index=False)
+    _counts_table(result["words"]).to_parquet(os.path.join(path, "words.parquet"), index=False)
+    result["hourly"].to_parquet(os.path.join(path, "hourly.parquet"), index=False)
+    cumulative_counts(comments["published_at"]).to_parquet(os.path.join(path, "timeline.parquet"), index=False)
+    find_bursts(comments["published_at"]).to_parquet(os.path.join(path, "bursts.parquet"), index=False)
+
+    if font_path and result["words"]:
+        # render는 워드클라우드를 그릴 때만 불러옵니다.
+        from utils.render import render_wordcloud
+
+        image = render_wordcloud(tuple(result["words"].most_common(WORDCLOUD_WORDS)), WORDCLOUD_WORDS, font_path)
+        with open(os.path.join(path, "wordcloud.png"), "wb") as f:
+            f.write(image)
+
+    _write_summary(os.path.join(path, "summary.json"), {
+        "video_id": video_id,
+        "title": result["title"],
+        "comment_count": result["comment_count"],
+        "max_comments": max_comments,
+        "include_replies": include_replies,
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    return path
+
+
+# 📦 여러 영상 동시 분석 + 파일 쓰기
+def export_videos(video_ids, api_key, max_comments=100, include_replies=False, directory=ARTIFACT_DIR,
+                  font_path=None, max_workers=MAX_WORKERS):
+    """영상들을 스레드 풀에서 동시에 수집·분석해 결과 파일을 씁니다.
+
+    댓글이 많은 영상의 토큰화는 utils.text의 프로세스 풀이 여러 코어로 나눠 처리합니다.
+    영상마다 {"video_id", "path"} 또는 실패하면 {"video_id", "error"}를 담은 목록을 반환합니다.
+    """
+    def run(video_id):
+        try:
+            path = export_video(video_id, api_key, max_comments, include_replies, directory, font_path)
+            logger.info("%s: %s", video_id, path)
+            return {"video_id": video_id, "path": path}
+        except Exception as e:
+            logger.warning("%s 실패: %s", video_id, e)
+            return {"video_id": video_id, "error": e}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, video_ids))
+
+
+# 📂 결과 파일 불러오기
+def load_artifacts(video_id, max_comments=100, include_replies=False, directory=ARTIFACT_DIR):
+    """같은 수집 범위로 만든 결과 파일이 있으면 analyze_video와 같은 모양의 dict로 불러옵니다.
+
+    timeline, bursts, wordcloud(PNG 경로 또는 None), generated_at도 함께 담습니다. 없으면 None을 반환합니다.
+    """
+    path = os.path.join(directory, video_id)
+    try:
+        with open(os.path.join(path, "summary.json"), encoding="utf-8") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if summary["max_comments"] != max_comments or summary["include_replies"] != include_replies:
+        return None
+
+    def counts(name):
+        table = pd.read_parquet(os.path.join(path, name))
+        return Counter(dict(zip(table["단어"], table["빈도수"].tolist())))
+
+    wordcloud = os.path.join(path, "wordcloud.png")
+    return {
+        "video_id": video_id,
+        "title": summary["title"],
+        "comment_count": summary["comment_count"],
+        "nouns": counts("nouns.parquet"),
+        "words": counts("words.parquet"),
+        "hourly": pd.read_parquet(os.path.join(path, "hourly.parquet")),
+        "timeline": pd.read_parquet(os.path.join(path, "timeline.parquet")),
+        "bursts": pd.read_parquet(os.path.join(path, "bursts.parquet")),
+        "wordcloud": wordcloud if os.path.exists(wordcloud) else None,
+        "generated_at": summary["generated_at"],
+    }
+
+
+def main():
+    from utils.youtube import get_api_key
+
+    parser = argparse.ArgumentParser(description="YouTube 댓글 분석 결과 파일 만들기 (Streamlit 없이)")
+    parser.add_argument("videos", nargs="*", help="영상 URL 또는 video ID")
+    parser.add_argument("--file", help="URL 또는 video ID 목록 파일 (줄바꿈·쉼표·공백 구분)")
+    parser.add_argument("--out", default=ARTIFACT_DIR, help=f"결과 디렉터리 (기본값: {ARTIFACT_DIR})")
+    parser.add_argument("--max-comments", type=int, default=100, help="영상당 댓글 수 (-1이면 모두)")
+    parser.add_argument("--replies", action="store_true", help="답글도 함께 수집")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="동시에 처리할 영상 수")
+    parser.add_argument("--no-wordcloud", action="store_true", help="워드클라우드 PNG를 만들지 않습니다.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    # Streamlit 런타임 없이 캐시를 쓸 때 나오는 경고는 숨깁니다.
+    logging.getLogger("streamlit.runtime.caching.cache_data_api").setLevel(logging.ERROR)
+
+    source = " ".join(args.videos)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            source += "\n" + f.read()
+    video_ids = parse_video_ids(source)
+    if not video_ids:
+        parser.error("유효한 YouTube URL 또는 video ID가 없습니다.")
+
+    font_path = None if args.no_wordcloud else find_font()
+    if font_path is None and not args.no_wordcloud:
+        logger.warning("한글 폰트를 찾지 못해 워드클라우드는 건너뜁니다. (python -m utils.fonts --download)")
+
+    start = time.perf_counter()
+    results = export_videos(video_ids, get_api_key(), args.max_comments, args.replies, args.out, font_path, args.workers)
+    failed = [r for r in results if "error" in r]
+    print(f"영상 {len(results) - len(failed)}개 완료, {len(failed)}개 실패 ({time.perf_counter() - start:.1f}초) → {args.out}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils.cache import AnalysisCache
+from utils.nouns import count_model_nouns, current_model, update_in_background
+from utils.scheduler import quota_exhausted
+from utils.store import collection_watermark, load_comments, load_video_info
+from utils.text import count_meaningful_words
+from utils.youtube import extract_video_id
+
+# 동시에 수집할 최대 영상 수 (API 동시 요청 수 제한)
+MAX_WORKERS = 4
+
+VIDEO_ID_PATTERN = re.compile(r"^[\w-]{11}$")
+
+_analyses = AnalysisCache("video_analysis")
+
+# 📝 URL / video ID 목록 해석
+def parse_video_ids(text):
+    """줄바꿈·쉼표·공백으로 구분된 URL 또는 video ID 목록에서 중복 없이 video ID를 추출합니다."""
+    video_ids = []
+    for token in re.split(r"[\s,]+", text):
+        video_id = extract_video_id(token) or (token if VIDEO_ID_PATTERN.match(token) else None)
+        if video_id and video_id not in video_ids:
+            video_ids.append(video_id)
+    return video_ids
+
+# ⏰ 시간대별 요약
+def hourly_summary(comments):
+    """시간대(시)별 댓글 수와 좋아요 합계를 반환합니다."""
+    hours = comments["published_at"].dt.hour
+    return comments.groupby(hours).agg(
+        **{"댓글 수": ("comment_id", "size"), "좋아요 수": ("like_count", "sum")}
+    ).rename_axis("시간대 (시)").reset_index()
+
+# 🔬 영상 하나 수집 + 분석
+def analyze_video(video_id, api_key, max_comments=100, include_replies=False):
+    """댓글을 수집하고 명사 빈도, 불용어 제거 빈도, 시간대별 요약을 계산합니다.
+
+    명사는 디스크의 명사 모델로 셉니다. (utils.nouns, 없으면 규칙 기반)
+    결과는 (video_id, 수집 워터마크, 수집 범위, 명사 모델 버전)으로 캐시하므로, 저장소가 바뀌지 않았으면 다시 계산하지 않습니다.
+    같은 영상·범위의 분석이 이미 돌고 있으면 새로 시작하지 않고 그 결과를 함께 받습니다.
+    """
+    model = current_model()
+    key = (video_id, max_comments, include_replies, model and model.version)
+
+    def analyze():
+        if (cached := _analyses.get(key, collection_watermark(video_id))) is not None:
+            return cached
+
+        info = load_video_info(video_id, api_key)
+        comments = load_comments(video_id, api_key, max_comments, include_replies=include_replies)
+        texts = comments["text"].tolist()
+        result = {
+            "video_id": video_id,
+            "title": info["title"] if info else video_id,
+            "comment_count": len(comments),
+            "nouns": count_model_nouns(texts, model),
+            "words": count_meaningful_words(texts),
+            "hourly": hourly_summary(comments),
+        }
+        update_in_background()
+        if (watermark := collection_watermark(video_id)) is not None and not quota_exhausted(api_key):
+            _analyses.put(key, watermark, result)
+        return result
+
+    return _analyses.single_flight(key, analyze)
+
+# 📦 여러 영상 동시 수집 + 분석
+def analyze_videos(video_ids, api_key, max_comments=100, include_replies=False, max_workers=MAX_WORKERS):
+    """영상들을 스레드 풀에서 동시에 수집·분석합니다.
+
+    전체 소요 시간은 영상 수의 합이 아니라 가장 느린 영상에 맞춰집니다.
+    실패한 영상은 결과 대신 {"video_id", "error"}를 담습니다.
+    """
+    def run(video_id):
+        try:
+            return analyze_video(video_id, api_key, max_comments, include_replies)
+        except Exception as e:
+            return {"video_id": video_id, "error": e}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, video_ids))
+
+# 🔗 통합 결과
+def merge_results(results):
+    """영상별 결과를 하나로 합친 빈도와 시간대별 요약(영상 구분 포함)을 반환합니다."""
+    results = [r for r in results if "error" not in r]
+    nouns, words = Counter(), Counter()
+    for r in results:
+        nouns.update(r["nouns"])
+        words.update(r["words"])
+    hourly = [r["hourly"].assign(영상=r["title"]) for r in results]
+    return {
+        "comment_count": sum(r["comment_count"] for r in results),
+        "nouns": nouns,
+        "words": words,
+        "hourly": pd.concat(hourly, ignore_index=True) if hourly else pd.DataFrame(),
+    }
@@ -0,0 +1,192 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# 캐시 하나에 보관할 최대 항목 수와 항목의 유효 시간(초)
+MAX_ENTRIES = 64
+TTL = 3600
+# 프로세스의 모든 캐시가 함께 쓰는 메모리 상한(바이트, 환경 변수로 변경 가능).
+# 넘으면 어느 캐시의 항목이든 가장 오래 쓰지 않은 것부터 지웁니다.
+CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+_caches = []
+# 모든 캐시가 한 잠금을 씁니다. (캐시를 넘나들며 지울 때 잠금 순서를 따질 필요가 없도록)
+_lock = threading.Lock()
+# (캐시, 키) → 크기(바이트), 가장 오래 쓰지 않은 항목이 앞
+_lru = OrderedDict()
+_bytes = 0
+
+
+def estimate_bytes(value, _depth=0):
+    """캐시에 넣을 값의 대략적인 메모리 크기(바이트)를 반환합니다.
+
+    DataFrame·Series·Index는 memory_usage(deep=True), NumPy·Arrow 배열은 nbytes, scipy 희소 행렬은 세 배열의 합으로 재고,
+    tuple·list·dict는 원소를, 그 밖의 객체(예: WordCloud 배치)는 속성을 따라 들어가 더합니다.
+    """
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if hasattr(value, "indptr"):
+        return int(value.data.nbytes + value.indices.nbytes + value.indptr.nbytes)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if _depth < 4:
+        if isinstance(value, dict):
+            size += sum(estimate_bytes(k, _depth + 1) + estimate_bytes(v, _depth + 1) for k, v in value.items())
+        elif isinstance(value, (tuple, list, set, frozenset)):
+            size += sum(estimate_bytes(item, _depth + 1) for item in value)
+        elif hasattr(value, "__dict__"):
+            size += estimate_bytes(vars(value), _depth + 1)
+    return size
+
+
+class _Flight:
+    """실행 중인 계산 하나. 먼저 온 호출이 계산하고, 같은 키로 온 호출은 done을 기다립니다."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.interrupted = False
+
+
+class AnalysisCache:
+    """(키, 워터마크)로 분석 결과를 보관하는 LRU 캐시입니다. 여러 스레드와 Streamlit 세션이 함께 써도 안전합니다.
+
+    키마다 가장 최근 워터마크의 결과 하나만 보관하므로, 저장소가 바뀌면 예전 결과는 새 결과로 바로 교체됩니다.
+    max_entries개를 넘으면 가장 오래 쓰지 않은 항목부터, ttl초가 지나면 조회할 때 지웁니다.
+    모든 캐시의 항목 크기 합이 CACHE_MAX_BYTES를 넘어도 프로세스 전체에서 가장 오래 쓰지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, name, max_entries=MAX_ENTRIES, ttl=TTL):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.flights = {}
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.evicted_bytes = self.coalesced = 0
+        _caches.append(self)
+
+    def _remove(self, key):
+        # _lock 안에서만 부릅니다.
+        global _bytes
+        entry = self.entries.pop(key)
+        del _lru[(self, key)]
+        self.bytes -= entry[3]
+        _bytes -= entry[3]
+        return entry
+
+    def _evict(self, key):
+        entry = self._remove(key)
+        self.evictions += 1
+        self.evicted_bytes += entry[3]
+
+    def get(self, key, watermark):
+        """워터마크가 같고 만료되지 않은 결과를 반환합니다. 없거나 워터마크가 None이면 None을 반환합니다."""
+        with _lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None or watermark is None or entry[0] != watermark:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            _lru.move_to_end((self, key))
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, watermark, value):
+        global _bytes
+        size = estimate_bytes(value)
+        with _lock:
+            if key in self.entries:
+                self._remove(key)
+            # 혼자서 상한을 넘는 값은 다른 항목을 모두 지우게 되므로 보관하지 않습니다.
+            if size > CACHE_MAX_BYTES:
+                self.evictions += 1
+                self.evicted_bytes += size
+                return
+            self.entries[key] = (watermark, time.monotonic() + self.ttl, value, size)
+            _lru[(self, key)] = size
+            self.bytes += size
+            _bytes += size
+            while len(self.entries) > self.max_entries:
+                self._evict(next(iter(self.entries)))
+            while _bytes > CACHE_MAX_BYTES:
+                cache, oldest = next(iter(_lru))
+                cache._evict(oldest)
+
+    def single_flight(self, key, compute):
+        """같은 key로 동시에 들어온 호출을 한 번의 compute()로 합쳐, 모두 같은 결과를 받게 합니다.
+
+        먼저 온 호출이 compute()를 실행하고, 그동안 같은 key로 온 호출은 끝나기를 기다렸다가 결과(또는 예외)를 함께 받습니다.
+        먼저 온 호출이 세션 중지처럼 Exception이 아닌 예외로 끊기면, 기다리던 호출 중 하나가 이어서 계산합니다.
+        결과는 캐시에 넣지 않으므로, 보관하려면 compute() 안에서 put을 부르세요.
+        """
+        while True:
+            with _lock:
+                flight = self.flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self.flights[key] = _Flight()
+                else:
+                    self.coalesced += 1
+            if leader:
+                break
+            flight.done.wait()
+            if flight.interrupted:
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        except BaseException:
+            flight.interrupted = True
+            raise
+        finally:
+            with _lock:
+                del self.flights[key]
+            flight.done.set()
+
+    def clear(self):
+        with _lock:
+            for key in list(self.entries):
+                self._remove(key)
+
+    def stats(self):
+        with _lock:
+            return {
+                "name": self.name,
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+                "expirations": self.expirations,
+            }
+
+
+def cache_stats():
+    """프로세스의 모든 분석 캐시의 항목 수·크기와 적중/실패/합친 호출/제거 횟수를 반환합니다."""
+    return [cache.stats() for cache in _caches]
+
+
+def cache_bytes():
+    """모든 분석 캐시가 쓰는 메모리(바이트)와 상한 CACHE_MAX_BYTES를 반환합니다."""
+    with _lock:
+        return _bytes, CACHE_MAX_BYTES
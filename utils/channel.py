@@ -0,0 +1,107 @@
+"""채널 전체 댓글 수집 (이어 받기 가능)
+
+채널의 업로드 재생목록으로 영상 목록을 받고, 영상마다 댓글을 처음부터 끝까지 저장소에 받아 둡니다.
+재생목록과 영상별 댓글 모두 페이지마다 pageToken과 진행 상황을 저장하므로, 프로세스가 죽거나
+할당량이 바닥나 멈춘 수집은 다시 실행하면 멈춘 페이지부터 이어 받습니다.
+
+    python -m utils.channel CHANNEL_ID [--replies] [--workers 4] [--refresh] [--export]
+"""
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.batch import MAX_WORKERS
+from utils.scheduler import QuotaExceeded
+from utils.store import channel_progress, sync_channel, sync_comments
+
+logger = logging.getLogger(__name__)
+
+
+# 🕸️ 채널 수집
+def crawl_channel(channel_id, api_key, include_replies=False, max_workers=MAX_WORKERS, refresh=False):
+    """채널 영상 목록을 동기화한 뒤, 아직 다 받지 못한 영상의 댓글을 스레드 풀에서 동시에 받습니다.
+
+    refresh면 이미 다 받은 영상도 새 댓글을 받습니다 (영상마다 API 호출 1회 이상).
+    할당량이 바닥나면 남은 영상은 건너뛰고 멈추며, 다음 실행에서 이어 받습니다.
+    {"videos", "crawled", "complete", "comments", "failed", "quota_exhausted"} 요약을 반환합니다.
+    """
+    exhausted = threading.Event()
+    try:
+        sync_channel(channel_id, api_key)
+    except QuotaExceeded:
+        # 받은 페이지까지는 저장되어 있으므로 아는 영상부터 수집합니다.
+        logger.warning("할당량 소진으로 %s 영상 목록을 끝까지 받지 못했습니다.", channel_id)
+        exhausted.set()
+
+    progress = channel_progress(channel_id)
+    pending = progress["video_id"].tolist() if refresh else progress.loc[~progress["complete"], "video_id"].tolist()
+    logger.info("%s: 영상 %d개 중 %d개 수집", channel_id, len(progress), len(pending))
+
+    def run(video_id):
+        if exhausted.is_set():
+            return None
+        try:
+            count = sync_comments(video_id, api_key, include_replies)
+            logger.info("%s: 댓글 %d개", video_id, count)
+            return count
+        except QuotaExceeded:
+            logger.warning("할당량 소진으로 %s에서 멈춥니다. 다음 실행에서 이어 받습니다.", video_id)
+            exhausted.set()
+            return None
+        except Exception as e:
+            logger.warning("%s 수집 실패: %s", video_id, e)
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run, pending))
+
+    progress = channel_progress(channel_id)
+    return {
+        "videos": len(progress),
+        "crawled": sum(isinstance(r, int) for r in results),
+        "complete": int(progress["complete"].sum()),
+        "comments": int(progress["comment_count"].sum()),
+        "failed": sum(isinstance(r, Exception) for r in results),
+        "quota_exhausted": exhausted.is_set(),
+    }
+
+
+def main():
+    from utils.youtube import get_api_key
+
+    parser = argparse.ArgumentParser(description="YouTube 채널 전체 댓글 수집 (중단해도 이어 받기)")
+    parser.add_argument("channel_id", help="채널 ID (UC로 시작)")
+    parser.add_argument("--replies", action="store_true", help="답글도 함께 수집")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="동시에 수집할 영상 수")
+    parser.add_argument("--refresh", action="store_true", help="이미 다 받은 영상도 새 댓글을 받습니다.")
+    parser.add_argument("--export", action="store_true", help="다 받은 영상의 분석 결과 파일도 만듭니다. (utils.artifacts)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    api_key = get_api_key()
+    start = time.perf_counter()
+    summary = crawl_channel(args.channel_id, api_key, args.replies, args.workers, args.refresh)
+    print(
+        f"영상 {summary['videos']}개 중 {summary['complete']}개 완료, 저장된 댓글 {summary['comments']:,}개 "
+        f"(이번 실행 {summary['crawled']}개 수집, {summary['failed']}개 실패, {time.perf_counter() - start:.1f}초)"
+    )
+    if summary["quota_exhausted"]:
+        print("오늘 API 할당량을 모두 사용했습니다. 할당량이 초기화된 뒤 다시 실행하면 이어 받습니다.")
+
+    if args.export:
+        from utils.artifacts import export_videos
+        from utils.fonts import find_font
+
+        logging.getLogger("streamlit.runtime.caching.cache_data_api").setLevel(logging.ERROR)
+        progress = channel_progress(args.channel_id)
+        export_videos(
+            progress.loc[progress["complete"], "video_id"].tolist(), api_key,
+            max_comments=-1, include_replies=args.replies, font_path=find_font(), max_workers=args.workers
+        )
+
+
+if __name__ == "__main__":
+    main()
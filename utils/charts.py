@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from utils.timeseries import to_epoch_seconds
+
+# 산점도에 그릴 최대 점 수와 그중 반드시 넣을 좋아요 상위 댓글 수
+SCATTER_POINTS = 2000
+TOP_LIKED = 200
+# 툴팁에 넣을 댓글 내용 최대 길이
+TOOLTIP_LENGTH = 80
+# 박스 플롯에서 시간대마다 그릴 최대 이상치 수 (큰 값부터)
+OUTLIER_LIMIT = 20
+# 밀도 모드의 (시간, 좋아요 수) 구간 수
+DENSITY_BINS = (60, 20)
+
+
+# 📦 박스 플롯 통계 (서버에서 계산)
+def box_stats(groups, values, extent=1.5):
+    """그룹마다 Vega-Lite boxplot과 같은 통계(사분위수, extent×IQR 수염)를 NumPy로 계산합니다.
+
+    (통계 DataFrame, 이상치 DataFrame)을 반환합니다. 이상치는 그룹마다 값이 큰 OUTLIER_LIMIT개까지만 담으므로
+    두 DataFrame 모두 댓글 수와 관계없이 크기가 일정합니다.
+    """
+    groups, values = np.asarray(groups), np.asarray(values)
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    keys, starts = np.unique(groups, return_index=True)
+
+    stats, outliers = [], []
+    for key, group in zip(keys, np.split(values, starts[1:])):
+        q1, median, q3 = np.quantile(group, [0.25, 0.5, 0.75])
+        low, high = q1 - extent * (q3 - q1), q3 + extent * (q3 - q1)
+        inside = group[(group >= low) & (group <= high)]
+        stats.append((key, inside[0], q1, median, q3, inside[-1], len(group)))
+        # 정렬되어 있으므로 뒤집으면 위쪽 이상치가 큰 값부터, 그 뒤에 아래쪽 이상치가 옵니다.
+        beyond = group[(group < low) | (group > high)][::-1]
+        outliers += [(key, value) for value in beyond[:OUTLIER_LIMIT]]
+
+    return (
+        pd.DataFrame(stats, columns=["그룹", "하단", "Q1", "중앙값", "Q3", "상단", "댓글 수"]),
+        pd.DataFrame(outliers, columns=["그룹", "값"]),
+    )
+
+
+# 🎯 산점도 표본
+def sample_scatter(df, time_column, value_column, max_points=SCATTER_POINTS, top=TOP_LIKED):
+    """값이 가장 큰 top개는 항상 넣고, 나머지는 시간순으로 고르게 뽑아 max_points개 이하로 줄입니다.
+
+    시간순으로 같은 간격마다 하나씩 고르므로 시간대별 댓글 밀도가 표본에도 그대로 남습니다.
+    """
+    if len(df) <= max_points:
+        return df
+    top_rows = df.nlargest(top, value_column)
+    rest = df.drop(top_rows.index).sort_values(time_column)
+    picks = np.linspace(0, len(rest) - 1, max_points - len(top_rows)).astype(int)
+    return pd.concat([top_rows, rest.iloc[picks]]).sort_values(time_column)
+
+
+def shorten(texts, length=TOOLTIP_LENGTH):
+    """툴팁용으로 댓글 내용을 length자까지 자릅니다."""
+    return texts.where(texts.str.len() <= length, texts.str.slice(0, length) + "…")
+
+
+# 🟦 2차원 밀도
+def density_grid(times, values, bins=DENSITY_BINS):
+    """(작성 시각, 좋아요 수) 평면을 구간으로 나눠 댓글 수를 셉니다. 좋아요 수는 log1p 눈금으로 나눕니다.
+
+    댓글이 있는 칸만 (시작, 끝, 하한, 상한, 댓글 수) 행으로 반환하므로 최대 bins[0]×bins[1]행입니다.
+    """
+    epochs = to_epoch_seconds(times)
+    counts, time_edges, value_edges = np.histogram2d(epochs, np.log1p(np.asarray(values)), bins=bins)
+    i, j = np.nonzero(counts)
+    return pd.DataFrame({
+        "시작": pd.to_datetime(time_edges[i].astype("int64"), unit="s", utc=True),
+        "끝": pd.to_datetime(time_edges[i + 1].astype("int64"), unit="s", utc=True),
+        "하한": np.expm1(value_edges[j]),
+        "상한": np.expm1(value_edges[j + 1]),
+        "댓글 수": counts[i, j].astype(int),
+    })
@@ -0,0 +1,122 @@
+"""함께 나온 단어 (희소 행렬 공동 출현)
+
+댓글마다 나온 단어를 댓글 × 단어 희소 행렬 X(있으면 1)로 만들고, XᵀX 한 번으로 모든 단어 쌍이
+함께 나온 댓글 수를 구합니다. 댓글마다 단어 쌍을 Python으로 도는 대신 scipy.sparse 곱셈을 쓰므로,
+쌍 계산은 상위 단어 수(MAX_TERMS)의 제곱 이하 메모리로 묶이고 댓글 수에 거의 비례하는 시간에 끝납니다.
+
+토큰은 빈도 분석과 같습니다. 명사 모델(utils.nouns)이 있으면 명사와 영어 단어, 없으면 count_meaningful_words와
+같은 규칙 기반 토큰을 소문자로 씁니다. 행렬은 빈도를 세는 수집 루프에서 함께 만들고
+(utils.analysis.count_comment_tokens(cooccurrence=True), 영상별 캐시), 불용어와 표시 개수는 행렬에 바로 적용합니다.
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utils.metrics import incr, stage
+from utils.text import EOJEOL_PATTERN, TOKEN_PATTERN
+
+# 행렬에 남길 단어의 최소 출현 댓글 수 (한 댓글에만 나온 단어는 쌍을 만들지 못합니다)
+MIN_DOCUMENT_COUNT = 2
+# 쌍을 계산할 상위 단어 수 (출현 댓글 수 기준, XᵀX 크기의 상한)
+MAX_TERMS = 2000
+# 쌍으로 보려면 최소 이만큼의 댓글에 함께 나와야 합니다. (적게 나온 쌍은 PMI가 부풀려집니다)
+MIN_PAIR_COUNT = 3
+# 반환할 쌍 수
+TOP_PAIRS = 50
+
+
+# 🧾 댓글 × 단어 행렬
+class TermMatrixBuilder:
+    """댓글 묶음을 받아 (댓글 번호, 단어 번호) 배열을 쌓고, 묶음의 토큰 빈도도 함께 돌려줍니다.
+
+    토큰은 count_comment_tokens의 "nouns_lower"와 같으므로, 빈도를 세는 수집 루프에서 토큰화를 한 번만 합니다.
+    단어 번호는 처음 본 순서입니다.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.vocabulary = {}
+        self.terms = []
+        self.rows = []
+        self.columns = []
+        self.comments = 0
+
+    def _term_id(self, token):
+        """토큰의 단어 번호를 반환합니다. 세지 않는 토큰(한 글자, 명사로 시작하지 않는 어절)은 -1."""
+        if self.model is not None and "가" <= token[0] <= "힣":
+            token = self.model.noun_of(token)
+        if not token or len(token) < 2:
+            return -1
+        if (term_id := self.vocabulary.get(token)) is None:
+            term_id = self.vocabulary[token] = len(self.terms)
+            self.terms.append(token)
+        return term_id
+
+    def add(self, texts):
+        """댓글들을 행으로 더하고, 이 묶음의 토큰 빈도를 Counter로 반환합니다."""
+        with stage("cooccurrence.tokenize", texts=len(texts)) as info:
+            pattern = TOKEN_PATTERN if self.model is None else EOJEOL_PATTERN
+            tokens = [pattern.findall(text.lower()) for text in texts]
+            lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+            # 서로 다른 토큰마다 한 번씩만 단어로 바꾸고 번호를 붙입니다.
+            codes, unique = pd.factorize(pd.Series([t for ts in tokens for t in ts], dtype=object))
+            ids = np.fromiter(map(self._term_id, unique), dtype=np.int32, count=len(unique))
+            columns = ids[codes] if len(codes) else np.empty(0, dtype=np.int32)
+            rows = np.repeat(np.arange(self.comments, self.comments + len(texts), dtype=np.int32), lengths)
+            valid = columns >= 0
+            self.rows.append(rows[valid])
+            self.columns.append(columns[valid])
+
+            frequencies = np.bincount(columns[valid], minlength=len(self.terms))
+            seen = np.flatnonzero(frequencies)
+            counts = Counter(dict(zip([self.terms[i] for i in seen], frequencies[seen].tolist())))
+            info["tokens"] = int(valid.sum())
+        self.comments += len(texts)
+        incr("texts_tokenized", len(texts))
+        incr("tokens", info["tokens"])
+        return counts
+
+    def build(self, min_count=MIN_DOCUMENT_COUNT):
+        """(댓글 × 단어 CSR 행렬, 단어 Index)를 반환합니다. 한 댓글에 여러 번 나온 단어도 1입니다."""
+        with stage("cooccurrence.matrix", comments=self.comments, terms=len(self.terms)):
+            rows = np.concatenate(self.rows) if self.rows else np.empty(0, dtype=np.int32)
+            columns = np.concatenate(self.columns) if self.columns else np.empty(0, dtype=np.int32)
+            matrix = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int32), (rows, columns)), shape=(self.comments, len(self.terms))
+            )
+            matrix.sum_duplicates()
+            matrix.data[:] = 1
+            keep = np.flatnonzero(np.asarray(matrix.sum(axis=0)).ravel() >= min_count)
+        return matrix[:, keep], pd.Index(self.terms)[keep]
+
+
+# 🔗 함께 나온 단어 쌍
+def top_pairs(cooccurrence, stopwords=(), top=TOP_PAIRS, sort_by="함께 나온 댓글 수",
+              max_terms=MAX_TERMS, min_count=MIN_PAIR_COUNT):
+    """불용어를 뺀 상위 max_terms개 단어에서 함께 나온 단어 쌍을 top개 반환합니다.
+
+    [단어 1, 단어 2, 함께 나온 댓글 수, PMI] DataFrame을 sort_by("함께 나온 댓글 수" 또는 "PMI")가 큰 순으로 반환합니다.
+    PMI는 log₂(P(두 단어) / (P(단어 1)·P(단어 2)))로, 따로 나올 때보다 함께 나오는 정도입니다.
+    """
+    columns = ["단어 1", "단어 2", "함께 나온 댓글 수", "PMI"]
+    matrix, terms = cooccurrence
+    with stage("cooccurrence.pairs", terms=len(terms)) as info:
+        documents = np.asarray(matrix.sum(axis=0)).ravel()
+        candidates = np.flatnonzero(~terms.isin(list(stopwords)))
+        chosen = candidates[np.argsort(-documents[candidates], kind="stable")[:max_terms]]
+        sub = matrix[:, chosen].tocsc()
+        # 대각선은 단어마다 출현 댓글 수이므로 위 삼각형(k=1)만 씁니다.
+        pairs = sparse.triu(sub.T @ sub, k=1).tocoo()
+        keep = pairs.data >= min_count
+        first, second, together = chosen[pairs.row[keep]], chosen[pairs.col[keep]], pairs.data[keep]
+        info["pairs"] = len(together)
+    if not len(together):
+        return pd.DataFrame(columns=columns)
+
+    pmi = np.log2(together.astype(float) * matrix.shape[0] / (documents[first].astype(float) * documents[second]))
+    result = pd.DataFrame({
+        "단어 1": terms[first], "단어 2": terms[second], "함께 나온 댓글 수": together, "PMI": pmi
+    })
+    return result.sort_values([sort_by, "함께 나온 댓글 수"], ascending=False, kind="stable").head(top).reset_index(drop=True)
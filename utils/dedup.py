@@ -0,0 +1,205 @@
+"""복사·스팸 댓글 묶기 (MinHash + LSH)
+
+거의 같은 댓글("구독하고 갑니다 맞구독 해주세요", "1등 ㅋㅋㅋㅋ")을 한 묶음으로 보고, 토큰을 세기 전에 걸러 냅니다.
+
+- 댓글을 정규화(소문자, 한글·영문·숫자만, 같은 글자 3번 이상 반복은 2번으로)한 뒤 글자 3-gram 집합의 MinHash 서명을 NumPy로 계산합니다.
+- 서명을 BANDS개 띠로 나눠, 띠 하나라도 같은 댓글끼리만 후보로 비교하므로(LSH) 댓글 수에 거의 비례하는 시간에 묶습니다.
+- 후보는 서명 일치율(자카드 유사도 추정)이 SIMILARITY 이상일 때만 같은 묶음으로 봅니다.
+- 3-gram이 없는 댓글(이모지만, 일본어·러시아어 등, 2글자 이하)은 글자까지 같은 댓글끼리만 묶습니다.
+
+NearDuplicateIndex는 묶음을 계속 기억하므로, 댓글이 묶음(API 페이지)으로 도착해도 이어서 묶을 수 있습니다.
+"""
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import incr, stage
+
+# MinHash 서명 = BANDS개 띠 × 띠마다 ROWS개 값 (유사도 약 0.6부터 후보가 됩니다)
+BANDS = 8
+ROWS = 4
+# 후보 중 서명 일치율이 이 값 이상이면 같은 묶음으로 봅니다.
+SIMILARITY = 0.8
+# 서명을 한 번에 계산할 댓글 수 (메모리 상한)
+SIGNATURE_CHUNK = 20000
+
+# 묶음 가중치: 묶음 크기 배열 → 몇 번으로 셀지 (정수라 빈도표가 그대로 정수입니다)
+WEIGHTS = {
+    "once": lambda sizes: np.ones_like(sizes),
+    "log": lambda sizes: 1 + np.log2(sizes).astype(np.int64),
+}
+
+# 페이지의 선택지 이름 → count_comment_tokens의 dedup 값
+DEDUP_OPTIONS = {"묶음마다 한 번": "once", "묶음 크기의 로그만큼": "log", "모두 세기": None}
+
+# 정규화 후 남길 글자 (코드 포인트 범위): 숫자, 영문 소문자, 한글 음절, 한글 자모
+_KEEP_RANGES = [(0x30, 0x39), (0x61, 0x7A), (0xAC00, 0xD7A3), (0x3131, 0x3163)]
+_SPACE = 0x20
+# 3-gram(63비트)을 32비트로 줄이는 곱셈 상수와, 해시 함수마다 다른 (홀수 a, b): (a·x + b) mod 2³² 뒤 xorshift
+_FOLD = np.uint64(0x9E3779B97F4A7C15)
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(0, 2 ** 31, BANDS * ROWS, dtype=np.uint32) * np.uint32(2) + np.uint32(1)
+_B = _rng.integers(0, 2 ** 32, BANDS * ROWS, dtype=np.uint32)
+_EMPTY = np.iinfo(np.uint32).max
+
+
+# ✍️ MinHash 서명
+def _signatures(texts):
+    """댓글마다 BANDS×ROWS개 MinHash 값을 담은 (댓글 수, BANDS×ROWS) uint32 배열을 반환합니다.
+
+    댓글을 \\x00으로 이어 붙여 소문자·UTF-32 변환을 한 번씩만 하고, 3-gram은 코드 포인트 3개를 21비트씩 붙인 정수로 씁니다.
+    """
+    joined = "\x00 " + " \x00 ".join(texts).lower() + " "
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+
+    # 정규식 대신 코드 포인트 배열에서 정규화합니다: 공백은 스페이스로, 남길 글자가 아니면 버리고,
+    # 같은 글자가 3번 이상 이어지면 2번까지만, 스페이스는 1번까지만 남깁니다.
+    codes = np.where((codes >= 0x09) & (codes <= 0x0D), _SPACE, codes)
+    keep = (codes == 0) | (codes == _SPACE)
+    for low, high in _KEEP_RANGES:
+        keep |= (codes >= low) & (codes <= high)
+    codes = codes[keep]
+    repeat = np.zeros(len(codes), dtype=bool)
+    repeat[1:] = (codes[1:] == codes[:-1]) & (codes[1:] == _SPACE)
+    repeat[2:] |= (codes[2:] == codes[1:-1]) & (codes[1:-1] == codes[:-2]) & (codes[2:] != 0)
+    codes = codes[~repeat].astype(np.uint64)
+
+    # 구분자(\x00)를 지날 때마다 댓글 번호가 하나씩 늘어납니다. 구분자를 걸치는 3-gram은 버립니다.
+    doc = np.cumsum(codes == 0) - 1
+    valid = (codes[:-2] != 0) & (doc[:-2] == doc[2:])
+    shingles = (codes[:-2] << np.uint64(42) | codes[1:-1] << np.uint64(21) | codes[2:])[valid]
+    shingles = ((shingles * _FOLD) >> np.uint64(32)).astype(np.uint32)
+    doc = doc[:-2][valid]
+
+    signatures = np.full((len(texts), BANDS * ROWS), _EMPTY, dtype=np.uint32)
+    docs = np.empty(0, dtype=np.int64)
+    if len(shingles):
+        # doc은 정렬되어 있으므로 값이 바뀌는 자리가 댓글마다 첫 3-gram입니다.
+        starts = np.flatnonzero(np.diff(doc, prepend=-1))
+        docs = doc[starts]
+        for k in range(BANDS * ROWS):
+            hashed = _A[k] * shingles + _B[k]
+            hashed ^= hashed >> np.uint32(15)
+            signatures[docs, k] = np.minimum.reduceat(hashed, starts)
+
+    # 3-gram이 없는 댓글(이모지·구두점뿐이거나, 남길 글자가 없는 언어이거나, 2글자 이하)은 닮았다고 볼 근거가 없으므로
+    # 원문 해시로 서명을 채워 글자까지 같은 댓글끼리만 묶습니다. (모두 같은 빈 서명이면 한 묶음이 됩니다)
+    empty = np.ones(len(texts), dtype=bool)
+    empty[docs] = False
+    if empty.any():
+        hashes = np.array([zlib.crc32(texts[i].encode("utf-8")) for i in np.flatnonzero(empty)], dtype=np.uint32)
+        hashed = _A * hashes[:, None] + _B
+        signatures[empty] = hashed ^ (hashed >> np.uint32(15))
+    return signatures
+
+
+def _band_keys(signatures):
+    """띠마다 ROWS개 값을 하나의 uint64 키로 합친 (댓글 수, BANDS) 배열을 반환합니다."""
+    bands = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    keys = np.zeros(bands.shape[:2], dtype=np.uint64)
+    for row in range(ROWS):
+        keys = keys * np.uint64(0x100000001B3) ^ bands[:, :, row]
+    return keys
+
+
+# 🧹 근사 중복 묶기
+class NearDuplicateIndex:
+    """지금까지 본 댓글의 묶음을 기억하며, 새 댓글을 기존 묶음이나 새 묶음에 넣습니다.
+
+    묶음마다 대표 댓글(처음 본 댓글)의 서명과 띠 키만 보관하므로 메모리는 묶음 수에 비례합니다.
+    """
+
+    def __init__(self, weight="once"):
+        self.weight = WEIGHTS[weight]
+        self._buckets = [{} for _ in range(BANDS)]
+        self._representatives = np.empty((0, BANDS * ROWS), dtype=np.uint32)
+        self._sizes = np.empty(0, dtype=np.int64)
+        self.clusters = 0
+        self.comments = 0
+
+    @property
+    def sizes(self):
+        """묶음마다 지금까지 들어온 댓글 수"""
+        return self._sizes[:self.clusters]
+
+    def _reserve(self, capacity):
+        # 묶음이 늘 때마다 배열을 새로 만들지 않도록 두 배씩 늘립니다.
+        if capacity > len(self._sizes):
+            capacity = max(capacity, 2 * len(self._sizes), 1024)
+            representatives = np.empty((capacity, BANDS * ROWS), dtype=np.uint32)
+            representatives[:self.clusters] = self._representatives[:self.clusters]
+            sizes = np.zeros(capacity, dtype=np.int64)
+            sizes[:self.clusters] = self._sizes[:self.clusters]
+            self._representatives, self._sizes = representatives, sizes
+
+    def add(self, texts):
+        """댓글들을 묶어 댓글마다 묶음 번호(int64 배열)를 반환합니다."""
+        texts = list(texts)
+        labels = np.empty(len(texts), dtype=np.int64)
+        for start in range(0, len(texts), SIGNATURE_CHUNK):
+            chunk = texts[start:start + SIGNATURE_CHUNK]
+            with stage("dedup", texts=len(chunk)) as info:
+                # 글자까지 똑같은 댓글은 서명을 한 번만 계산합니다.
+                codes, unique = pd.factorize(pd.Series(chunk, dtype=object))
+                labels[start:start + len(chunk)] = self._add(_signatures(unique.tolist())[codes])
+                info["clusters"] = self.clusters
+        self.comments += len(texts)
+        return labels
+
+    def _add(self, signatures):
+        n = len(signatures)
+        keys = _band_keys(signatures)
+        index = np.arange(n)
+        # 기존 묶음 후보(earlier)와 이번에 함께 온 앞선 댓글 후보(parent)를 띠마다 찾아, 먼저 확인된 것을 씁니다.
+        earlier = np.full(n, -1, dtype=np.int64)
+        parent = index.copy()
+        for band in range(BANDS):
+            column = keys[:, band]
+            found = np.fromiter(map(self._buckets[band].get, column.tolist(), [-1] * n), dtype=np.int64, count=n)
+            check = (earlier < 0) & (found >= 0)
+            if check.any():
+                agree = (signatures[check] == self._representatives[found[check]]).mean(axis=1) >= SIMILARITY
+                earlier[np.flatnonzero(check)[agree]] = found[check][agree]
+
+            _, first, inverse = np.unique(column, return_index=True, return_inverse=True)
+            leader = first[inverse]
+            check = (parent == index) & (leader < index)
+            if check.any():
+                agree = (signatures[check] == signatures[leader[check]]).mean(axis=1) >= SIMILARITY
+                parent[np.flatnonzero(check)[agree]] = leader[check][agree]
+
+        # 앞선 댓글은 번호가 더 작으므로 포인터를 몇 번 따라가면 사슬의 맨 앞(기존 묶음이 있거나 새 묶음)에 닿습니다.
+        parent[earlier >= 0] = index[earlier >= 0]
+        while not np.array_equal(parent, parent[parent]):
+            parent = parent[parent]
+
+        roots = np.flatnonzero((parent == index) & (earlier < 0))
+        labels = earlier.copy()
+        labels[roots] = np.arange(self.clusters, self.clusters + len(roots))
+        labels = labels[parent]
+
+        # 새 묶음의 대표 서명과 띠 키를 등록합니다. 띠 키가 이미 있으면 새 묶음으로 바꿔 가리킵니다.
+        # (어느 쪽이든 가리킨 묶음의 대표 서명과 다시 확인하므로 결과는 맞고, dict.update 한 번이라 빠릅니다.)
+        self._reserve(self.clusters + len(roots))
+        self._representatives[self.clusters:self.clusters + len(roots)] = signatures[roots]
+        for band in range(BANDS):
+            self._buckets[band].update(zip(keys[roots, band].tolist(), labels[roots].tolist()))
+        self.clusters += len(roots)
+        return labels
+
+    def collapse(self, texts):
+        """댓글들을 묶고, 가중치만큼 세야 할 댓글만 골라 반환합니다.
+
+        묶음 크기가 늘어 가중치가 1 오를 때마다 그 댓글을 한 번 넘기므로("once"면 묶음의 첫 댓글만,
+        "log"면 묶음의 1·2·4·8…번째 댓글), 묶음을 모두 모으지 않고도 묶음마다 가중치만큼 셉니다.
+        """
+        texts = list(texts)
+        labels = self.add(texts)
+        # 같은 묶음에 여러 댓글이 함께 오면 도착 순서대로 크기를 하나씩 늘립니다.
+        before = self._sizes[labels] + pd.Series(labels).groupby(labels).cumcount().to_numpy()
+        np.add.at(self._sizes, labels, 1)
+        keep = (before == 0) | (self.weight(before + 1) > self.weight(np.maximum(before, 1)))
+        incr("duplicates_collapsed", int(len(texts) - keep.sum()))
+        return [text for text, kept in zip(texts, keep) if kept]
+
@@ -0,0 +1,85 @@
+"""한글 폰트 찾기
+
+페이지를 그릴 때는 네트워크를 쓰지 않고 아래 순서로 로컬 폰트만 찾습니다.
+
+1. WORDCLOUD_FONT_PATH 환경 변수에 지정한 파일
+2. FONT_DIR 환경 변수의 디렉터리 (기본값: 저장소의 fonts/)
+3. 시스템 폰트 디렉터리 (Streamlit Cloud에서는 packages.txt의 fonts-nanum이 설치됩니다)
+
+배포 이미지를 만들 때 한 번 폰트를 받아 두려면:
+
+    python -m utils.fonts --download
+"""
+import argparse
+import os
+import tempfile
+import urllib.request
+
+FONT_DIR = os.environ.get(
+    "FONT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fonts")
+)
+SYSTEM_FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+    "/Library/Fonts",
+    "C:\\Windows\\Fonts",
+]
+# 먼저 찾은 이름을 씁니다.
+FONT_NAMES = [
+    "NanumGothic.ttf",
+    "NanumGothic-Regular.ttf",
+    "NotoSansKR-Regular.ttf",
+    "NotoSansKR-Regular.otf",
+    "NotoSansCJK-Regular.ttc",
+    "malgun.ttf",
+    "AppleSDGothicNeo.ttc",
+]
+FONT_URL = "https://raw.githubusercontent.com/google/fonts/main/ofl/nanumgothic/NanumGothic-Regular.ttf"
+
+
+def _search(directory):
+    found = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name in FONT_NAMES:
+                found.setdefault(name, os.path.join(root, name))
+    for name in FONT_NAMES:
+        if name in found:
+            return found[name]
+    return None
+
+
+def find_font():
+    """한글을 그릴 수 있는 로컬 폰트 파일 경로를 반환합니다. 찾지 못하면 None을 반환합니다."""
+    path = os.environ.get("WORDCLOUD_FONT_PATH")
+    if path and os.path.exists(path):
+        return path
+    for directory in [FONT_DIR, *SYSTEM_FONT_DIRS]:
+        if os.path.isdir(directory) and (path := _search(directory)):
+            return path
+    # 이전 버전이 임시 디렉터리에 받아 둔 폰트도 씁니다.
+    path = os.path.join(tempfile.gettempdir(), "NanumGothic.ttf")
+    return path if os.path.exists(path) else None
+
+
+def download_font(directory=FONT_DIR):
+    """나눔고딕을 directory에 받아 경로를 반환합니다. 배포 준비 단계에서만 호출합니다."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "NanumGothic.ttf")
+    if not os.path.exists(path):
+        urllib.request.urlretrieve(FONT_URL, path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="워드클라우드용 한글 폰트 확인/다운로드")
+    parser.add_argument("--download", action="store_true", help=f"폰트가 없으면 {FONT_DIR}에 나눔고딕을 받습니다.")
+    args = parser.parse_args()
+
+    path = find_font()
+    if path is None and args.download:
+        path = download_font()
+    print(path or "한글 폰트를 찾지 못했습니다. --download로 받거나 WORDCLOUD_FONT_PATH를 설정하세요.")
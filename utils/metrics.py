@@ -0,0 +1,149 @@
+"""단계별 성능 계측
+
+처리 단계마다 걸린 시간과 API 호출 수·받은 바이트·토큰 수 같은 카운터를 프로세스 전체에서 모읍니다.
+Streamlit 없이도 동작하며, 사이드바 성능 패널(utils.progress.performance_panel)이 이 값을 보여 줍니다.
+
+- METRICS_LOG 환경 변수에 파일 경로를 주면 단계마다 JSON 한 줄씩 기록합니다.
+- METRICS_PORT 환경 변수에 포트를 주면 http://<host>:<port>/metrics 에서 Prometheus 텍스트 형식으로 내보냅니다.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.cache import cache_bytes, cache_stats
+
+METRICS_LOG = os.environ.get("METRICS_LOG")
+METRICS_PORT = os.environ.get("METRICS_PORT")
+
+logger = logging.getLogger(__name__)
+# 단계별 JSON 줄은 METRICS_LOG 파일에만 씁니다. (CLI의 INFO 로그에 섞이지 않도록 위로 전달하지 않습니다.)
+_events = logging.getLogger(__name__ + ".events")
+_events.propagate = False
+
+_lock = threading.Lock()
+# 단계 이름 → [횟수, 합계(초), 최대(초)]
+_stages = {}
+_counters = Counter()
+
+
+# ⏱️ 단계 시간
+@contextmanager
+def stage(name, **fields):
+    """블록의 실행 시간을 name 단계로 기록합니다.
+
+    블록 안에서 yield된 dict에 값을 넣으면(예: 처리한 항목 수) JSON 로그 줄에 함께 남습니다.
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        seconds = time.perf_counter() - start
+        with _lock:
+            entry = _stages.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+        if _events.handlers:
+            _events.info(json.dumps(
+                {"time": round(time.time(), 3), "stage": name, "seconds": round(seconds, 6), **fields},
+                ensure_ascii=False, default=str
+            ))
+
+
+def incr(name, value=1):
+    """name 카운터에 value를 더합니다."""
+    with _lock:
+        _counters[name] += value
+
+
+def snapshot():
+    """지금까지의 단계별 (횟수, 합계 초, 최대 초)와 카운터를 복사해 반환합니다."""
+    with _lock:
+        return {
+            "stages": {name: tuple(entry) for name, entry in _stages.items()},
+            "counters": dict(_counters),
+        }
+
+
+def since(before):
+    """before(snapshot()) 이후에 늘어난 단계별 (횟수, 합계 초)와 카운터를 반환합니다."""
+    after = snapshot()
+    stages = {}
+    for name, (count, total, _) in after["stages"].items():
+        previous = before["stages"].get(name, (0, 0.0, 0.0))
+        if count > previous[0]:
+            stages[name] = (count - previous[0], total - previous[1])
+    counters = {
+        name: value - before["counters"].get(name, 0)
+        for name, value in after["counters"].items() if value != before["counters"].get(name, 0)
+    }
+    return {"stages": stages, "counters": counters}
+
+
+# 📡 Prometheus 내보내기
+def prometheus_text():
+    """단계 시간, 카운터, 분석 캐시 통계를 Prometheus 텍스트 형식으로 반환합니다."""
+    current = snapshot()
+    lines = [
+        "# TYPE yt_stage_seconds_total counter",
+        "# TYPE yt_stage_calls_total counter",
+        "# TYPE yt_stage_seconds_max gauge",
+    ]
+    for name, (count, total, longest) in sorted(current["stages"].items()):
+        lines += [
+            f'yt_stage_seconds_total{{stage="{name}"}} {total:.6f}',
+            f'yt_stage_calls_total{{stage="{name}"}} {count}',
+            f'yt_stage_seconds_max{{stage="{name}"}} {longest:.6f}',
+        ]
+    for name, value in sorted(current["counters"].items()):
+        lines += [f"# TYPE yt_{name}_total counter", f"yt_{name}_total {value}"]
+    for stats in cache_stats():
+        for field in ("entries", "bytes", "hits", "misses", "coalesced", "evictions", "evicted_bytes", "expirations"):
+            lines.append(f'yt_cache_{field}{{cache="{stats["name"]}"}} {stats[field]}')
+    used, limit = cache_bytes()
+    lines += [
+        "# TYPE yt_cache_total_bytes gauge", f"yt_cache_total_bytes {used}",
+        "# TYPE yt_cache_max_bytes gauge", f"yt_cache_max_bytes {limit}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200 if self.path.rstrip("/") == "/metrics" else 404)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port):
+    """백그라운드 스레드에서 /metrics 서버를 띄우고 서버를 반환합니다."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# 모듈은 프로세스마다 한 번만 불러오므로, 로그 파일과 서버도 한 번만 준비됩니다.
+if METRICS_LOG:
+    _handler = logging.FileHandler(METRICS_LOG, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _events.addHandler(_handler)
+    _events.setLevel(logging.INFO)
+# 토큰화 작업 프로세스(spawn)도 이 모듈을 불러오므로, 서버는 메인 프로세스에서만 띄웁니다.
+if METRICS_PORT and multiprocessing.parent_process() is None:
+    try:
+        serve(int(METRICS_PORT))
+    except OSError as e:
+        logger.warning("성능 지표 서버를 띄우지 못했습니다 (포트 %s): %s", METRICS_PORT, e)
@@ -0,0 +1,292 @@
+"""통계 기반 명사 추출 모델 (soynlp LRNounExtractor_v2)
+
+로컬 댓글 저장소의 어절 빈도로 soynlp 명사 추출기를 학습하고, 댓글을 셀 때는 어절마다 가장 긴 명사 앞부분만 셉니다.
+"노래가", "노래를"은 "노래"로 세고, 명사로 시작하지 않는 어절("있어요", "합니다")은 세지 않습니다. 영어 단어는 그대로 셉니다.
+
+- 어절 빈도는 더할 수 있으므로 NOUN_MODEL_DIR/eojeols.db에 누적하고, 새로 저장된 댓글만 이어서 셉니다.
+- 명사 추출은 누적한 어절 빈도로만 하므로 댓글을 다시 읽지 않으며, 어절 수가 RETRAIN_GROWTH만큼 늘었을 때만 다시 합니다.
+- 추출한 명사는 NOUN_MODEL_DIR/nouns.arrow(Arrow IPC)에 쓰고, 프로세스는 이 파일을 메모리 매핑으로 불러옵니다.
+
+분석 페이지는 분석을 마칠 때마다 백그라운드에서 모델을 갱신하며, 모델이 아직 없거나 추출한 명사가 MIN_MODEL_NOUNS개보다
+적으면(학습이 덜 된 모델은 모르는 명사로 시작하는 어절을 모두 버리므로) 규칙 기반 count_nouns로 셉니다.
+미리 학습해 두려면:
+
+    python -m utils.nouns [--force] [--top 30]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+import pyarrow as pa
+
+from utils.metrics import stage
+from utils.store import DB_PATH, comment_texts_since
+from utils.text import count_eojeols, count_nouns
+
+# 🧠 모델 위치 (환경 변수로 변경 가능, 기본값은 댓글 저장소 옆)
+NOUN_MODEL_DIR = os.environ.get("NOUN_MODEL_DIR", os.path.join(os.path.dirname(DB_PATH), "nouns"))
+MODEL_PATH = os.path.join(NOUN_MODEL_DIR, "nouns.arrow")
+STATE_PATH = os.path.join(NOUN_MODEL_DIR, "eojeols.db")
+# 저장소 댓글이 이보다 적으면 통계가 부족하므로 명사를 추출하지 않습니다.
+MIN_TRAIN_COMMENTS = 1000
+# 추출한 명사가 이보다 적은 모델은 쓰지 않습니다. (모르는 명사가 너무 많아 규칙 기반보다 적게 셉니다)
+MIN_MODEL_NOUNS = 100
+# 어절 총수가 마지막 추출 때보다 이 비율 이상 늘면 명사를 다시 추출합니다.
+RETRAIN_GROWTH = 0.1
+# 새 댓글을 한 번에 읽어 어절 빈도에 더할 묶음 크기
+INGEST_CHUNK = 20000
+# 추출에 쓸 어절의 최소 빈도 (한 번만 나온 어절은 오타·붙여 쓰기가 많습니다)
+MIN_EOJEOL_COUNT = 2
+# soynlp 명사 점수 하한
+MIN_NOUN_SCORE = 0.3
+# 어절 앞부분에서 찾을 명사의 최대 길이 (soynlp max_left_length)
+MAX_NOUN_LENGTH = 10
+# 명사 뒤에 붙는 조사·어미로 볼 최대 길이 (soynlp max_right_length)
+MAX_SUFFIX_LENGTH = 9
+# 어절 → 명사 결과를 기억해 둘 최대 어절 수
+LOOKUP_CACHE_SIZE = 200000
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS eojeols (
+    eojeol TEXT PRIMARY KEY,
+    count  INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS model (
+    id              INTEGER PRIMARY KEY CHECK (id = 1),
+    trained_rowid   INTEGER NOT NULL DEFAULT 0,
+    comments        INTEGER NOT NULL DEFAULT 0,
+    total           INTEGER NOT NULL DEFAULT 0,
+    extracted_total INTEGER NOT NULL DEFAULT 0,
+    version         INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO model (id) VALUES (1);
+"""
+
+_MISSING = object()
+
+_model = None
+_model_lock = threading.Lock()
+_update_lock = threading.Lock()
+
+
+@contextmanager
+def _connect():
+    os.makedirs(NOUN_MODEL_DIR, exist_ok=True)
+    conn = sqlite3.connect(STATE_PATH, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _is_hangul(token):
+    return "가" <= token[0] <= "힣"
+
+
+# 📖 명사 모델
+class NounModel:
+    """추출한 명사 목록(Arrow 테이블: noun, frequency, score)으로 댓글의 명사 빈도를 셉니다."""
+
+    def __init__(self, table, version):
+        self.table = table
+        self.version = version
+        self.nouns = frozenset(table.column("noun").to_pylist())
+        self._lookup = {}
+
+    def noun_of(self, eojeol):
+        """어절에서 가장 긴 명사 앞부분을 반환합니다. 명사로 시작하지 않으면 None."""
+        if (noun := self._lookup.get(eojeol, _MISSING)) is not _MISSING:
+            return noun
+        noun = next(
+            (eojeol[:i] for i in range(min(len(eojeol), MAX_NOUN_LENGTH), 0, -1) if eojeol[:i] in self.nouns), None
+        )
+        if len(self._lookup) >= LOOKUP_CACHE_SIZE:
+            self._lookup.clear()
+        self._lookup[eojeol] = noun
+        return noun
+
+    def count(self, texts, lower=False):
+        """댓글의 명사와 영어 단어(2글자 이상)를 세어 Counter로 반환합니다. lower면 영어를 소문자로 바꿉니다.
+
+        어절은 한 번만 세고, 명사 찾기는 서로 다른 어절마다 한 번씩만 합니다.
+        """
+        eojeols = count_eojeols(texts, lower)
+        counts = Counter()
+        with stage("nouns.match", eojeols=len(eojeols)):
+            for eojeol, n in eojeols.items():
+                token = self.noun_of(eojeol) if _is_hangul(eojeol) else eojeol
+                if token and len(token) > 1:
+                    counts[token] += n
+        return counts
+
+
+def _load(path):
+    # 메모리 매핑으로 열어 파일 내용을 복사하지 않고 Arrow 테이블로 씁니다.
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return NounModel(table, int(table.schema.metadata[b"version"]))
+
+
+def _model_file():
+    """디스크의 명사 모델을 반환합니다. 파일이 바뀌었으면 다시 불러오고, 아직 없으면 None을 반환합니다."""
+    global _model
+    try:
+        mtime = os.stat(MODEL_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _model_lock:
+        if _model is None or _model[0] != mtime:
+            _model = (mtime, _load(MODEL_PATH))
+        return _model[1]
+
+
+def current_model():
+    """분석에 쓸 명사 모델을 반환합니다. 아직 없거나 명사가 MIN_MODEL_NOUNS개보다 적으면 None을 반환합니다."""
+    model = _model_file()
+    return model if model is not None and len(model.nouns) >= MIN_MODEL_NOUNS else None
+
+
+def count_model_nouns(texts, model=None, lower=False):
+    """model이 있으면 모델의 명사를, 없으면 규칙 기반 count_nouns로 토큰을 셉니다."""
+    if model is None:
+        return count_nouns(texts, lower)
+    return model.count(texts, lower)
+
+
+# 🏋️ 학습 (어절 빈도 누적 + 명사 추출)
+def _ingest(conn, rowid, comments, total):
+    """rowid 뒤에 저장된 댓글의 한글 어절을 어절 빈도에 더합니다. 묶음마다 저장하므로 중간에 멈춰도 이어서 셉니다."""
+    while True:
+        texts, last = comment_texts_since(rowid, INGEST_CHUNK)
+        if not texts:
+            return rowid, comments, total
+        with stage("nouns.ingest", texts=len(texts)):
+            eojeols = {e: n for e, n in count_eojeols(texts).items() if _is_hangul(e)}
+            conn.executemany(
+                "INSERT INTO eojeols (eojeol, count) VALUES (?, ?) "
+                "ON CONFLICT(eojeol) DO UPDATE SET count = count + excluded.count",
+                eojeols.items()
+            )
+            rowid, comments, total = last, comments + len(texts), total + sum(eojeols.values())
+            conn.execute("UPDATE model SET trained_rowid = ?, comments = ?, total = ?", (rowid, comments, total))
+        conn.commit()
+
+
+def _lrgraph(rows):
+    """(어절, 빈도)들을 soynlp L-R 그래프({앞부분: {뒷부분: 빈도}})로 만듭니다. (EojeolCounter.to_lrgraph와 같은 분할)"""
+    graph = {}
+    for eojeol, count in rows:
+        for i in range(1, min(MAX_NOUN_LENGTH, len(eojeol)) + 1):
+            if len(eojeol) - i <= MAX_SUFFIX_LENGTH:
+                suffixes = graph.setdefault(eojeol[:i], {})
+                suffixes[eojeol[i:]] = suffixes.get(eojeol[i:], 0) + count
+    return graph
+
+
+def _extract(conn):
+    from soynlp.noun import LRNounExtractor_v2
+    from soynlp.utils import LRGraph
+
+    # 누적한 빈도표를 문장으로 되돌리지 않고, 공개 생성자 LRGraph(lrgraph=...)로 바로 넘깁니다.
+    rows = conn.execute("SELECT eojeol, count FROM eojeols WHERE count >= ?", (MIN_EOJEOL_COUNT,))
+    lrgraph = LRGraph(lrgraph=_lrgraph(rows), l_max_length=MAX_NOUN_LENGTH, r_max_length=MAX_SUFFIX_LENGTH)
+    extractor = LRNounExtractor_v2(
+        max_left_length=MAX_NOUN_LENGTH, max_right_length=MAX_SUFFIX_LENGTH, verbose=False
+    )
+    extractor.train(lrgraph)
+    return extractor.extract(min_noun_score=MIN_NOUN_SCORE)
+
+
+def _write_model(nouns, version):
+    items = sorted(nouns.items(), key=lambda item: -item[1].frequency)
+    table = pa.table({
+        "noun": pa.array([noun for noun, _ in items], pa.string()),
+        "frequency": pa.array([score.frequency for _, score in items], pa.int64()),
+        "score": pa.array([score.score for _, score in items], pa.float64()),
+    }).replace_schema_metadata({"version": str(version)})
+    # 다 쓴 뒤 이름을 바꾸므로, 다른 프로세스는 반쯤 쓴 파일을 불러오지 않습니다.
+    with pa.OSFile(MODEL_PATH + ".tmp", "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(MODEL_PATH + ".tmp", MODEL_PATH)
+
+
+def update_model(force=False):
+    """새로 저장된 댓글을 어절 빈도에 더하고, 어절이 충분히 늘었으면 명사를 다시 추출해 모델 파일을 씁니다.
+
+    force면 늘지 않았어도 다시 추출합니다. {"comments", "eojeols", "nouns", "version", "extracted", "usable"}을 반환합니다.
+    usable은 모델의 명사가 MIN_MODEL_NOUNS개 이상이라 분석에 쓰는지입니다.
+    """
+    with _update_lock, _connect() as conn:
+        rowid, comments, total, extracted_total, version = conn.execute(
+            "SELECT trained_rowid, comments, total, extracted_total, version FROM model"
+        ).fetchone()
+        rowid, comments, total = _ingest(conn, rowid, comments, total)
+
+        extracted = comments >= MIN_TRAIN_COMMENTS and total > 0 and (
+            force or not os.path.exists(MODEL_PATH) or total - extracted_total >= RETRAIN_GROWTH * extracted_total
+        )
+        if extracted:
+            with stage("nouns.extract", eojeols=total):
+                nouns = _extract(conn)
+            version += 1
+            _write_model(nouns, version)
+            conn.execute("UPDATE model SET extracted_total = ?, version = ?", (total, version))
+            logger.info("명사 %d개 추출 (댓글 %d개, 어절 %d개, 버전 %d)", len(nouns), comments, total, version)
+
+    model = _model_file()
+    return {
+        "comments": comments,
+        "eojeols": total,
+        "nouns": len(model.nouns) if model else 0,
+        "version": model.version if model else None,
+        "extracted": extracted,
+        "usable": current_model() is not None,
+    }
+
+
+def _update_quietly():
+    try:
+        update_model()
+    except Exception as e:
+        logger.warning("명사 모델을 갱신하지 못했습니다: %s", e)
+
+
+def update_in_background():
+    """갱신이 돌고 있지 않으면 백그라운드 스레드에서 update_model을 실행합니다.
+
+    새 댓글이 없으면 저장소 조회 한 번으로 끝나므로, 분석을 마칠 때마다 불러도 가볍습니다.
+    """
+    if not _update_lock.locked():
+        threading.Thread(target=_update_quietly, daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 댓글 저장소로 명사 추출 모델 학습/갱신")
+    parser.add_argument("--force", action="store_true", help="어절이 충분히 늘지 않았어도 명사를 다시 추출합니다.")
+    parser.add_argument("--top", type=int, default=30, help="출력할 빈도 상위 명사 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    summary = update_model(args.force)
+    print(
+        f"댓글 {summary['comments']:,}개, 어절 {summary['eojeols']:,}개 → 명사 {summary['nouns']:,}개 "
+        f"(버전 {summary['version']}, {'다시 추출함' if summary['extracted'] else '추출 생략'}) → {MODEL_PATH}"
+    )
+    if summary["nouns"] and not summary["usable"]:
+        print(f"명사가 {MIN_MODEL_NOUNS}개보다 적어 댓글이 더 쌓일 때까지 규칙 기반 토큰으로 셉니다.")
+    if (model := _model_file()) is not None:
+        top = model.table.slice(0, args.top).to_pydict()
+        print(", ".join(f"{noun}({frequency:,})" for noun, frequency in zip(top["noun"], top["frequency"])))
+
+
+if __name__ == "__main__":
+    main()
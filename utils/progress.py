@@ -0,0 +1,101 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from utils.cache import cache_bytes, cache_stats
+from utils.metrics import since
+
+# 부분 빈도 차트를 다시 그리는 주기 (묶음 수)
+UPDATE_EVERY = 5
+# 수집 중에 보여 줄 상위 단어 수
+TOP_WORDS = 20
+
+_STATE_KEY = "live_collection"
+
+# 성능 패널에 보여 줄 카운터 이름
+COUNTER_LABELS = {
+    "api_calls": "API 호출",
+    "api_requests": "HTTP 요청",
+    "api_bytes": "받은 바이트",
+    "texts_tokenized": "토큰화한 댓글",
+    "tokens": "토큰",
+    "duplicates_collapsed": "걸러 낸 중복 댓글",
+}
+
+
+# ⏳ 수집 진행 상황 (실시간)
+class LiveProgress:
+    """count_comment_tokens의 on_progress로 넘겨 수집 진행 상황을 화면에 실시간으로 보여 줍니다.
+
+    묶음마다 댓글 수와 초당 페이지 수를, UPDATE_EVERY 묶음마다 상위 단어 차트를 갱신합니다.
+    세고 있는 빈도표는 세션 상태에도 걸어 두므로, 중지 버튼 등으로 실행이 끊겨도 stopped_result로 이어서 씁니다.
+    """
+
+    def __init__(self, key, every=UPDATE_EVERY, top=TOP_WORDS):
+        self.every = every
+        self.top = top
+        self.pages = 0
+        self.start = time.perf_counter()
+        self.state = st.session_state[_STATE_KEY] = {"key": key, "counts": None, "comment_count": 0}
+        self.status = st.empty()
+        self.chart = st.empty()
+
+    def __call__(self, counts, comment_count):
+        self.pages += 1
+        self.state.update(counts=counts, comment_count=comment_count)
+        elapsed = max(time.perf_counter() - self.start, 1e-6)
+        self.status.markdown(
+            f"🔄 댓글 **{comment_count:,}개** 집계 중 · 페이지 {self.pages:,}개 (초당 {self.pages / elapsed:.1f}페이지)"
+        )
+        if (self.pages - 1) % self.every == 0:
+            top_words = pd.DataFrame(counts.most_common(self.top), columns=["단어", "빈도수"])
+            self.chart.bar_chart(top_words.set_index("단어"), horizontal=True, sort="-빈도수")
+
+    def finish(self):
+        """수집을 마쳤으면 진행 표시를 지우고, 중지된 결과로 남지 않게 세션 상태에서도 뺍니다."""
+        self.status.empty()
+        self.chart.empty()
+        st.session_state.pop(_STATE_KEY, None)
+
+
+def stopped_result(key):
+    """key로 시작했다가 끝나기 전에 멈춘 수집이 있으면 (지금까지의 Counter, 댓글 수)를 꺼내 반환합니다.
+
+    멈추기 전까지 받은 페이지는 저장소에 남아 있으므로, 다시 분석하면 그 다음 페이지부터 이어 받습니다.
+    """
+    state = st.session_state.get(_STATE_KEY)
+    if not state or state["key"] != key or state["counts"] is None:
+        return None
+    del st.session_state[_STATE_KEY]
+    return state["counts"], state["comment_count"]
+
+
+# 📈 성능 패널
+def performance_panel(before):
+    """before(metrics.snapshot()) 이후 기록된 단계별 시간과 카운터, 분석 캐시 통계를 사이드바에 접어서 보여 줍니다.
+
+    지표는 프로세스 전체에서 모으므로, 같은 시간에 다른 세션이 한 작업도 함께 잡힙니다.
+    """
+    delta = since(before)
+    with st.sidebar.expander("⏱️ 성능 (이번 실행)"):
+        if delta["stages"]:
+            stages = sorted(delta["stages"].items(), key=lambda item: -item[1][1])
+            st.dataframe(
+                pd.DataFrame(
+                    [(name, count, total * 1000) for name, (count, total) in stages],
+                    columns=["단계", "횟수", "합계 (ms)"]
+                ).style.format({"합계 (ms)": "{:,.1f}"}),
+                hide_index=True
+            )
+        else:
+            st.caption("이번 실행에서 기록된 단계가 없습니다.")
+        counters = [
+            f"{label} {delta['counters'][name]:,}" for name, label in COUNTER_LABELS.items() if name in delta["counters"]
+        ]
+        if counters:
+            st.markdown(" · ".join(counters))
+        st.dataframe(pd.DataFrame(cache_stats()), hide_index=True)
+        used, limit = cache_bytes()
+        st.caption(f"분석 캐시 메모리 {used / 2 ** 20:,.1f} / {limit / 2 ** 20:,.0f} MB (모든 세션 공유)")
+        st.caption("api.execute는 HTTP 왕복(api.http)과 응답 JSON 해석을 합친 시간입니다. 다른 세션의 작업도 함께 집계됩니다.")
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+
+from utils.metrics import incr, stage
+
+logger = logging.getLogger(__name__)
+
+# 📒 API 키별 일일 할당량 장부 위치 (환경 변수로 변경 가능)
+LEDGER_PATH = os.environ.get(
+    "QUOTA_LEDGER_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "quota.db")
+)
+# API 키 하나의 하루 할당량 (YouTube Data API 기본값 10,000 units, 태평양 시간 자정에 초기화)
+DAILY_QUOTA = int(os.environ.get("YOUTUBE_DAILY_QUOTA", 10000))
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# 토큰 버킷: API 키마다 초당 RATE개, 최대 BURST개까지 몰아서 요청
+RATE = float(os.environ.get("YOUTUBE_API_RATE", 10))
+BURST = int(os.environ.get("YOUTUBE_API_BURST", 20))
+
+# 재시도: 최대 MAX_RETRIES번, 지수 백오프(BASE_DELAY × 2^n, 최대 MAX_DELAY초) + full jitter
+MAX_RETRIES = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 32.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError"}
+QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+
+
+class QuotaExceeded(Exception):
+    """API 키의 오늘 할당량을 모두 사용했을 때 발생합니다."""
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷입니다. 스레드 간에 공유해도 안전합니다."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 기다립니다."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def _bucket(api_key):
+    with _buckets_lock:
+        if api_key not in _buckets:
+            _buckets[api_key] = TokenBucket(RATE, BURST)
+        return _buckets[api_key]
+
+
+# 📒 할당량 장부
+def _key_id(api_key):
+    # 장부에는 키 원문 대신 해시만 남깁니다.
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _today():
+    return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+
+def _ledger():
+    os.makedirs(os.path.dirname(LEDGER_PATH), exist_ok=True)
+    conn = sqlite3.connect(LEDGER_PATH, timeout=30)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS quota_ledger (
+            key_id TEXT NOT NULL,
+            day    TEXT NOT NULL,
+            units  INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (key_id, day)
+        )
+        """
+    )
+    return conn
+
+
+def _record(api_key, units, exhausted=False):
+    conn = _ledger()
+    try:
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO quota_ledger (key_id, day, units) VALUES (?, ?, ?)
+                ON CONFLICT(key_id, day) DO UPDATE SET units = units + excluded.units
+                """,
+                (_key_id(api_key), _today(), units)
+            )
+            if exhausted:
+                conn.execute(
+                    "UPDATE quota_ledger SET units = MAX(units, ?) WHERE key_id = ? AND day = ?",
+                    (DAILY_QUOTA, _key_id(api_key), _today())
+                )
+    finally:
+        conn.close()
+
+
+def quota_used(api_key):
+    """오늘(태평양 시간 기준) 이 API 키로 사용한 할당량(units)을 반환합니다."""
+    conn = _ledger()
+    try:
+        row = conn.execute(
+            "SELECT units FROM quota_ledger WHERE key_id = ? AND day = ?", (_key_id(api_key), _today())
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else 0
+
+
+def quota_exhausted(api_key):
+    """오늘 할당량을 모두 사용했는지 반환합니다."""
+    return quota_used(api_key) >= DAILY_QUOTA
+
+
+def _reason(error):
+    try:
+        return json.loads(error.content)["error"]["errors"][0]["reason"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return ""
+
+
+# 🚦 API 요청 실행
+def execute(request, api_key, cost=1):
+    """YouTube API 요청을 속도 제한·재시도·할당량 기록을 거쳐 실행합니다.
+
+    일시적인 오류(429, 5xx, rateLimitExceeded, 네트워크 오류)는 지수 백오프로 재시도합니다.
+    할당량이 바닥났거나 API가 quotaExceeded를 돌려주면 QuotaExceeded를 발생시킵니다.
+    """
+    if quota_used(api_key) + cost > DAILY_QUOTA:
+        raise QuotaExceeded("오늘 API 할당량을 모두 사용했습니다.")
+
+    for attempt in range(MAX_RETRIES + 1):
+        with stage("api.wait"):
+            _bucket(api_key).acquire()
+        try:
+            # HTTP 왕복(api.http)과 응답 JSON 해석을 합친 시간입니다.
+            with stage("api.execute", method=getattr(request, "methodId", None)):
+                response = request.execute()
+            incr("api_calls")
+            _record(api_key, cost)
+            return response
+        except HttpError as e:
+            # 실패한 요청도 할당량을 소모합니다.
+            reason = _reason(e)
+            _record(api_key, cost, exhausted=reason in QUOTA_REASONS)
+            if reason in QUOTA_REASONS:
+                raise QuotaExceeded("오늘 API 할당량을 모두 사용했습니다.") from e
+            if e.resp.status not in RETRY_STATUSES and reason not in RETRY_REASONS:
+                raise
+            if attempt == MAX_RETRIES:
+                raise
+            error = e
+        except OSError as e:
+            if attempt == MAX_RETRIES:
+                raise
+            error = e
+
+        delay = random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+        logger.warning("YouTube API 요청 실패 (%s), %.1f초 후 재시도 %d/%d", error, delay, attempt + 1, MAX_RETRIES)
+        time.sleep(delay)
@@ -0,0 +1,622 @@
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+from utils.cache import AnalysisCache
+from utils.metrics import stage
+from utils.scheduler import QuotaExceeded, quota_exhausted
+from utils.youtube import (
+    get_all_replies, get_uploads_playlist, get_video_info, iter_comment_pages, list_playlist_videos
+)
+
+logger = logging.getLogger(__name__)
+
+# 💾 로컬 댓글 저장소 위치 (환경 변수로 변경 가능)
+DB_PATH = os.environ.get(
+    "COMMENT_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "comments.db")
+)
+# 이 시간(초) 안에 다시 요청하면 API를 호출하지 않고 저장된 댓글을 그대로 씁니다.
+REFRESH_TTL = 600
+# 저장된 댓글을 한 번에 읽어 넘겨줄 묶음 크기
+CHUNK_SIZE = 1000
+# 답글을 동시에 수집할 최대 스레드 수
+REPLY_WORKERS = 8
+# 세션들이 함께 쓰는 댓글 DataFrame을 몇 개까지 보관할지 (영상 × 수집 범위)
+FRAME_CACHE_SIZE = 8
+
+COLUMNS = ["comment_id", "text", "published_at", "like_count", "parent_id", "reply_count"]
+# 댓글 DataFrame의 열 타입: Arrow 문자열, 초 단위 epoch(int64) 시각, int32 숫자
+ARROW_SCHEMA = pa.schema([
+    ("comment_id", pa.string()),
+    ("text", pa.string()),
+    ("published_at", pa.timestamp("s", tz="UTC")),
+    ("like_count", pa.int32()),
+    ("parent_id", pa.string()),
+    ("reply_count", pa.int32()),
+])
+
+_frames = AnalysisCache("comment_frames", max_entries=FRAME_CACHE_SIZE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS comments (
+    comment_id   TEXT PRIMARY KEY,
+    video_id     TEXT NOT NULL,
+    text         TEXT NOT NULL,
+    published_at INTEGER NOT NULL,
+    like_count   INTEGER NOT NULL DEFAULT 0,
+    parent_id    TEXT,
+    reply_count  INTEGER NOT NULL DEFAULT 0,
+    replies_fetched_at    REAL,
+    replies_fetched_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_comments_video_time ON comments (video_id, published_at);
+
+CREATE TABLE IF NOT EXISTS videos (
+    video_id       TEXT PRIMARY KEY,
+    title          TEXT,
+    published_at   INTEGER,
+    backfill_token TEXT,
+    complete       INTEGER NOT NULL DEFAULT 0,
+    refreshed_at   REAL,
+    head_token     TEXT,
+    head_watermark INTEGER,
+    version        INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id     TEXT PRIMARY KEY,
+    uploads        TEXT,
+    playlist_token TEXT,
+    listed         INTEGER NOT NULL DEFAULT 0,
+    listed_at      REAL
+);
+
+CREATE TABLE IF NOT EXISTS channel_videos (
+    channel_id TEXT NOT NULL,
+    video_id   TEXT NOT NULL,
+    PRIMARY KEY (channel_id, video_id)
+);
+"""
+
+
+@contextmanager
+def _connect():
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _migrate(conn):
+    """이전 버전 저장소에 없던 컬럼과 인덱스를 추가합니다."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(comments)")}
+    if "parent_id" not in columns:
+        conn.execute("ALTER TABLE comments ADD COLUMN parent_id TEXT")
+        conn.execute("ALTER TABLE comments ADD COLUMN reply_count INTEGER NOT NULL DEFAULT 0")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_comments_parent ON comments (parent_id)")
+    # 영상별로 저장 순서(rowid)대로 이어 읽기 위한 인덱스 (utils.trends)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_comments_video ON comments (video_id)")
+    if "head_token" not in {row[1] for row in conn.execute("PRAGMA table_info(videos)")}:
+        conn.execute("ALTER TABLE videos ADD COLUMN head_token TEXT")
+        conn.execute("ALTER TABLE videos ADD COLUMN head_watermark INTEGER")
+    if "version" not in {row[1] for row in conn.execute("PRAGMA table_info(videos)")}:
+        conn.execute("ALTER TABLE videos ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+    if "replies_fetched_at" not in {row[1] for row in conn.execute("PRAGMA table_info(comments)")}:
+        conn.execute("ALTER TABLE comments ADD COLUMN replies_fetched_at REAL")
+        conn.execute("ALTER TABLE comments ADD COLUMN replies_fetched_count INTEGER")
+    conn.commit()
+
+
+def _to_epoch(published_at):
+    return int(datetime.fromisoformat(published_at.replace("Z", "+00:00")).timestamp())
+
+
+def _to_records(rows):
+    return [
+        (r["comment_id"], r["text"], _to_epoch(r["published_at"]), r["like_count"], r["parent_id"], r["reply_count"])
+        for r in rows
+    ]
+
+
+def _batch(records):
+    """저장소 레코드를 타입이 정해진 Arrow 열 묶음으로 바꿉니다. 작성 시각은 epoch 그대로 담습니다."""
+    columns = list(zip(*records)) or [()] * len(ARROW_SCHEMA)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, ARROW_SCHEMA)], schema=ARROW_SCHEMA
+    )
+
+
+def _to_pandas(data):
+    # 문자열은 Arrow 버퍼를 그대로 쓰는 string[pyarrow], 시각은 datetime64[s, UTC], 숫자는 int32가 됩니다.
+    with stage("dataframe", rows=data.num_rows):
+        return data.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+
+def _upsert_comments(conn, video_id, records):
+    """댓글을 저장하고, 실제로 바뀐 행이 있으면 영상의 version을 올립니다."""
+    changes = conn.total_changes
+    conn.executemany(
+        """
+        INSERT INTO comments (comment_id, video_id, text, published_at, like_count, parent_id, reply_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(comment_id) DO UPDATE SET
+            text = excluded.text,
+            like_count = excluded.like_count,
+            reply_count = excluded.reply_count
+        WHERE text != excluded.text OR like_count != excluded.like_count OR reply_count != excluded.reply_count
+        """,
+        [(r[0], video_id, *r[1:]) for r in records]
+    )
+    if conn.total_changes != changes:
+        conn.execute("UPDATE videos SET version = version + 1 WHERE video_id = ?", (video_id,))
+
+
+def _upsert_page(conn, video_id, rows):
+    """댓글 페이지(인라인 답글 포함)를 저장합니다."""
+    _upsert_comments(conn, video_id, _to_records(rows))
+    _upsert_comments(conn, video_id, _to_records([reply for row in rows for reply in row["replies"]]))
+
+
+def _video_state(conn, video_id):
+    row = conn.execute(
+        "SELECT backfill_token, complete, refreshed_at FROM videos WHERE video_id = ?", (video_id,)
+    ).fetchone()
+    if row is None:
+        # 바로 커밋합니다. (이어서 API를 호출하는 동안 쓰기 잠금을 잡고 있지 않도록)
+        conn.execute("INSERT INTO videos (video_id) VALUES (?)", (video_id,))
+        conn.commit()
+        return None, False, None
+    return row[0], bool(row[1]), row[2]
+
+
+def _refresh_head(conn, api_key, video_id, include_replies=False):
+    """워터마크(저장된 가장 최신 작성 시각)보다 새로운 댓글을 최신순으로 받아 저장합니다.
+
+    진행 중인 워터마크와 pageToken을 페이지마다 저장하므로, 중간에 끊기면(할당량 소진 등)
+    다음 호출에서 그 페이지부터 이어 받아 워터마크 아래에 빈 구간이 생기지 않습니다.
+    """
+    while True:
+        page_token, watermark = conn.execute(
+            "SELECT head_token, head_watermark FROM videos WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        resumed = watermark is not None
+        if not resumed:
+            watermark = conn.execute(
+                "SELECT MAX(published_at) FROM comments WHERE video_id = ? AND parent_id IS NULL", (video_id,)
+            ).fetchone()[0]
+            if watermark is None:
+                return
+
+        reached = lambda rows: any(_to_epoch(r["published_at"]) <= watermark for r in rows)
+        for rows, next_token in iter_comment_pages(
+            api_key, video_id, page_token, stop=reached, include_replies=include_replies
+        ):
+            _upsert_page(conn, video_id, rows)
+            done = not next_token or reached(rows)
+            conn.execute(
+                "UPDATE videos SET head_token = ?, head_watermark = ? WHERE video_id = ?",
+                (None, None, video_id) if done else (next_token, watermark, video_id)
+            )
+            conn.commit()
+
+        # 끊겼던 새로고침을 마쳤다면, 그 사이에 달린 새 댓글을 받기 위해 한 번 더 새로고침합니다.
+        if not resumed:
+            return
+
+
+def _backfill(conn, api_key, video_id, page_token, max_items, include_replies=False):
+    """저장된 pageToken부터 과거 방향으로 댓글을 이어 받아 페이지마다 넘겨줍니다."""
+    for rows, page_token in iter_comment_pages(
+        api_key, video_id, page_token, max_items, include_replies=include_replies
+    ):
+        _upsert_page(conn, video_id, rows)
+        conn.execute(
+            "UPDATE videos SET backfill_token = ?, complete = ? WHERE video_id = ?",
+            (page_token, int(not page_token), video_id)
+        )
+        conn.commit()
+        yield rows
+
+
+def _stored_replies(conn, video_id):
+    """부모 댓글마다 저장된 답글 수를 반환합니다."""
+    return dict(conn.execute(
+        "SELECT parent_id, COUNT(*) FROM comments WHERE video_id = ? AND parent_id IS NOT NULL GROUP BY parent_id",
+        (video_id,)
+    ).fetchall())
+
+
+def _reply_fetches(conn, video_id):
+    """답글을 모두 받아 둔 댓글마다 (받은 시각, 그때의 답글 수)를 반환합니다."""
+    return {row[0]: row[1:] for row in conn.execute(
+        """
+        SELECT comment_id, replies_fetched_at, replies_fetched_count FROM comments
+        WHERE video_id = ? AND replies_fetched_at IS NOT NULL
+        """,
+        (video_id,)
+    )}
+
+
+def _needs_replies(comment_id, reply_count, stored, fetched):
+    """저장된 답글이 답글 수보다 적은 댓글 중, 답글을 다시 받아야 하는지 반환합니다.
+
+    YouTube의 답글 수에는 삭제되었거나 검토 중인 답글도 들어 있어, 다 받아도 저장된 답글이 모자랄 수 있습니다.
+    그래서 최근 REFRESH_TTL초 안에 다 받았고 그 뒤로 답글 수가 늘지 않았으면 다시 받지 않습니다.
+    """
+    if reply_count <= stored.get(comment_id, 0):
+        return False
+    fetched_at, fetched_count = fetched.get(comment_id, (None, None))
+    return fetched_at is None or time.time() - fetched_at > REFRESH_TTL or reply_count > fetched_count
+
+
+def _mark_replies_fetched(conn, parent_id, reply_count):
+    conn.execute(
+        "UPDATE comments SET replies_fetched_at = ?, replies_fetched_count = ? WHERE comment_id = ?",
+        (time.time(), reply_count, parent_id)
+    )
+
+
+def _select_replies(conn, parent_ids):
+    placeholders = ",".join("?" * len(parent_ids))
+    return conn.execute(
+        f"""
+        SELECT comment_id, text, published_at, like_count, parent_id, reply_count
+        FROM comments WHERE parent_id IN ({placeholders})
+        ORDER BY published_at
+        """,
+        parent_ids
+    ).fetchall()
+
+
+# 🚚 댓글 스트리밍 (저장소 동기화 + 읽기)
+def iter_comments(video_id, api_key, max_comments=100, force=False, include_replies=False):
+    """저장소를 동기화하면서 최신 댓글 max_comments개를 DataFrame 묶음으로 차례로 넘겨줍니다.
+
+    새 댓글을 받아 저장한 뒤, 저장된 댓글 → 과거 방향으로 이어 받은 댓글 순서(최신순)로 넘겨주므로
+    호출한 쪽은 마지막 페이지가 도착하기 전부터 집계를 시작할 수 있습니다.
+    최근 REFRESH_TTL초 안에 새로고침했고 저장된 댓글이 충분하면 API를 호출하지 않습니다.
+
+    include_replies면 답글(parent_id에 부모 댓글 id)도 넘겨줍니다. 인라인으로 다 오지 않은 답글은
+    페이지를 받는 동안 REPLY_WORKERS개 스레드에서 동시에 수집하고, 마지막 묶음들로 넘겨줍니다.
+    max_comments는 답글을 제외한 댓글 수입니다.
+
+    오늘 API 할당량이 바닥나면(QuotaExceeded) 수집을 멈추고 그때까지 저장된 댓글만 넘겨줍니다.
+    진행 상황은 저장소에 남아 있으므로 다음 호출에서 마지막 pageToken부터 이어 받습니다.
+    """
+    for batch in _iter_batches(video_id, api_key, max_comments, force, include_replies):
+        yield _to_pandas(batch)
+
+
+def _iter_batches(video_id, api_key, max_comments=100, force=False, include_replies=False):
+    """iter_comments와 같은 순서로 댓글을 Arrow 열 묶음으로 넘겨줍니다."""
+    remaining = max_comments
+    pool = ThreadPoolExecutor(max_workers=REPLY_WORKERS) if include_replies else None
+    # 답글을 받는 중인 future → (부모 댓글 id, 요청할 때의 답글 수)
+    pending = {}
+    quota_hit = False
+
+    def take(records):
+        nonlocal remaining
+        if remaining != -1:
+            records = records[:remaining]
+            remaining -= len(records)
+        return records
+
+    def fetch_replies(parent_id, reply_count):
+        pending[pool.submit(get_all_replies, api_key, parent_id)] = (parent_id, reply_count)
+
+    def inline_replies(rows):
+        # 인라인 답글로 다 온 스레드는 바로 넘기고, 나머지는 답글 전체를 백그라운드에서 수집합니다.
+        replies = []
+        for row in rows:
+            if row["reply_count"] > len(row["replies"]):
+                fetch_replies(row["comment_id"], row["reply_count"])
+            else:
+                replies += row["replies"]
+        return _to_records(replies)
+
+    with _connect() as conn:
+        backfill_token, complete, refreshed_at = _video_state(conn, video_id)
+        stored = conn.execute(
+            "SELECT COUNT(*) FROM comments WHERE video_id = ? AND parent_id IS NULL", (video_id,)
+        ).fetchone()[0]
+        stale = force or refreshed_at is None or time.time() - refreshed_at > REFRESH_TTL
+
+        try:
+            # 1) 워터마크 이후 새 댓글 저장
+            if stale:
+                try:
+                    _refresh_head(conn, api_key, video_id, include_replies)
+                    conn.execute("UPDATE videos SET refreshed_at = ? WHERE video_id = ?", (time.time(), video_id))
+                    conn.commit()
+                except QuotaExceeded:
+                    logger.warning("할당량 소진으로 %s 새 댓글 수집을 건너뜁니다.", video_id)
+                    quota_hit = True
+
+            # 2) 저장된 댓글
+            if stored and remaining != 0:
+                stored_replies = _stored_replies(conn, video_id) if include_replies else {}
+                fetched = _reply_fetches(conn, video_id) if include_replies else {}
+                cursor = conn.execute(
+                    """
+                    SELECT comment_id, text, published_at, like_count, parent_id, reply_count
+                    FROM comments WHERE video_id = ? AND parent_id IS NULL
+                    ORDER BY published_at DESC LIMIT ?
+                    """,
+                    (video_id, remaining)
+                )
+                while records := take(cursor.fetchmany(CHUNK_SIZE)):
+                    yield _batch(records)
+                    if include_replies:
+                        complete_ids = []
+                        for record in records:
+                            if not quota_hit and _needs_replies(record[0], record[5], stored_replies, fetched):
+                                fetch_replies(record[0], record[5])
+                            elif record[5]:
+                                complete_ids.append(record[0])
+                        if complete_ids:
+                            yield _batch(_select_replies(conn, complete_ids))
+
+            # 3) 저장소보다 과거의 댓글
+            if not complete and remaining != 0 and not quota_hit:
+                try:
+                    for rows in _backfill(conn, api_key, video_id, backfill_token, remaining, include_replies):
+                        rows = take(rows)
+                        if rows:
+                            yield _batch(_to_records(rows))
+                            if include_replies and (replies := inline_replies(rows)):
+                                yield _batch(replies)
+                except QuotaExceeded:
+                    logger.warning("할당량 소진으로 %s 과거 댓글 수집을 멈춥니다.", video_id)
+
+            # 4) 백그라운드에서 수집한 답글
+            for future in as_completed(pending):
+                try:
+                    records = _to_records(future.result())
+                except QuotaExceeded:
+                    continue
+                _upsert_comments(conn, video_id, records)
+                _mark_replies_fetched(conn, *pending[future])
+                conn.commit()
+                if records:
+                    yield _batch(records)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+
+# 🧭 영상 전체 수집 (읽지 않고 저장만)
+def sync_comments(video_id, api_key, include_replies=False):
+    """영상의 댓글을 처음부터 끝까지 저장소에 받아 두고, 저장된 댓글 수(답글 제외)를 반환합니다.
+
+    새 댓글은 워터마크부터, 과거 댓글은 저장된 backfill pageToken부터 받고 페이지마다 진행 상황을 저장하므로
+    중간에 끊기거나 할당량이 바닥나도(QuotaExceeded를 그대로 발생시킵니다) 다음 호출에서 그 페이지부터 이어 받습니다.
+    include_replies면 인라인으로 다 오지 않은 답글도 REPLY_WORKERS개 스레드에서 받아 저장합니다.
+    """
+    with _connect() as conn:
+        backfill_token, complete, refreshed_at = _video_state(conn, video_id)
+        if refreshed_at is None or time.time() - refreshed_at > REFRESH_TTL:
+            _refresh_head(conn, api_key, video_id, include_replies)
+            conn.execute("UPDATE videos SET refreshed_at = ? WHERE video_id = ?", (time.time(), video_id))
+            conn.commit()
+        if not complete:
+            for _ in _backfill(conn, api_key, video_id, backfill_token, -1, include_replies):
+                pass
+
+        if include_replies:
+            # 저장된 답글이 전체 답글 수보다 적고, 최근에 다 받아 두지 않은 댓글만 답글을 다시 받습니다.
+            stored = _stored_replies(conn, video_id)
+            fetched = _reply_fetches(conn, video_id)
+            threads = [row for row in conn.execute(
+                "SELECT comment_id, reply_count FROM comments WHERE video_id = ? AND parent_id IS NULL AND reply_count > 0",
+                (video_id,)
+            ) if _needs_replies(*row, stored, fetched)]
+            with ThreadPoolExecutor(max_workers=REPLY_WORKERS) as pool:
+                results = pool.map(lambda thread: get_all_replies(api_key, thread[0]), threads)
+                for thread, replies in zip(threads, results):
+                    _upsert_comments(conn, video_id, _to_records(replies))
+                    _mark_replies_fetched(conn, *thread)
+                    conn.commit()
+
+        return conn.execute(
+            "SELECT COUNT(*) FROM comments WHERE video_id = ? AND parent_id IS NULL", (video_id,)
+        ).fetchone()[0]
+
+
+# 🔖 수집 워터마크
+def collection_watermark(video_id):
+    """저장된 댓글이 바뀔 때마다 달라지는 값(version)을 반환합니다.
+
+    최근 REFRESH_TTL초 안에 새로고침하지 않아 다음 수집에서 API를 호출할 영상이면 None을 반환합니다.
+    분석 결과 캐시의 키로 쓰며, 기본 키 조회 한 번이라 댓글 수와 관계없이 가볍습니다.
+    """
+    with _connect() as conn:
+        row = conn.execute("SELECT version, refreshed_at FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+    if row is None or row[1] is None or time.time() - row[1] > REFRESH_TTL:
+        return None
+    return row[0]
+
+
+def comment_texts_since(rowid, limit=CHUNK_SIZE):
+    """rowid보다 뒤에 저장된 댓글 내용을 저장 순서대로 limit개까지 읽어 (내용 목록, 마지막 rowid)를 반환합니다.
+
+    새 댓글은 항상 더 큰 rowid로 저장되므로, 마지막 rowid를 기억해 두면 새로 들어온 댓글만 이어 읽을 수 있습니다.
+    (이미 있던 댓글이 수정된 경우는 rowid가 그대로라 다시 읽지 않습니다.)
+    """
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT rowid, text FROM comments WHERE rowid > ? ORDER BY rowid LIMIT ?", (rowid, limit)
+        ).fetchall()
+    return [row[1] for row in rows], (rows[-1][0] if rows else rowid)
+
+
+def video_comments_since(video_id, rowid, limit=CHUNK_SIZE):
+    """rowid보다 뒤에 저장된 video_id의 댓글(답글 포함)을 저장 순서대로 limit개까지 읽습니다.
+
+    ([(작성 시각 epoch 초, 내용), ...], 마지막 rowid)를 반환합니다.
+    """
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT rowid, published_at, text FROM comments WHERE video_id = ? AND rowid > ? ORDER BY rowid LIMIT ?",
+            (video_id, rowid, limit)
+        ).fetchall()
+    return [row[1:] for row in rows], (rows[-1][0] if rows else rowid)
+
+
+# 💬 댓글 수집 (저장소 경유)
+def load_comments(video_id, api_key, max_comments=100, force=False, include_replies=False):
+    """저장소를 동기화한 뒤 댓글을 DataFrame으로 반환합니다.
+
+    컬럼: comment_id, text, published_at, like_count, parent_id(답글이면 부모 댓글 id), reply_count
+
+    페이지가 도착하는 대로 Arrow 열 묶음에 담았다가 한 번에 DataFrame으로 바꿉니다.
+    저장소가 바뀌지 않았으면 같은 영상·범위를 요청한 세션들이 한 DataFrame을 함께 쓰므로,
+    반환한 DataFrame은 읽기 전용으로 다루세요.
+    여러 세션이 같은 영상·범위를 동시에 요청하면 한 번만 수집하고, 기다린 세션도 같은 DataFrame을 받습니다.
+    """
+    key = (video_id, max_comments, include_replies)
+
+    def collect():
+        if not force and (frame := _frames.get(key, collection_watermark(video_id))) is not None:
+            return frame
+        batches = list(_iter_batches(video_id, api_key, max_comments, force, include_replies))
+        frame = _to_pandas(pa.Table.from_batches(batches, schema=ARROW_SCHEMA))
+        if (watermark := collection_watermark(video_id)) is not None and not quota_exhausted(api_key):
+            _frames.put(key, watermark, frame)
+        return frame
+
+    return _frames.single_flight((key, force), collect)
+
+
+# 🕰️ 영상 정보 (저장소 캐시)
+def load_video_info(video_id, api_key):
+    """영상 제목과 업로드 시각을 반환합니다. 한 번 조회한 영상은 API를 다시 호출하지 않습니다.
+
+    영상이 없거나 할당량이 바닥나 조회하지 못하면 None을 반환합니다.
+    """
+    with _connect() as conn:
+        row = conn.execute("SELECT title, published_at FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+    if row is None or row[0] is None:
+        # API 호출은 트랜잭션 밖에서 하고, 받은 정보만 짧은 트랜잭션으로 저장합니다.
+        try:
+            info = get_video_info(api_key, video_id)
+        except QuotaExceeded:
+            logger.warning("할당량 소진으로 %s 영상 정보를 조회하지 못했습니다.", video_id)
+            return None
+        if info is None:
+            return None
+        row = (info["title"], _to_epoch(info["published_at"]))
+        with _connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO videos (video_id, title, published_at) VALUES (?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET title = excluded.title, published_at = excluded.published_at
+                """,
+                (video_id, *row)
+            )
+    return {"title": row[0], "published_at": pd.to_datetime(row[1], unit="s", utc=True)}
+
+
+# 📺 채널 영상 목록 (저장소 동기화)
+def sync_channel(channel_id, api_key):
+    """채널의 업로드 재생목록을 저장소에 동기화하고 채널 영상 수를 반환합니다.
+
+    처음에는 재생목록 끝까지 페이지마다 pageToken을 저장하며 받으므로, 끊기면 다음 호출에서 그 페이지부터 이어 받습니다.
+    목록을 다 받은 뒤에는 첫 페이지(최신 업로드)부터 이미 아는 영상이 나올 때까지만 받아 새 영상을 더합니다.
+    영상 제목과 업로드 시각도 함께 저장하므로 영상마다 videos().list를 다시 호출하지 않습니다.
+    채널이 없으면 ValueError를 발생시킵니다.
+    """
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT uploads, playlist_token, listed FROM channels WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        if row is None:
+            # 바로 커밋합니다. (이어서 API를 호출하는 동안 쓰기 잠금을 잡고 있지 않도록)
+            conn.execute("INSERT INTO channels (channel_id) VALUES (?)", (channel_id,))
+            conn.commit()
+            row = (None, None, 0)
+        uploads, page_token, listed = row[0], row[1], bool(row[2])
+
+        if uploads is None:
+            uploads = get_uploads_playlist(api_key, channel_id)
+            if uploads is None:
+                raise ValueError(f"채널을 찾을 수 없습니다: {channel_id}")
+            conn.execute("UPDATE channels SET uploads = ? WHERE channel_id = ?", (uploads, channel_id))
+            conn.commit()
+        if listed:
+            page_token = None
+
+        while True:
+            videos, next_token = list_playlist_videos(api_key, uploads, page_token)
+            known = conn.execute(
+                f"""
+                SELECT COUNT(*) FROM channel_videos
+                WHERE channel_id = ? AND video_id IN ({",".join("?" * len(videos))})
+                """,
+                (channel_id, *[v["video_id"] for v in videos])
+            ).fetchone()[0] if videos else 0
+            conn.executemany(
+                "INSERT OR IGNORE INTO channel_videos (channel_id, video_id) VALUES (?, ?)",
+                [(channel_id, v["video_id"]) for v in videos]
+            )
+            conn.executemany(
+                """
+                INSERT INTO videos (video_id, title, published_at) VALUES (?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    title = COALESCE(videos.title, excluded.title),
+                    published_at = COALESCE(videos.published_at, excluded.published_at)
+                """,
+                [(v["video_id"], v["title"], v["published_at"] and _to_epoch(v["published_at"])) for v in videos]
+            )
+            done = not next_token or (listed and known > 0)
+            if not listed:
+                conn.execute(
+                    "UPDATE channels SET playlist_token = ?, listed = ? WHERE channel_id = ?",
+                    (next_token, int(not next_token), channel_id)
+                )
+            conn.commit()
+            if done:
+                break
+            page_token = next_token
+
+        conn.execute("UPDATE channels SET listed_at = ? WHERE channel_id = ?", (time.time(), channel_id))
+        return conn.execute(
+            "SELECT COUNT(*) FROM channel_videos WHERE channel_id = ?", (channel_id,)
+        ).fetchone()[0]
+
+
+def channel_progress(channel_id):
+    """채널 영상마다 저장된 수집 진행 상황을 최신 업로드순 DataFrame으로 반환합니다. (API를 호출하지 않습니다.)
+
+    컬럼: video_id, title, published_at, comment_count(저장된 댓글 수, 답글 제외), complete(과거 댓글까지 모두 받았는지)
+    """
+    with _connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT v.video_id, v.title, v.published_at,
+                   (SELECT COUNT(*) FROM comments c WHERE c.video_id = v.video_id AND c.parent_id IS NULL),
+                   v.complete
+            FROM channel_videos cv JOIN videos v ON v.video_id = cv.video_id
+            WHERE cv.channel_id = ?
+            ORDER BY v.published_at DESC, v.video_id
+            """,
+            (channel_id,)
+        ).fetchall()
+    progress = pd.DataFrame(rows, columns=["video_id", "title", "published_at", "comment_count", "complete"])
+    progress["published_at"] = pd.to_datetime(progress["published_at"], unit="s", utc=True)
+    progress["complete"] = progress["complete"].astype(bool)
+    return progress
@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.metrics import incr, stage
+
+# 🚫 한글 + 영어 불용어 리스트
+DEFAULT_KO_STOPWORDS = set([
+    "영상", "정말", "진짜", "너무", "그리고", "이건", "해서", "하게", "하는", "것", "때문",
+    "봤어요", "있어요", "이렇게", "같아요", "이요", "입니다", "그냥", "우리", "이게", "저는", "그거"
+])
+
+DEFAULT_EN_STOPWORDS = set([
+    "i", "me", "my", "myself", "we", "our", "ours", "ourselves",
+    "you", "your", "yours", "yourself", "he", "him", "his",
+    "she", "her", "it", "its", "they", "them", "their", "theirs",
+    "what", "which", "who", "whom", "this", "that", "these", "those",
+    "am", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "do", "does", "did", "will", "would",
+    "shall", "should", "can", "could", "a", "an", "the", "and",
+    "but", "if", "or", "because", "as", "until", "while", "of",
+    "at", "by", "for", "with", "about", "against", "between", "into",
+    "through", "during", "before", "after", "above", "below", "to",
+    "from", "up", "down", "in", "out", "on", "off", "over", "under",
+    "again", "further", "then", "once", "here", "there", "why", "how",
+    "all", "any", "both", "each", "few", "more", "most", "other",
+    "some", "such", "no", "nor", "not", "only", "own", "same", "so",
+    "than", "too", "very", "just"
+])
+
+DEFAULT_STOPWORDS = DEFAULT_KO_STOPWORDS | DEFAULT_EN_STOPWORDS
+
+# 🔤 토큰화 엔진
+# soynlp RegexTokenizer는 어절마다 숫자 → 한글 → 자음 → 모음 → 영어 정규식을 차례로 돌리고,
+# 어디에도 맞지 않은 나머지 글자 덩어리도 토큰으로 남깁니다. 다섯 패턴은 시작 글자가 겹치지 않으므로
+# 하나의 정규식으로 왼쪽부터 훑어도 같은 토큰이 나옵니다.
+_SOYNLP_PATTERNS = [
+    r"[-+]?\d*[\.]?[\d]+|[-+]?\d+",
+    r"[가-힣]+",
+    r"[ㄱ-ㅎ]+",
+    r"[ㅏ-ㅣ]+",
+    # soynlp 원본의 [[`']?s]* 와 같은 패턴 ('[' 이스케이프만 추가)
+    r"[a-zA-ZÀ-ÿ]+[\[`']?s]*|[a-zA-ZÀ-ÿ]+",
+]
+_SOYNLP_TOKEN = "|".join(_SOYNLP_PATTERNS)
+TOKEN_PATTERN = re.compile(rf"{_SOYNLP_TOKEN}|(?:(?!{_SOYNLP_TOKEN})\S)+")
+# 워드클라우드용: 특수문자 제거 후 2글자 이상의 한글/영어 단어
+CLEAN_PATTERN = re.compile(r"[^\uAC00-\uD7A3a-zA-Z0-9\s]")
+WORD_PATTERN = re.compile(r"[a-zA-Z가-힣]{2,}")
+# 명사 모델(utils.nouns)용: 한글 어절(이어진 한글)과 영어 단어
+EOJEOL_PATTERN = re.compile(r"[가-힣]+|[a-zA-ZÀ-ÿ]+")
+
+# 댓글을 CHUNK_SIZE개씩 줄바꿈으로 이어 붙여 정규식 한 번으로 토큰화합니다.
+# 줄바꿈은 공백이므로 토큰이 댓글 경계를 넘지 않습니다.
+CHUNK_SIZE = 5000
+# 댓글이 PARALLEL_THRESHOLD개 이상이면 청크를 프로세스 풀에 나눠 셉니다.
+PARALLEL_THRESHOLD = 50000
+TOKENIZE_WORKERS = int(os.environ.get("TOKENIZE_WORKERS", os.cpu_count() or 1))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    # 스레드가 많은 Streamlit 서버에서 fork는 위험하므로 spawn으로 띄우고, 한 번 띄운 풀은 계속 씁니다.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(TOKENIZE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _soynlp_counts(texts, lower=False):
+    text = "\n".join(texts)
+    return Counter(TOKEN_PATTERN.findall(text.lower() if lower else text))
+
+
+def _word_counts(texts):
+    text = CLEAN_PATTERN.sub("", "\n".join(texts)).lower()
+    return Counter(WORD_PATTERN.findall(text))
+
+
+def _eojeol_counts(texts, lower=False):
+    text = "\n".join(texts)
+    return Counter(EOJEOL_PATTERN.findall(text.lower() if lower else text))
+
+
+def _count(func, texts, *args):
+    """texts를 청크로 나눠 func(청크, *args)로 센 토큰 수를 합칩니다."""
+    texts = list(texts)
+    chunks = [texts[i:i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+    if len(texts) >= PARALLEL_THRESHOLD and TOKENIZE_WORKERS > 1:
+        results = _get_pool().map(func, chunks, *[[arg] * len(chunks) for arg in args])
+    else:
+        results = (func(chunk, *args) for chunk in chunks)
+
+    with stage("tokenize", function=func.__name__, texts=len(texts)) as info:
+        counts = Counter()
+        for result in results:
+            counts.update(result)
+        info["tokens"] = counts.total()
+    incr("texts_tokenized", len(texts))
+    incr("tokens", info["tokens"])
+    return counts
+
+
+# 📊 토큰 빈도 (토큰화와 세기를 한 번에)
+def count_nouns(comments, lower=False):
+    """댓글마다 soynlp RegexTokenizer로 토큰화해 2글자 이상만 센 것과 같은 Counter를 반환합니다. lower면 소문자로 바꾼 뒤 셉니다."""
+    counts = _count(_soynlp_counts, comments, lower)
+    return Counter({t: n for t, n in counts.items() if len(t) > 1})
+
+def count_meaningful_words(comments, stopwords=DEFAULT_STOPWORDS):
+    """count_nouns(lower=True)에서 불용어(기본값: 한글 + 영어 불용어)를 뺀 Counter를 반환합니다."""
+    return remove_stopwords(count_nouns(comments, lower=True), stopwords)
+
+def count_words(texts, stopwords=()):
+    """특수문자·이모티콘을 지운 뒤 2글자 이상의 한글/영어 단어를 소문자로 세고, 불용어를 뺀 Counter를 반환합니다."""
+    return remove_stopwords(_count(_word_counts, texts), stopwords)
+
+def count_eojeols(texts, lower=False):
+    """한글 어절과 영어 단어를 세어 Counter로 반환합니다. (utils.nouns 명사 모델의 입력)"""
+    return _count(_eojeol_counts, texts, lower)
+
+def remove_stopwords(counts, stopwords):
+    """빈도표에서 불용어를 뺀 Counter를 반환합니다.
+
+    토큰화를 다시 하지 않으므로, 불용어 없이 세어 둔 빈도표에 불용어를 바꿔 가며 적용해도 가볍습니다.
+    """
+    if not stopwords:
+        return Counter(counts)
+    stopwords = set(stopwords)
+    return Counter({t: n for t, n in counts.items() if t not in stopwords})
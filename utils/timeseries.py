@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# 누적 댓글 수 차트에 그릴 최대 점 수 (댓글 수와 관계없이 브라우저로 보내는 데이터 크기를 묶어 둡니다)
+MAX_POINTS = 1000
+# 자동으로 고르는 구간 크기 후보(초): 1초 ~ 30일
+BUCKET_SECONDS = [
+    1, 5, 10, 30, 60, 5 * 60, 10 * 60, 30 * 60,
+    3600, 3 * 3600, 6 * 3600, 12 * 3600, 86400, 7 * 86400, 30 * 86400,
+]
+
+
+def to_epoch_seconds(times):
+    """작성 시각 Series를 정렬하지 않은 초 단위 epoch int64 배열로 바꿉니다."""
+    return times.to_numpy(dtype="datetime64[s]").astype("int64")
+
+
+def bucket_size(span, max_points=MAX_POINTS):
+    """span초를 max_points개 이하 구간으로 나누는 가장 작은 후보 구간 크기(초)를 반환합니다."""
+    for seconds in BUCKET_SECONDS:
+        if span / seconds < max_points:
+            return seconds
+    return int(np.ceil(span / max_points))
+
+
+# 📈 누적 댓글 수 (서버에서 줄이기)
+def cumulative_counts(times, max_points=MAX_POINTS):
+    """작성 시각 Series로 차트용 (작성 시각, 누적 댓글 수) DataFrame을 만듭니다.
+
+    댓글이 max_points개 이하면 댓글마다 한 점을 둡니다. 넘으면 댓글 기간에 맞춰 고른 구간의 끝마다
+    그 시각까지의 정확한 누적 수를 한 점씩 두므로, 점 수는 max_points개 남짓으로 고정되고
+    곡선은 구간 경계에서 원래 곡선과 일치합니다.
+    """
+    epochs = np.sort(to_epoch_seconds(times))
+    if len(epochs) <= max_points:
+        points, cumulative = epochs, np.arange(1, len(epochs) + 1)
+    else:
+        size = bucket_size(epochs[-1] - epochs[0], max_points)
+        start = epochs[0] // size * size
+        ends = np.arange(start + size, epochs[-1] + size + 1, size)
+        points = np.concatenate([[start], ends])
+        cumulative = np.concatenate([[0], np.searchsorted(epochs, ends, side="left")])
+    return pd.DataFrame({
+        "작성 시각": pd.to_datetime(points, unit="s", utc=True),
+        "누적 댓글 수": cumulative,
+    })
+
+
+# 🔥 급증 구간
+# 댓글 급증을 찾을 창 크기(초)
+BURST_WINDOWS = {"10분": 10 * 60, "1시간": 3600, "1일": 86400}
+# 창 크기마다 찾을 급증 구간 수
+BURST_TOP = 3
+
+
+def _sorted_epochs(times):
+    epochs = to_epoch_seconds(times)
+    # 저장소는 최신순으로 돌려주므로 뒤집으면 이미 정렬된 배열이 되고, 안정 정렬(timsort)은 이를 O(n)에 처리합니다.
+    if len(epochs) and epochs[0] > epochs[-1]:
+        epochs = epochs[::-1]
+    return np.sort(epochs, kind="stable")
+
+
+def window_counts(epochs, seconds):
+    """정렬된 epoch 배열에서 각 댓글 시각부터 seconds초 동안([t, t + seconds)) 달린 댓글 수를 반환합니다."""
+    return np.searchsorted(epochs, epochs + seconds, side="left") - np.searchsorted(epochs, epochs, side="left")
+
+
+def find_bursts(times, windows=BURST_WINDOWS, top=BURST_TOP):
+    """창 크기마다 댓글이 가장 많이 몰린, 서로 겹치지 않는 구간을 top개씩 찾습니다.
+
+    가장 많이 몰린 창은 항상 어떤 댓글 시각에서 시작하므로, 댓글마다 그 시각부터 창 끝까지의 댓글 수를
+    세어 최댓값을 고릅니다 (정렬된 배열이라 NumPy 연산 몇 번으로 끝납니다). 고른 구간과 겹치는 시작점을 지우고 다시 고르므로 창 하나에 O(top × n)입니다.
+    (창, 시작, 끝, 댓글 수, 시간당 댓글 수, 평균 대비) DataFrame을 반환합니다.
+    평균 대비는 전체 기간 평균 댓글 속도의 몇 배인지입니다.
+    """
+    columns = ["창", "시작", "끝", "댓글 수", "시간당 댓글 수", "평균 대비"]
+    epochs = _sorted_epochs(times)
+    if len(epochs) < 2:
+        return pd.DataFrame(columns=columns)
+    average = len(epochs) / max(epochs[-1] - epochs[0], 1)
+
+    rows = []
+    for label, seconds in windows.items():
+        counts = window_counts(epochs, seconds)
+        for _ in range(top):
+            i = int(np.argmax(counts))
+            if counts[i] <= 1:
+                break
+            start = epochs[i]
+            rows.append((label, start, start + seconds, int(counts[i]), counts[i] * 3600 / seconds, counts[i] / seconds / average))
+            # 이 구간과 겹치는 창([start - seconds, start + seconds)에서 시작하는 창)은 다시 고르지 않습니다.
+            lo, hi = np.searchsorted(epochs, [start - seconds + 1, start + seconds], side="left")
+            counts[lo:hi] = 0
+
+    bursts = pd.DataFrame(rows, columns=columns)
+    bursts["시작"] = pd.to_datetime(bursts["시작"], unit="s", utc=True)
+    bursts["끝"] = pd.to_datetime(bursts["끝"], unit="s", utc=True)
+    return bursts
@@ -0,0 +1,199 @@
+"""키워드 추이용 단어 × 시간 구간 빈도 행렬
+
+영상마다 저장된 댓글을 한 번씩만 토큰화해, 작성 시각(시 단위)별 어절·영어 단어 빈도를 TREND_STORE_PATH에 누적합니다.
+영상별로 센 마지막 rowid를 기억하므로, 새 댓글이 저장되면 그 댓글만 이어서 셉니다.
+
+불러올 때는 희소 행렬(scipy.sparse, 단어 × 구간)로 만들고, 명사 모델(utils.nouns)이 있으면 어절을 명사로 합칩니다.
+키워드 추이는 행 하나, 급증 구간에서 두드러진 단어는 열 범위의 합으로 구하므로 댓글을 다시 토큰화하지 않습니다.
+"""
+import os
+import sqlite3
+from contextlib import contextmanager
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utils.cache import AnalysisCache
+from utils.metrics import incr, stage
+from utils.nouns import current_model
+from utils.store import DB_PATH, video_comments_since
+from utils.text import EOJEOL_PATTERN
+
+# 📁 구간별 빈도 저장 위치 (환경 변수로 변경 가능, 기본값은 댓글 저장소 옆)
+TREND_STORE_PATH = os.environ.get("TREND_STORE_PATH", os.path.join(os.path.dirname(DB_PATH), "trends.db"))
+# 구간 이름 → 구간 길이(초). 저장은 시 단위로 하고, 일 단위는 불러올 때 합칩니다.
+BUCKET_SECONDS = {"시간": 3600, "일": 86400}
+# 새 댓글을 한 번에 읽어 셀 묶음 크기
+INGEST_CHUNK = 20000
+# 급증 구간에서 두드러진 단어로 보려면 구간 안에서 최소 이만큼 나와야 합니다.
+MIN_BURST_COUNT = 5
+
+_matrices = AnalysisCache("term_matrices")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS term_counts (
+    video_id TEXT NOT NULL,
+    bucket   INTEGER NOT NULL,
+    term     TEXT NOT NULL,
+    count    INTEGER NOT NULL,
+    PRIMARY KEY (video_id, bucket, term)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS trend_state (
+    video_id      TEXT PRIMARY KEY,
+    counted_rowid INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+@contextmanager
+def _connect():
+    os.makedirs(os.path.dirname(TREND_STORE_PATH), exist_ok=True)
+    # 트랜잭션은 직접 엽니다. (BEGIN IMMEDIATE로 같은 영상을 두 세션이 동시에 세지 않도록)
+    conn = sqlite3.connect(TREND_STORE_PATH, timeout=30, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        yield conn
+    finally:
+        conn.close()
+
+
+def _counted_rowid(conn, video_id):
+    row = conn.execute("SELECT counted_rowid FROM trend_state WHERE video_id = ?", (video_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def _bucket_counts(rows):
+    """[(작성 시각, 내용), ...]을 (시 구간, 단어)별 빈도 Series로 셉니다."""
+    with stage("trends.tokenize", texts=len(rows)) as info:
+        tokens = [EOJEOL_PATTERN.findall(text.lower()) for _, text in rows]
+        frame = pd.DataFrame({
+            "bucket": np.repeat([published // 3600 for published, _ in rows], [len(t) for t in tokens]),
+            "term": list(chain.from_iterable(tokens)),
+        })
+        info["tokens"] = len(frame)
+    incr("texts_tokenized", len(rows))
+    incr("tokens", len(frame))
+    return frame.groupby(["bucket", "term"]).size()
+
+
+# 🔁 새 댓글 반영
+def update_trends(video_id):
+    """저장소에 새로 들어온 video_id 댓글만 토큰화해 구간별 빈도에 더하고, 더한 댓글 수를 반환합니다.
+
+    묶음마다 (빈도, 센 위치)를 한 트랜잭션으로 저장하므로 중간에 멈춰도 두 번 세거나 빠뜨리지 않습니다.
+    """
+    added = 0
+    with _connect() as conn:
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows, last = video_comments_since(video_id, _counted_rowid(conn, video_id), INGEST_CHUNK)
+                if rows:
+                    counts = _bucket_counts(rows)
+                    conn.executemany(
+                        "INSERT INTO term_counts (video_id, bucket, term, count) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(video_id, bucket, term) DO UPDATE SET count = count + excluded.count",
+                        ((video_id, bucket, term, count) for (bucket, term), count in counts.items())
+                    )
+                    conn.execute(
+                        "INSERT INTO trend_state (video_id, counted_rowid) VALUES (?, ?) "
+                        "ON CONFLICT(video_id) DO UPDATE SET counted_rowid = excluded.counted_rowid",
+                        (video_id, last)
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if not rows:
+                return added
+            added += len(rows)
+
+
+# 🧮 단어 × 구간 희소 행렬
+def term_matrix(video_id, freq="시간"):
+    """저장된 구간별 빈도를 (단어 × 구간 CSR 행렬, 단어 Index, 구간 시작 시각 DatetimeIndex)로 반환합니다.
+
+    구간은 첫 댓글부터 마지막 댓글까지 빈 구간 없이 이어집니다. 명사 모델이 있으면 한글 어절을 명사로 합치고
+    명사로 시작하지 않는 어절은 뺍니다. 센 댓글이 없거나 남는 단어가 없으면 None을 반환합니다.
+    결과는 (video_id, 구간, 명사 모델 버전)과 센 위치로 캐시하므로, 새 댓글이 없으면 다시 만들지 않습니다.
+    """
+    model = current_model()
+    key = (video_id, freq, model and model.version)
+    with _connect() as conn:
+        watermark = _counted_rowid(conn, video_id)
+        if (cached := _matrices.get(key, watermark)) is not None:
+            return cached
+        frame = pd.read_sql_query(
+            "SELECT bucket, term, count FROM term_counts WHERE video_id = ?", conn, params=(video_id,)
+        )
+    if frame.empty:
+        return None
+
+    with stage("trends.matrix", entries=len(frame)):
+        terms = frame["term"]
+        if model is not None:
+            # 어절 종류마다 한 번씩만 명사를 찾습니다.
+            unique = terms.unique()
+            nouns = [model.noun_of(t) if "가" <= t[0] <= "힣" else t for t in unique]
+            terms = terms.map(dict(zip(unique, nouns)))
+        keep = (terms.notna() & (terms.str.len() > 1)).to_numpy()
+        # 한 글자 토큰("ㅋ", "a")뿐이거나 명사로 시작하는 어절이 없으면 셀 단어가 없습니다.
+        if not keep.any():
+            return None
+        codes, vocabulary = pd.factorize(terms[keep])
+        buckets = frame["bucket"].to_numpy()[keep] * 3600 // BUCKET_SECONDS[freq]
+        first = buckets.min()
+        # 같은 (단어, 구간)이 여러 번 나오면(어절 → 같은 명사, 시 → 같은 날) CSR로 바꿀 때 더해집니다.
+        matrix = sparse.csr_matrix(
+            (frame["count"].to_numpy()[keep], (codes, buckets - first)),
+            shape=(len(vocabulary), buckets.max() - first + 1)
+        )
+        times = pd.to_datetime((first + np.arange(matrix.shape[1])) * BUCKET_SECONDS[freq], unit="s", utc=True)
+    result = (matrix, pd.Index(vocabulary), times)
+    _matrices.put(key, watermark, result)
+    return result
+
+
+# 🔑 키워드 추이
+def keyword_trend(trend, keywords):
+    """키워드마다 구간별 빈도를 [시각, 단어, 빈도수] DataFrame으로 반환합니다. 댓글에 없는 키워드는 뺍니다."""
+    matrix, terms, times = trend
+    keywords = [keyword.strip().lower() for keyword in keywords if keyword.strip()]
+    rows = terms.get_indexer(keywords)
+    frames = [
+        pd.DataFrame({"시각": times, "단어": keyword, "빈도수": matrix[row].toarray().ravel()})
+        for keyword, row in zip(keywords, rows) if row >= 0
+    ]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["시각", "단어", "빈도수"])
+
+
+# 🔥 구간에서 두드러진 단어
+def burst_terms(trend, start, end, top=10, min_count=MIN_BURST_COUNT):
+    """[start, end)와 겹치는 구간에서 평소보다 비중이 크게 늘어난 단어를 반환합니다.
+
+    배율은 (구간 안 비중) / (구간 밖 비중)이며, 한 번도 안 나온 단어도 나눌 수 있게 빈도에 1을 더해 계산합니다.
+    [단어, 구간 빈도, 구간 밖 빈도, 배율] DataFrame을 배율이 큰 순으로 top개 반환합니다.
+    """
+    matrix, terms, times = trend
+    step = times[1] - times[0] if len(times) > 1 else pd.Timedelta(days=1)
+    lo = max(times.searchsorted(pd.Timestamp(start) - step, side="right"), 0)
+    hi = times.searchsorted(pd.Timestamp(end), side="left")
+    window = np.zeros(matrix.shape[1])
+    window[lo:max(hi, lo + 1)] = 1
+
+    inside = matrix @ window
+    outside = np.asarray(matrix.sum(axis=1)).ravel() - inside
+    vocabulary = len(terms)
+    lift = ((inside + 1) / (inside.sum() + vocabulary)) / ((outside + 1) / (outside.sum() + vocabulary))
+    candidates = np.flatnonzero(inside >= min_count)
+    best = candidates[np.argsort(-lift[candidates], kind="stable")[:top]]
+    return pd.DataFrame({
+        "단어": terms[best],
+        "구간 빈도": inside[best].astype(int),
+        "구간 밖 빈도": outside[best].astype(int),
+        "배율": lift[best],
+    })
@@ -0,0 +1,198 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import streamlit as st
+from utils.metrics import incr, stage
+from utils.scheduler import execute
+
+# 연결 풀 크기 (동시에 열어 둘 keep-alive 연결 수)와 요청 타임아웃(연결, 읽기 초)
+POOL_SIZE = 32
+TIMEOUT = (10, 60)
+# 로컬 가짜 API 서버(bench/fake_youtube.py) 등 다른 엔드포인트를 쓸 때 설정합니다.
+API_ENDPOINT = os.environ.get("YOUTUBE_API_ENDPOINT")
+
+# 🔑 API 키
+def get_api_key():
+    """YOUTUBE_API_KEY 환경 변수가 있으면 그 값을, 없으면 Streamlit secrets의 키를 반환합니다."""
+    return os.environ.get("YOUTUBE_API_KEY") or st.secrets["youtube_api_key"]
+
+# 🎯 video ID 추출
+def extract_video_id(url):
+    pattern = r"(?:v=|youtu\.be/)([\w-]+)"
+    match = re.search(pattern, url)
+    return match.group(1) if match else None
+
+# 🔗 연결 풀 HTTP
+class PooledHttp:
+    """requests 세션 위에서 동작하는 httplib2 호환 HTTP 객체입니다.
+
+    httplib2.Http와 달리 keep-alive 연결 풀을 여러 스레드와 Streamlit 세션이 안전하게 함께 씁니다.
+    """
+
+    def __init__(self, pool_size=POOL_SIZE, timeout=TIMEOUT):
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.timeout = timeout
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        import httplib2
+
+        with stage("api.http"):
+            r = self.session.request(method, uri, data=body, headers=headers, timeout=self.timeout)
+        incr("api_requests")
+        incr("api_bytes", len(r.content))
+        # 본문은 requests가 이미 압축을 풀었으므로 인코딩/길이 헤더는 넘기지 않습니다.
+        info = {k: v for k, v in r.headers.items() if k.lower() not in ("content-encoding", "content-length")}
+        info["status"] = str(r.status_code)
+        response = httplib2.Response(info)
+        response.reason = r.reason
+        return response, r.content
+
+# 🔌 API 클라이언트 (프로세스 전체에서 공유)
+@st.cache_resource(show_spinner=False)
+def get_client(api_key):
+    """API 키마다 하나의 YouTube Data API 클라이언트를 만들어 모든 세션과 스레드가 함께 씁니다.
+
+    패키지에 포함된 discovery 문서를 쓰므로 네트워크 요청 없이 만들어지고, 연결은 PooledHttp가 재사용합니다.
+    googleapiclient는 불러오는 데 시간이 걸리므로 페이지를 처음 그릴 때가 아니라 첫 API 호출 때 불러옵니다.
+    """
+    from googleapiclient.discovery import build
+
+    return build(
+        "youtube", "v3",
+        developerKey=api_key,
+        http=PooledHttp(),
+        static_discovery=True,
+        cache_discovery=False,
+        client_options={"api_endpoint": API_ENDPOINT} if API_ENDPOINT else None
+    )
+
+# 📄 댓글 스레드 한 페이지 요청
+def list_comment_threads(api_key, video_id, page_token=None, include_replies=False):
+    """최신순으로 댓글 스레드 한 페이지(최대 100개)를 요청합니다. include_replies면 인라인 답글(최대 5개)도 받습니다."""
+    request = get_client(api_key).commentThreads().list(
+        part="snippet,replies" if include_replies else "snippet",
+        videoId=video_id,
+        maxResults=100,
+        pageToken=page_token,
+        order="time",
+        textFormat="plainText"
+    )
+    return execute(request, api_key)
+
+# 📄 답글 한 페이지 요청
+def list_replies(api_key, parent_id, page_token=None):
+    """댓글 하나에 달린 답글 한 페이지(최대 100개)를 요청합니다."""
+    request = get_client(api_key).comments().list(
+        part="snippet",
+        parentId=parent_id,
+        maxResults=100,
+        pageToken=page_token,
+        textFormat="plainText"
+    )
+    return execute(request, api_key)
+
+# 🧩 응답 항목 → 댓글 레코드
+def parse_comment(item):
+    """commentThreads 응답 항목을 (id, 내용, 작성 시각, 좋아요 수) 레코드로 변환합니다.
+
+    전체 답글 수(reply_count)와 응답에 함께 온 인라인 답글(replies)도 담습니다.
+    """
+    top = item["snippet"]["topLevelComment"]
+    snippet = top["snippet"]
+    return {
+        "comment_id": top["id"],
+        "text": snippet["textDisplay"],
+        "published_at": snippet["publishedAt"],
+        "like_count": snippet.get("likeCount", 0),
+        "parent_id": None,
+        "reply_count": item["snippet"].get("totalReplyCount", 0),
+        "replies": [parse_reply(reply) for reply in item.get("replies", {}).get("comments", [])],
+    }
+
+def parse_reply(item):
+    """comments 응답 항목(답글)을 부모 댓글 id가 연결된 댓글 레코드로 변환합니다."""
+    snippet = item["snippet"]
+    return {
+        "comment_id": item["id"],
+        "text": snippet["textDisplay"],
+        "published_at": snippet["publishedAt"],
+        "like_count": snippet.get("likeCount", 0),
+        "parent_id": snippet["parentId"],
+        "reply_count": 0,
+    }
+
+# 💬 답글 전체 수집
+def get_all_replies(api_key, parent_id):
+    """댓글 하나의 답글을 모든 페이지에 걸쳐 수집합니다. 작업 스레드에서 호출해도 안전합니다."""
+    replies, page_token = [], None
+    while True:
+        response = list_replies(api_key, parent_id, page_token)
+        replies += [parse_reply(item) for item in response["items"]]
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return replies
+
+# 🚚 댓글 페이지 스트리밍 (다음 페이지 미리 요청)
+def iter_comment_pages(api_key, video_id, page_token=None, max_items=-1, stop=None, include_replies=False):
+    """받은 페이지를 바로 (댓글 레코드 목록, 다음 pageToken)으로 넘겨줍니다.
+
+    호출한 쪽이 현재 페이지를 처리하는 동안 다음 페이지는 백그라운드 스레드에서 미리 요청합니다.
+    max_items개를 넘겨줬거나 stop(레코드 목록)이 참이면 더 이상 미리 요청하지 않습니다.
+    """
+    received = 0
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(list_comment_threads, api_key, video_id, page_token, include_replies)
+        while future is not None:
+            response = future.result()
+            rows = [parse_comment(item) for item in response["items"]]
+            next_token = response.get("nextPageToken")
+            received += len(rows)
+
+            future = None
+            if next_token and (max_items == -1 or received < max_items) and not (stop and stop(rows)):
+                future = pool.submit(list_comment_threads, api_key, video_id, next_token, include_replies)
+
+            yield rows, next_token
+
+# 📺 채널 업로드 재생목록
+def get_uploads_playlist(api_key, channel_id):
+    """채널의 업로드 재생목록 ID를 반환합니다. 채널이 없으면 None을 반환합니다."""
+    request = get_client(api_key).channels().list(part="contentDetails", id=channel_id)
+    response = execute(request, api_key)
+    if not response.get("items"):
+        return None
+    return response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+# 📄 재생목록 한 페이지 요청
+def list_playlist_videos(api_key, playlist_id, page_token=None):
+    """재생목록 한 페이지(최대 50개)를 요청해 ([{video_id, title, published_at}], 다음 pageToken)을 반환합니다.
+
+    비공개·삭제된 영상은 업로드 시각이 없으므로 published_at이 None입니다.
+    """
+    request = get_client(api_key).playlistItems().list(
+        part="snippet,contentDetails",
+        playlistId=playlist_id,
+        maxResults=50,
+        pageToken=page_token
+    )
+    response = execute(request, api_key)
+    videos = [{
+        "video_id": item["contentDetails"]["videoId"],
+        "title": item["snippet"]["title"],
+        "published_at": item["contentDetails"].get("videoPublishedAt"),
+    } for item in response["items"]]
+    return videos, response.get("nextPageToken")
+
+# 🕰️ 영상 정보 (제목 + 업로드일)
+def get_video_info(api_key, video_id):
+    """영상 제목과 업로드 시각을 반환합니다. 영상이 없으면 None을 반환합니다."""
+    request = get_client(api_key).videos().list(part="snippet", id=video_id)
+    response = execute(request, api_key)
+    if not response["items"]:
+        return None
+    snippet = response["items"][0]["snippet"]
+    return {"title": snippet["title"], "published_at": snippet["publishedAt"]}